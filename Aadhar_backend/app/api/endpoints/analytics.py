@@ -1,98 +1,337 @@
-from fastapi import APIRouter, Depends, Query
+import json
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 from app.api import deps
+from app.core.executor import run_cpu_bound
+from app.db.session import AsyncSessionLocal
 from app.models import models
+from app.models.prediction import AnomalyAlert
+from app.schemas.filters import BatchAllocationRequest
+from app.services.analytics_engine import (
+    allocation_records, allocation_statement, compute_allocations, decode_cursor, gap_ranking,
+)
 from app.services.ai_engine import get_ai_insights # ✅ Naya Import
+from app.services.downsampling import lttb_indices
+from app.services.export_service import (
+    EXPORT_FORMATS, build_encoder, export_statement, parquet_available, stream_export,
+)
+from app.services.anomaly_detector import anomaly_status, current_surges_statement
+from app.services.forecast_store import get_forecast
+from app.services.metrics_history import latest_mix
+from app.services.parquet_store import parquet_store
+from app.services.placement_optimizer import DEFAULT_SERVICE_RADIUS, district_demand, optimize_placement
+from app.services.geo_index import geo_index
+from app.services.response_cache import cached_json
+from app.services.rollup_service import dashboard_rollup_statements, trend_statement
 
-router = APIRouter()
+router = APIRouter(prefix="/api/v1", tags=["analytics"])   # Prefix yahin: route templates (metrics labels) poore path ke
 
+# Filters + dashboard: async session, event loop par hi (threadpool mein queue nahi hote)
+# Responses cache hote hain (ETag/304) - loader chalne par hi invalidate
+REGION_SCOPES = ["region_stats"]
+
+def _metrics_scopes(state: str):
+    return ["daily_metrics"] if state == "All States" else [f"daily_metrics:{state}"]
+
+# Dropdowns in-memory geo index se (region_stats + pincode directory), DB query nahi
 @router.get("/filters/states")
-def get_all_states(db: Session = Depends(deps.get_db)):
-    # Database se saare unique States nikal kar layega
-    states = db.query(models.RegionStats.state).distinct().order_by(models.RegionStats.state).all()
+async def get_all_states(request: Request, db: AsyncSession = Depends(deps.get_async_db)):
+    index = await geo_index.current(db)
     # List return karega: ["Delhi", "Maharashtra", "Uttar Pradesh", ...]
-    return [s[0] for s in states]
+    return await cached_json(request, db, "filters/states", {}, REGION_SCOPES, index.state_list)
 
 @router.get("/filters/districts")
-def get_districts(state_name: str, db: Session = Depends(deps.get_db)):
+async def get_districts(request: Request, state_name: str, db: AsyncSession = Depends(deps.get_async_db)):
     # Jo state select kiya, sirf uske districts layega
-    districts = db.query(models.RegionStats.district)\
-                  .filter(models.RegionStats.state == state_name)\
-                  .distinct().order_by(models.RegionStats.district).all()
-    return [d[0] for d in districts]
+    index = await geo_index.current(db)
+    return await cached_json(request, db, "filters/districts", {"state_name": state_name}, REGION_SCOPES,
+                             lambda: index.district_list(state_name))
 
 @router.get("/filters/pincodes")
-def get_pincodes(district_name: str, db: Session = Depends(deps.get_db)):
-    # Jo district select kiya, uske pincodes layega
-    pincodes = db.query(models.RegionStats.pincode)\
-                 .filter(models.RegionStats.district == district_name)\
-                 .distinct().order_by(models.RegionStats.pincode).all()
-    return [p[0] for p in pincodes]
+async def get_pincodes(
+    request: Request,
+    district_name: str,
+    state_name: Optional[str] = None,
+    db: AsyncSession = Depends(deps.get_async_db)
+):
+    # Jo district select kiya, uske pincodes layega (state_name do to same naam ke doosre state wale district nahi milte)
+    index = await geo_index.current(db)
+    params = {"district_name": district_name, "state_name": state_name}
+    return await cached_json(request, db, "filters/pincodes", params, REGION_SCOPES,
+                             lambda: index.pincode_list(district_name, state_name))
+
+# 🔎 Autocomplete + fuzzy search: pincode prefix, state/district naam (galat spelling bhi)
+@router.get("/filters/search")
+async def search_regions(
+    request: Request,
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    kind: Optional[str] = Query(None, pattern="^(state|district|pincode)$"),
+    db: AsyncSession = Depends(deps.get_async_db)
+):
+    index = await geo_index.current(db)
+    params = {"q": q.lower(), "limit": limit, "kind": kind}
+    return await cached_json(request, db, "filters/search", params, REGION_SCOPES,
+                             lambda: index.search(q, limit, kind))
+
+# 🚨 National critical-gap ranking (ranked snapshot se, keyset pagination)
+RANK_SORT_PATTERN = "^(demand_score|pending_enrolments|saturation_percentage|total_population|aadhaar_generated)$"
+
+@router.get("/gaps/ranking")
+async def get_gap_ranking(
+    request: Request,
+    sort: str = Query("demand_score", pattern=RANK_SORT_PATTERN),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    state: Optional[str] = None,
+    district: Optional[str] = None,
+    priority: Optional[str] = Query(None, pattern="^(High|Medium|Low)$"),
+    db: AsyncSession = Depends(deps.get_async_db)
+):
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    ranking = await gap_ranking.current(db)
+
+    def compute():
+        rows, next_cursor, total = ranking.page(sort, order == "asc", limit, after, state, district, priority)
+        return {"total": total, "items": rows, "next_cursor": next_cursor}
+
+    params = {"sort": sort, "order": order, "limit": limit, "cursor": cursor,
+              "state": state, "district": district, "priority": priority}
+    return await cached_json(request, db, "gaps/ranking", params, REGION_SCOPES, compute)
+
+@router.get("/gaps/top")
+async def get_top_gaps(
+    request: Request,
+    group_by: str = Query("state", pattern="^(state|district)$"),
+    k: int = Query(5, ge=1, le=100),
+    sort: str = Query("demand_score", pattern=RANK_SORT_PATTERN),
+    priority: Optional[str] = Query(None, pattern="^(High|Medium|Low)$"),
+    db: AsyncSession = Depends(deps.get_async_db)
+):
+    # Har state / district ke top-k critical pincodes
+    ranking = await gap_ranking.current(db)
+    params = {"group_by": group_by, "k": k, "sort": sort, "priority": priority}
+    return await cached_json(request, db, "gaps/top", params, REGION_SCOPES,
+                             lambda: ranking.top_per_group(group_by, k, sort, priority))
+
+# 🏭 Batch resource allocation: pincodes list ya poora state/district, NDJSON stream
+ALLOCATION_PINCODE_CHUNK = 5000   # IN (...) list ka size (SQLite variable limit se kaafi neeche)
+ALLOCATION_STREAM_ROWS = 2000     # Itni rows ek baar mein compute + flush
+
+@router.post("/allocation/batch")
+async def batch_allocation(body: BatchAllocationRequest, db: AsyncSession = Depends(deps.get_async_db)):
+    # Ek hi baar normalize - validation aur stream dono yahi values dekhte hain
+    pincodes = list(dict.fromkeys(p.strip() for p in body.pincodes or [] if p.strip()))
+    state = (body.state or "").strip() or None
+    district = (body.district or "").strip() or None
+    if not (pincodes or state or district):
+        raise HTTPException(status_code=422, detail="Provide pincodes or a state/district")
+    if not pincodes:
+        # Stream shuru hone ke baad status nahi badal sakte - area pehle hi check karo
+        r = models.RegionStats
+        conditions = []
+        if state:
+            conditions.append(r.state == state)
+        if district:
+            conditions.append(r.district == district)
+        if await db.scalar(select(r.pincode).where(*conditions).limit(1)) is None:
+            raise HTTPException(status_code=404, detail="No regions found for this state/district")
+    return StreamingResponse(_allocation_stream(pincodes, state, district), media_type="application/x-ndjson")
+
+async def _allocation_stream(pincodes: list, state: Optional[str], district: Optional[str]):
+    # Session stream ke andar hi - response khatam hone tak khula rehna chahiye
+    async with AsyncSessionLocal() as db:
+        rollup = models.DailyMetricsRollup
+        latest = await db.scalar(select(func.max(rollup.period)).where(rollup.level == "pincode"))
+
+        if pincodes:
+            chunks = [pincodes[i:i + ALLOCATION_PINCODE_CHUNK] for i in range(0, len(pincodes), ALLOCATION_PINCODE_CHUNK)]
+        else:
+            chunks = [None]
+
+        for chunk in chunks:
+            result = await db.stream(allocation_statement(latest, chunk, state, district))
+            found = set()
+            async for partition in result.partitions(ALLOCATION_STREAM_ROWS):
+                records = allocation_records(compute_allocations(partition))
+                found.update(r["pincode"] for r in records)
+                yield "".join(json.dumps(r) + "\n" for r in records)
+            if chunk:
+                missing = [p for p in chunk if p not in found]
+                yield "".join(json.dumps({"pincode": p, "error": "Data not found"}) + "\n" for p in missing)
+
+# 📍 District center placement: centers + counters ka budget, unmet operator-minutes minimize
+@router.get("/optimize/placement")
+async def optimize_center_placement(
+    state: str,
+    district: str,
+    centers: int = Query(10, ge=1, le=500),
+    counters: int = Query(40, ge=1, le=5000),
+    radius: int = Query(DEFAULT_SERVICE_RADIUS, ge=0, le=999),
+    db: AsyncSession = Depends(deps.get_async_db)
+):
+    pincodes, demand = await district_demand(db, state, district)
+    if not pincodes:
+        raise HTTPException(status_code=404, detail="District not found")
+    # Solver CPU-bound hai - executor par
+    result = await run_cpu_bound(optimize_placement, pincodes, demand, centers, counters, radius)
+    return {"state": state, "district": district, **result}
+
+# 🚨 National "current surges": streaming detector ke alerts se (koi model fit nahi)
+@router.get("/anomalies/surges")
+async def get_current_surges(
+    request: Request,
+    state: str = Query("All States"),
+    district: Optional[str] = None,
+    days: int = Query(7, ge=1, le=90),
+    kind: str = Query("surge", pattern="^(surge|drop)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(deps.get_async_db)
+):
+    params = {"state": state, "district": district, "days": days, "kind": kind, "limit": limit}
+
+    async def compute():
+        latest = await db.scalar(select(func.max(AnomalyAlert.date)).where(AnomalyAlert.kind == kind))
+        stmt = current_surges_statement(days, latest, None if state == "All States" else state, district, kind, limit)
+        rows = (await db.execute(stmt)).mappings().all()
+        return {"as_of": latest, "count": len(rows), "alerts": [dict(r) for r in rows]}
+
+    # Alerts rollup refresh ke transaction mein likhe jaate hain - wahi daily_metrics scopes
+    return await cached_json(request, db, "anomalies/surges", params, _metrics_scopes(state), compute)
 
 # ✅ NAYI API: Live Dashboard Stats ke liye
 @router.get("/dashboard-stats")
-def get_dashboard_stats(
+async def get_dashboard_stats(
+    request: Request,
     state: str = Query("All States"),
     district: str = Query("All Districts"),
     pincode: str = Query("All Pincodes"),
-    year: str = Query("2025"),
-    db: Session = Depends(deps.get_db)
+    year: int = Query(2025),
+    db: AsyncSession = Depends(deps.get_async_db)
 ):
-    # 1. Base Query Banao
-    query = db.query(models.DailyAadhaarMetrics)
-
-    # 2. Filters Apply Karo (Jo user ne select kiya hai)
-    if state != "All States":
-        query = query.filter(models.DailyAadhaarMetrics.state == state)
-    if district != "All Districts":
-        query = query.filter(models.DailyAadhaarMetrics.district == district)
-    if pincode != "All Pincodes":
-        query = query.filter(models.DailyAadhaarMetrics.pincode == pincode)
-    
-    # Year Filter (Data mein Date column hai, usse extract karenge)
-    # Simple logic: Start date aur End date filter
-    start_date = f"{year}-01-01"
-    end_date = f"{year}-12-31"
-    query = query.filter(models.DailyAadhaarMetrics.date >= start_date)
-    query = query.filter(models.DailyAadhaarMetrics.date <= end_date)
-
-    # 3. Calculate Totals (Saare columns ka jod)
-    # 0-5 Enrol + 18+ Enrol + Updates...
-    total_enrolments = query.with_entities(
-        func.sum(
-            models.DailyAadhaarMetrics.enrol_0_5 + 
-            models.DailyAadhaarMetrics.enrol_18_plus +
-            models.DailyAadhaarMetrics.bio_update_5_17 +
-            models.DailyAadhaarMetrics.bio_update_17_plus +
-            models.DailyAadhaarMetrics.demo_update_5_17 +
-            models.DailyAadhaarMetrics.demo_update_17_plus
+    params = {"state": state, "district": district, "pincode": pincode, "year": year}
+    return await cached_json(
+        request, db, "dashboard-stats", params, _metrics_scopes(state),
+        lambda: _dashboard_stats(db, state, district, pincode, year),
+    )
+
+async def _dashboard_stats(db: AsyncSession, state: str, district: str, pincode: str, year: int):
+    if parquet_store.ready:
+        # 1-2. Parquet store: sirf saal ke month partitions + zaroori columns (CPU executor par)
+        total_enrolments, high_priority_count = await run_cpu_bound(
+            parquet_store.dashboard_stats, state, district, pincode, year
         )
-    ).scalar() or 0  # Agar null aaye to 0 maano
+    else:
+        # 1. Filters -> sabse coarse monthly rollup (raw daily rows scan nahi hote)
+        # Year Filter: typed DATE range
+        total_stmt, regions_stmt = dashboard_rollup_statements(state, district, pincode, year)
+
+        # 2. Calculate Totals (Saare columns ka jod)
+        # 0-5 Enrol + 18+ Enrol + Updates...
+        total_enrolments = (await db.execute(total_stmt)).scalar() or 0  # Agar null aaye to 0 maano
 
-    # 4. Dummy Logic for Growth & Prediction (Hackathon ke liye)
+        # Priority Regions Count: saal mein active distinct pincodes (pincode-level rollup se)
+        high_priority_count = (await db.execute(regions_stmt)).scalar() or 0
+
+    # 3. Dummy Logic for Growth & Prediction (Hackathon ke liye)
     # Asli growth ke liye pichle saal ka data chahiye hota hai, abhi hum formula use karenge
     predicted_next_q = int(total_enrolments * 0.15) # 15% growth prediction
     growth_rate = 12.5 # Static rakh sakte ho ya random logic laga sakte ho
 
-    # Priority Regions Count (Jahan load > 50 hai)
-    # Ye thoda complex query hai, isliye abhi count distinct pincodes bhej dete hain
-    high_priority_count = query.distinct(models.DailyAadhaarMetrics.pincode).count()
-
     return {
         "total_enrolments": total_enrolments,
         "growth_rate": f"+{growth_rate}%",
         "high_priority_regions": high_priority_count,
         "predicted_enrolments": predicted_next_q
     }
-def predict_resources(pincode: str, db: Session = Depends(deps.get_db)):
-    # 1. Database se Data nikalo
-    historical_data = db.query(models.DailyAadhaarMetrics)\
-                        .filter(models.DailyAadhaarMetrics.pincode == pincode)\
-                        .order_by(models.DailyAadhaarMetrics.date)\
-                        .all()
+# 📈 Trend chart: period-wise enrolments / updates / workload (rollups se, raw rows nahi)
+# points > 0 ho to LTTB se utne points tak - national daily history par bhi payload chhota rehta hai
+@router.get("/trend")
+async def get_trend(
+    request: Request,
+    state: str = Query("All States"),
+    district: str = Query("All Districts"),
+    pincode: str = Query("All Pincodes"),
+    granularity: str = Query("month", pattern="^(day|week|month)$"),
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    points: int = Query(100, ge=0, le=5000),   # 0 = poori resolution
+    db: AsyncSession = Depends(deps.get_async_db)
+):
+    params = {"state": state, "district": district, "pincode": pincode, "granularity": granularity,
+              "start": start, "end": end, "points": points}
+
+    async def compute():
+        stmt = trend_statement(db.bind, state, district, pincode, granularity, start, end)
+        rows = (await db.execute(stmt)).all()
+        keep = range(len(rows))
+        if points and len(rows) > points:
+            periods = [date.fromisoformat(str(r.period)[:10]).toordinal() for r in rows]
+            keep = lttb_indices(periods, [[r.enrolments for r in rows], [r.updates for r in rows],
+                                          [r.workload_hours or 0 for r in rows]], points)
+        return {
+            "granularity": granularity,
+            "source_points": len(rows),
+            "points": len(keep),
+            "series": [
+                {
+                    "period": str(rows[i].period)[:10],
+                    "enrolments": int(rows[i].enrolments or 0),
+                    "updates": int(rows[i].updates or 0),
+                    "workload_hours": round(rows[i].workload_hours or 0, 1),
+                }
+                for i in keep
+            ],
+        }
+
+    return await cached_json(request, db, "trend", params, _metrics_scopes(state), compute)
+
+# 📤 Bulk export: dashboard wale filters, CSV / NDJSON / Parquet (+ gzip), constant memory stream
+@router.get("/export/{dataset}")
+async def export_data(
+    dataset: str = Path(pattern="^(daily_metrics|region_stats)$"),
+    state: str = Query("All States"),
+    district: str = Query("All Districts"),
+    pincode: str = Query("All Pincodes"),
+    year: Optional[int] = None,   # Sirf daily_metrics par
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson|parquet)$"),
+    gzip: bool = False,
+):
+    if fmt == "parquet":
+        if gzip:
+            raise HTTPException(status_code=422, detail="Parquet is already compressed (zstd); drop gzip")
+        if not parquet_available():
+            raise HTTPException(status_code=501, detail="Parquet export needs pyarrow")
+    media_type, extension = EXPORT_FORMATS[fmt]
+    suffix = f"_{year}" if year and dataset == "daily_metrics" else ""
+    filename = f"{dataset}{suffix}.{extension}{'.gz' if gzip else ''}"
+    return StreamingResponse(
+        stream_export(export_statement(dataset, state, district, pincode, year), build_encoder(dataset, fmt, gzip)),
+        media_type="application/gzip" if gzip else media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+# 🔮 Pincode Forecast + Resource Recommendation
+@router.get("/predict/{pincode}")
+async def predict_resources(pincode: str, db: Session = Depends(deps.get_db)):
+    # Cache miss par model fit hota hai - CPU executor par, event loop block nahi hota
+    return await run_cpu_bound(_predict_resources, db, pincode)
+
+def _predict_resources(db: Session, pincode: str):
+    # 1. Forecast cache se lo (data version same hai to Prophet dobara nahi chalega)
+    # Cache miss par hi on-demand fit hota hai
+    forecast, cache_hit = get_forecast(db, pincode)
     
-    if not historical_data:
+    if forecast is None:
         return {
             "pincode": pincode,
             "status": "No Data",
@@ -103,8 +342,11 @@ def predict_resources(pincode: str, db: Session = Depends(deps.get_db)):
         }
 
     # 2. 🔥 AI ENGINE CALL KARO
-    # Yeh Prophet, Isolation Forest aur Math sab handle karega
-    ai_result = get_ai_insights(historical_data)
+    # Forecast cache se, anomaly status detector state se (live lookup), sirf counters ka math yahan
+    ai_result = get_ai_insights(
+        None, predicted_mins=forecast.predicted_workload_mins,
+        status=anomaly_status(db, pincode) or forecast.anomaly_status,
+    )
     
     # 3. Recommendation Text Generate Karo
     recommendations = []
@@ -133,9 +375,8 @@ def predict_resources(pincode: str, db: Session = Depends(deps.get_db)):
 
     # Workload Breakdown Logic
     # Hum latest data check karke dekhenge ki kis type ka load zyada hai
-    latest = historical_data[-1]
-    new_enrols = latest.enrol_0_5 + latest.enrol_18_plus
-    updates = latest.bio_update_5_17 + latest.bio_update_17_plus + latest.demo_update_5_17
+    # Sirf do jod SQL mein - poora ORM row nahi
+    new_enrols, updates = latest_mix(db, pincode)
 
     if new_enrols > updates:
         recommendations.append("👶 Focus: Deploy more Enrollment Kits (New Aadhaar).")
@@ -148,39 +389,6 @@ def predict_resources(pincode: str, db: Session = Depends(deps.get_db)):
         "predicted_workload_hours": workload,
         "required_counters": req_counters,
         "anomaly_status": status,
+        "forecast_cached": cache_hit,
         "ai_insights": recommendations
     }
-    
-    if not recent_data:
-        return {"status": "No Data", "recommendation": "Data unavailable for this pincode."}
-
-    # 2. Totals calculate karo
-    avg_daily_workload = sum(d.total_workload_hours for d in recent_data) / len(recent_data)
-    total_new_enrols = sum(d.enrol_0_5 + d.enrol_18_plus for d in recent_data)
-    total_updates = sum(d.bio_update_17_plus + d.demo_update_17_plus for d in recent_data)
-
-    # 3. AI RECOMMENDATION LOGIC 🧠
-    recommendation = []
-    priority = "Low"
-    
-    # Ek center din mein 8 ghante kaam karta hai.
-    # Agar workload 12 ghante ka hai, toh 1.5 centers chahiye (yaani 2 centers).
-    required_counters = round(avg_daily_workload / 8, 1)
-
-    if required_counters > 1.5:
-        priority = "Critical"
-        recommendation.append(f"🔥 HIGH LOAD: Daily workload is {avg_daily_workload:.1f} hours.")
-        recommendation.append(f"✅ ACTION: Open {int(required_counters)} active counters immediately.")
-    
-    if total_new_enrols > total_updates * 2:
-        recommendation.append("👶 Focus: Deployment of Child Enrolment Kits needed.")
-    elif total_updates > total_new_enrols * 2:
-        recommendation.append("🔄 Focus: Setup 'Update-Only' fast-track lane.")
-
-    return {
-        "pincode": pincode,
-        "priority": priority,
-        "predicted_workload_hours": avg_daily_workload,
-        "required_counters": required_counters,
-        "ai_insights": recommendation
-    }
\ No newline at end of file
@@ -1,5 +1,10 @@
+from pathlib import Path
+from typing import Optional
 from pydantic_settings import BaseSettings
 
+# Aadhar_backend/ - relative data paths isi se resolve hote hain (cwd se nahi)
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
 class Settings(BaseSettings):
     PROJECT_NAME: str
     DATABASE_URL: str
@@ -7,7 +12,58 @@ class Settings(BaseSettings):
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
 
+    # Connection pool (QueuePool - Postgres aur file SQLite dono)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_STATEMENT_CACHE_SIZE: int = 500   # Compiled SQL cache + asyncpg prepared statements
+
+    # SQLite tuning - WAL se readers writer ko block nahi karte
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_CACHE_SIZE_MB: int = 64
+    SQLITE_MMAP_SIZE_MB: int = 256
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_READER_POOL_SIZE: int = 8     # Read-only async pool (filters / dashboard)
+
+    # Ingestion (streaming loader) - peak RAM isi budget se tay hoti hai, dataset size se nahi
+    INGEST_MEMORY_BUDGET_MB: int = 1024
+    INGEST_SPILL_DIR: Optional[str] = None
+
+    # Forecast cache - background refit of pincodes whose data changed
+    FORECAST_SCHEDULER_ENABLED: bool = True  # Har worker start karta hai; refit sirf DB lease holder karta hai
+    FORECAST_REFRESH_INTERVAL_SECONDS: int = 300
+    FORECAST_REFRESH_BATCH_SIZE: int = 200
+    FORECAST_FAILURE_BACKOFF_SECONDS: int = 600        # Har lagataar failure par double
+    FORECAST_FAILURE_MAX_BACKOFF_SECONDS: int = 86400
+
+    # Nightly batch forecast (None = saare CPU cores)
+    BATCH_FORECAST_WORKERS: Optional[int] = None
+    BATCH_FORECAST_CHUNK_SIZE: int = 50
+
+    # Analytics response cache (LRU + ETag); loader ke data versions DB se itne seconds mein padhe jaate hain
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 2048
+    DATA_VERSION_POLL_SECONDS: float = 2.0
+
+    # Geo filter index: region_stats + India Post pincode directory (backend folder se relative)
+    GEO_PINCODE_CSV: Optional[str] = "pincode-dataset.csv"
+
+    # Request path par model work ka dedicated pool (None = min(4, CPU count))
+    CPU_EXECUTOR_WORKERS: Optional[int] = None
+
+    # Prophet / scikit-learn startup par import nahi hote; True = serve shuru hote hi background warm-up
+    MODEL_WARMUP_ON_STARTUP: bool = True
+
+    # Columnar (Parquet, state x month partitions) copy for dashboard / batch forecast scans - pyarrow chahiye
+    PARQUET_STORE_ENABLED: bool = False
+    PARQUET_STORE_DIR: str = "parquet_store"
+
+    # `X-Profile: 1` header wali request ko cProfile summary milti hai (response ki jagah) - prod mein band rakho
+    REQUEST_PROFILING_ENABLED: bool = False
+
     class Config:
         env_file = ".env"
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -0,0 +1,26 @@
+import asyncio
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from app.core.config import settings
+from app.core.request_metrics import call_in_request
+
+# 🧮 CPU-heavy kaam (Prophet / IsolationForest) ka alag pool - FastAPI ka default
+# threadpool aur event loop cheap endpoints (filters, dashboard) ke liye free rehte hain.
+# Threads (process nahi) kyunki kaam DB session ke saath chalta hai; Stan/NumPy GIL chhod dete hain.
+cpu_executor = ThreadPoolExecutor(
+    max_workers=settings.CPU_EXECUTOR_WORKERS or min(4, os.cpu_count() or 1),
+    thread_name_prefix="cpu-work",
+)
+
+
+async def run_cpu_bound(fn, *args, **kwargs):
+    """
+    Sync function ko CPU executor par chalao aur result ka await karo.
+    Request ka context saath jaata hai - wahan ke SQL / AIEngine timings usi request ke hisaab mein.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(cpu_executor, context.run, partial(call_in_request, fn, *args, **kwargs))
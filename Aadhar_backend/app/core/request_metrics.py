@@ -0,0 +1,265 @@
+import cProfile
+import io
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.config import settings
+
+# 📈 Request-level metrics, Prometheus text format mein (/metrics). prometheus_client ki dependency
+# nahi - format chhota hai, wahi hand-rolled counters jaise pool_metrics.py mein.
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250, 1000)
+ROW_BUCKETS = (0, 1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_TOP_FUNCTIONS = 30
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + list(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def metric_family(name: str, kind: str, help_text: str, samples) -> list:
+    """samples: [(labels dict, value)] -> exposition lines (None values skip)."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        if value is not None:
+            lines.append(f"{name}{_labels(labels.keys(), labels.values())} {_number(value)}")
+    return lines
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names=()):
+        self.name, self.help, self.label_names = name, help_text, tuple(label_names)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[n] for n in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        with self._lock:
+            values = dict(self._values)
+        return metric_family(self.name, "counter", self.help,
+                             [(dict(zip(self.label_names, key)), v) for key, v in sorted(values.items())])
+
+
+class Histogram:
+    """Fixed buckets; har label combination ke cumulative bucket counts + sum + count."""
+
+    def __init__(self, name: str, help_text: str, label_names=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.label_names = name, help_text, tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series = {}   # labels -> [bucket counts..., sum, count]
+
+    def observe(self, value, **labels):
+        key = tuple(labels[n] for n in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list:
+        with self._lock:
+            snapshot = {key: list(s) for key, s in self._series.items()}
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(snapshot.items()):
+            for bound, count in zip(self.buckets + (float("inf"),), series[:len(self.buckets)] + [series[-1]]):
+                le = f'le="{_number(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, key, [le])} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(float(series[-2]))}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {series[-1]}")
+        return lines
+
+
+HTTP_LATENCY = Histogram("http_request_duration_seconds", "Request latency by route template",
+                         ("route", "method", "status"))
+HTTP_SQL_STATEMENTS = Histogram("http_request_sql_statements", "SQL statements executed per request",
+                                ("route",), STATEMENT_BUCKETS)
+HTTP_SQL_SECONDS = Histogram("http_request_sql_duration_seconds", "Time spent in SQL per request", ("route",))
+HTTP_SQL_ROWS = Histogram("http_request_sql_rows", "Rows fetched from SELECTs per request", ("route",), ROW_BUCKETS)
+AI_STAGE_SECONDS = Histogram("ai_engine_stage_duration_seconds",
+                             "AIEngine stage time (dataframe_build, prophet_fit, isolation_forest, ...)", ("stage",))
+AI_ERRORS = Counter("ai_engine_errors_total", "Model failures that fell back to a default answer", ("component",))
+
+REGISTRY = [HTTP_LATENCY, HTTP_SQL_STATEMENTS, HTTP_SQL_SECONDS, HTTP_SQL_ROWS, AI_STAGE_SECONDS, AI_ERRORS]
+
+
+def render_metrics(extra_families=()) -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines += metric.render()
+    for family in extra_families:
+        lines += family
+    return "\n".join(lines) + "\n"
+
+
+class RequestStats:
+    """
+    Ek request ka hisaab: SQL (query_metrics hooks bharte hain), AIEngine stages, optional profiler.
+    ContextVar mein rehta hai - threadpool / cpu executor tak context copy hota hai.
+    """
+
+    def __init__(self, profiler=None):
+        self.started = time.perf_counter()
+        self.statements = 0
+        self.sql_seconds = 0.0
+        self.rows = 0
+        self.stages = {}
+        self.profiler = profiler
+        self.worker_profiles = []   # cpu executor threads ke profilers (cProfile per-thread hai)
+
+    def server_timing(self) -> str:
+        parts = [f'db;dur={self.sql_seconds * 1000:.1f};desc="{self.statements} statements, {self.rows} rows"']
+        parts += [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in self.stages.items()]
+        parts.append(f"app;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(parts)
+
+
+_request_stats = ContextVar("request_stats", default=None)
+
+
+def current_request_stats():
+    return _request_stats.get()
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """AIEngine ke heavy hisse: global histogram + (request ke andar ho to) us request ka Server-Timing."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        AI_STAGE_SECONDS.observe(elapsed, stage=stage)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.stages[stage] = stats.stages.get(stage, 0.0) + elapsed
+
+
+def call_in_request(fn, *args, **kwargs):
+    """cpu executor thread mein fn; profiled request ho to is thread ka alag cProfile (baad mein merge)."""
+    stats = _request_stats.get()
+    if stats is None or stats.profiler is None:
+        return fn(*args, **kwargs)
+    profiler = cProfile.Profile()
+    stats.worker_profiles.append(profiler)
+    return profiler.runcall(fn, *args, **kwargs)
+
+
+# Ek waqt mein ek hi profiled request (cProfile thread ka profile hook le leta hai)
+_profile_lock = threading.Lock()
+
+
+def route_label(scope, default="unmatched") -> str:
+    """Route template poore path ke saath: mount ka root_path + template (router prefix template mein hi hai)."""
+    route = getattr(scope.get("route"), "path_format", None)
+    return scope.get("root_path", "") + route if route is not None else default
+
+
+def _profile_report(scope, status: int, elapsed: float, stats: RequestStats) -> bytes:
+    out = io.StringIO()
+    route = route_label(scope, scope["path"])
+    out.write(f"{scope['method']} {route} -> {status} in {elapsed * 1000:.1f}ms\n")
+    out.write(f"SQL: {stats.statements} statements, {stats.sql_seconds * 1000:.1f}ms, {stats.rows} rows\n")
+    if stats.stages:
+        out.write("AIEngine: " + ", ".join(f"{s} {t * 1000:.1f}ms" for s, t in stats.stages.items()) + "\n")
+    out.write(f"\nEvent loop thread + {len(stats.worker_profiles)} cpu executor call(s), "
+              f"top {PROFILE_TOP_FUNCTIONS} by cumulative time:\n")
+    profile = pstats.Stats(stats.profiler, stream=out)
+    for worker in stats.worker_profiles:
+        profile.add(worker)
+    profile.sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+    return out.getvalue().encode()
+
+
+class RequestMetricsMiddleware:
+    """
+    ⏱️ Pure ASGI middleware (streaming responses ka body khatam hone tak time):
+    route template wise latency + per-request SQL count/time/rows, Server-Timing header.
+    Server-Timing sirf Content-Length wale responses par: streaming response ka start body se pehle
+    jaata hai, tab tak SQL / rows hue hi nahi hote (0 statements dikhana galat hai).
+    REQUEST_PROFILING_ENABLED par `X-Profile: 1` header -> response ki jagah cProfile summary (text).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        profiling = (settings.REQUEST_PROFILING_ENABLED and Headers(scope=scope).get(PROFILE_HEADER)
+                     and _profile_lock.acquire(blocking=False))
+        stats = RequestStats(cProfile.Profile() if profiling else None)
+        token = _request_stats.set(stats)
+        status = 500
+        buffered = []
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                if "content-length" in headers:
+                    headers.append("Server-Timing", stats.server_timing())
+            if profiling:
+                buffered.append(message)   # Asli body nahi jaayegi - report bhejenge
+            else:
+                await send(message)
+
+        try:
+            if profiling:
+                stats.profiler.enable()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                if profiling:
+                    stats.profiler.disable()
+        finally:
+            _request_stats.reset(token)
+            elapsed = time.perf_counter() - stats.started
+            if profiling:
+                _profile_lock.release()
+            else:
+                # Profiled requests histograms mein nahi (profiler overhead latency bigaadta hai)
+                route = route_label(scope)
+                HTTP_LATENCY.observe(elapsed, route=route, method=scope["method"], status=str(status))
+                HTTP_SQL_STATEMENTS.observe(stats.statements, route=route)
+                HTTP_SQL_SECONDS.observe(stats.sql_seconds, route=route)
+                HTTP_SQL_ROWS.observe(stats.rows, route=route)
+
+        if profiling:
+            body = _profile_report(scope, status, elapsed, stats)
+            await send({"type": "http.response.start", "status": 200, "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+                (b"x-profiled-status", str(status).encode()),
+            ]})
+            await send({"type": "http.response.body", "body": body})
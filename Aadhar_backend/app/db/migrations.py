@@ -0,0 +1,182 @@
+from sqlalchemy import String, inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.base import Base
+from app.models import models
+from app.models import ingestion, prediction  # noqa: F401  (tables register karne ke liye)
+from app.services import rollup_service
+from app.services.anomaly_detector import rebuild_anomaly_states
+from app.services.ingestion_engine import METRIC_COLUMNS
+from app.services.workload_weights import apply_workload_weights
+
+
+def _index_names(conn: Connection, table: str) -> set:
+    return {ix["name"] for ix in inspect(conn).get_indexes(table)}
+
+
+def ensure_daily_metrics_key(conn: Connection) -> None:
+    """
+    Purane DB mein (date, pincode) duplicate ho sakte hain - asli CSVs mein same key district /
+    state spelling alag hone se kai baar aati hai. Group ke counts (aur workload) sabse naye record
+    mein jodo (accumulating upsert jaisa), baaki hatao, phir unique index banao.
+    """
+    table = models.DailyAadhaarMetrics.__tablename__
+    if "ux_daily_metrics_date_pincode" in _index_names(conn, table):
+        return
+
+    print("🛠️ Migration: merging duplicate daily_aadhaar_metrics rows on (date, pincode)...")
+    summed = METRIC_COLUMNS + ["total_workload_hours"]
+    conn.execute(text(
+        f"CREATE TEMP TABLE _dup_totals AS SELECT MAX(id) AS id, "
+        + ", ".join(f"SUM({c}) AS {c}" for c in summed)
+        + f" FROM {table} GROUP BY date, pincode HAVING COUNT(*) > 1"
+    ))
+    conn.execute(text(
+        f"UPDATE {table} SET "
+        + ", ".join(f"{c} = (SELECT d.{c} FROM _dup_totals d WHERE d.id = {table}.id)" for c in summed)
+        + " WHERE id IN (SELECT id FROM _dup_totals)"
+    ))
+    conn.execute(text("DROP TABLE _dup_totals"))
+    conn.execute(text(
+        f"DELETE FROM {table} WHERE id NOT IN "
+        f"(SELECT MAX(id) FROM {table} GROUP BY date, pincode)"
+    ))
+    conn.execute(text(
+        f"CREATE UNIQUE INDEX ux_daily_metrics_date_pincode ON {table} (date, pincode)"
+    ))
+
+
+def migrate_daily_metrics_date(conn: Connection) -> None:
+    """
+    `date` pehle String (DD-MM-YYYY) tha - lexicographic compare galat tha.
+    Ek hi bulk UPDATE / ALTER se typed DATE (YYYY-MM-DD) mein badlo.
+    """
+    table = models.DailyAadhaarMetrics.__tablename__
+
+    if conn.dialect.name == "postgresql":
+        date_col = next(c for c in inspect(conn).get_columns(table) if c["name"] == "date")
+        if isinstance(date_col["type"], String):
+            print("🛠️ Migration: converting daily_aadhaar_metrics.date to DATE...")
+            conn.execute(text(
+                f"ALTER TABLE {table} ALTER COLUMN date TYPE DATE USING to_date(date, 'DD-MM-YYYY')"
+            ))
+        return
+
+    # SQLite: DATE bhi text hi hai, bas ISO format chahiye (SQLAlchemy Date wahi padhta hai)
+    legacy = conn.execute(text(f"SELECT 1 FROM {table} WHERE date LIKE '__-__-____' LIMIT 1")).first()
+    if legacy:
+        print("🛠️ Migration: backfilling daily_aadhaar_metrics.date to YYYY-MM-DD...")
+        conn.execute(text(
+            f"UPDATE {table} SET date = substr(date, 7, 4) || '-' || substr(date, 4, 2) || '-' || substr(date, 1, 2) "
+            f"WHERE date LIKE '__-__-____'"
+        ))
+
+
+def ensure_daily_metrics_indexes(conn: Connection) -> None:
+    """
+    Composite indexes (real access paths) banao, aur purane single-column
+    indexes hatao jo ab composite ke prefix se cover ho jaate hain.
+    """
+    table = models.DailyAadhaarMetrics.__tablename__
+    existing = _index_names(conn, table)
+
+    for name in ("ix_daily_aadhaar_metrics_date", "ix_daily_aadhaar_metrics_state",
+                 "ix_daily_aadhaar_metrics_district", "ix_daily_aadhaar_metrics_pincode"):
+        if name in existing:
+            conn.execute(text(f"DROP INDEX {name}"))
+
+    missing = [ix for ix in models.DailyAadhaarMetrics.__table__.indexes if ix.name not in existing]
+    for index in missing:
+        print(f"🛠️ Migration: creating index {index.name}...")
+        index.create(bind=conn)
+
+    if missing and conn.dialect.name == "sqlite":
+        conn.execute(text(f"ANALYZE {table}"))  # Planner ko stats chahiye
+
+
+def ensure_region_stats_indexes(conn: Connection) -> None:
+    """
+    Purane DB mein demand_score index nahi tha (gap ranking / top-N ORDER BY isi par), na hi
+    (state, pincode) / (state, district, pincode) composites. Single-column state index inka prefix hai - hatao.
+    """
+    table = models.RegionStats.__tablename__
+    existing = _index_names(conn, table)
+    if "ix_region_stats_state" in existing:
+        conn.execute(text("DROP INDEX ix_region_stats_state"))
+    missing = [ix for ix in models.RegionStats.__table__.indexes if ix.name not in existing]
+    for index in missing:
+        print(f"🛠️ Migration: creating index {index.name}...")
+        index.create(bind=conn)
+
+    if missing and conn.dialect.name == "sqlite":
+        conn.execute(text(f"ANALYZE {table}"))
+
+
+def add_prediction_run_id(conn: Connection) -> None:
+    """prediction_logs mein run_id nahi tha - har batch run ki rows pehle wale runs se alag nahi hoti thi."""
+    table = prediction.PredictionLog.__tablename__
+    if any(c["name"] == "run_id" for c in inspect(conn).get_columns(table)):
+        return
+    print("🛠️ Migration: adding prediction_logs.run_id...")
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN run_id VARCHAR"))
+    conn.execute(text(f"CREATE INDEX ix_{table}_run_id ON {table} (run_id)"))
+
+
+def drop_forecast_model_json(conn: Connection) -> None:
+    """forecast_models.model_json kabhi padha nahi gaya - har pincode ka Prophet JSON bas jagah gher raha tha."""
+    table = prediction.ForecastModel.__tablename__
+    if any(c["name"] == "model_json" for c in inspect(conn).get_columns(table)):
+        print("🛠️ Migration: dropping unused forecast_models.model_json...")
+        conn.execute(text(f"ALTER TABLE {table} DROP COLUMN model_json"))
+
+
+def backfill_rollups(conn: Connection) -> None:
+    """Rollup tables naye hain aur raw data pehle se hai -> ek baar poori history aggregate karo."""
+    has_rollups = conn.execute(text(f"SELECT 1 FROM {models.MonthlyMetricsRollup.__tablename__} LIMIT 1")).first()
+    has_metrics = conn.execute(text(f"SELECT 1 FROM {models.DailyAadhaarMetrics.__tablename__} LIMIT 1")).first()
+    if has_metrics and not has_rollups:
+        print("🛠️ Migration: building dashboard rollups from existing daily metrics...")
+        rollup_service.rebuild_all(conn)
+
+
+def backfill_pincode_versions(conn: Connection) -> None:
+    """Purane data ke pincodes ko version 1 do, taaki scheduler unke forecasts bana sake."""
+    versions = models.PincodeDataVersion.__tablename__
+    metrics = models.DailyAadhaarMetrics.__tablename__
+    if conn.execute(text(f"SELECT 1 FROM {versions} LIMIT 1")).first():
+        return
+    conn.execute(text(
+        f"INSERT INTO {versions} (pincode, version) SELECT DISTINCT pincode, 1 FROM {metrics} WHERE pincode IS NOT NULL"
+    ))
+
+
+def backfill_anomaly_states(conn: Connection) -> None:
+    """Detector naya hai aur history pehle se hai -> ek baar replay karke state + alerts banao."""
+    has_states = conn.execute(text(f"SELECT 1 FROM {prediction.AnomalyState.__tablename__} LIMIT 1")).first()
+    has_metrics = conn.execute(text(f"SELECT 1 FROM {models.DailyAadhaarMetrics.__tablename__} LIMIT 1")).first()
+    if has_metrics and not has_states:
+        print("🛠️ Migration: replaying daily metrics into the anomaly detector...")
+        rebuild_anomaly_states(conn)
+
+
+# Order matters: har step idempotent hai, dobara chalane par kuch nahi karta
+MIGRATIONS = [
+    ensure_daily_metrics_key,
+    migrate_daily_metrics_date,
+    ensure_daily_metrics_indexes,
+    ensure_region_stats_indexes,
+    drop_forecast_model_json,
+    add_prediction_run_id,
+    backfill_rollups,
+    backfill_pincode_versions,
+    apply_workload_weights,
+    backfill_anomaly_states,
+]
+
+
+def run_migrations(engine: Engine) -> None:
+    """Naye tables banao aur purane DB ko current schema tak le aao."""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for step in MIGRATIONS:
+            step(conn)
@@ -0,0 +1,98 @@
+import threading
+import time
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Ek engine ke pool ke checkout wait / utilization counters (thread-safe)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def observe(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def snapshot(self):
+        capacity = in_use = None
+        if isinstance(self.pool, QueuePool):
+            capacity = self.pool.size() + max(self.pool._max_overflow, 0)
+            in_use = self.pool.checkedout()
+        with self._lock:
+            return {
+                "pool": self.name,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self.wait_seconds_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+                "in_use": in_use,
+                "capacity": capacity,
+                "utilization": round(in_use / capacity, 3) if capacity else None,
+            }
+
+
+# name -> PoolMetrics (session.py har engine ke liye register karta hai)
+POOL_METRICS = {}
+
+
+def _timed_get(pool, get):
+    started = time.perf_counter()
+    try:
+        conn = get()
+    except Exception:
+        pool.metrics.observe(time.perf_counter() - started, timed_out=True)
+        raise
+    pool.metrics.observe(time.perf_counter() - started)
+    return conn
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool jo har checkout ka wait time PoolMetrics mein record karta hai."""
+    metrics = None
+
+    def _do_get(self):
+        return _timed_get(self, super()._do_get)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        pool.metrics.pool = pool
+        return pool
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    metrics = None
+
+    def _do_get(self):
+        return _timed_get(self, super()._do_get)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        pool.metrics.pool = pool
+        return pool
+
+
+def instrument(engine, name: str):
+    """Engine ke pool ko named metrics se jodo (sirf Instrumented pools par)."""
+    pool = engine.pool
+    if isinstance(pool, (InstrumentedQueuePool, InstrumentedAsyncQueuePool)):
+        pool.metrics = POOL_METRICS.setdefault(name, PoolMetrics(name))
+        pool.metrics.pool = pool
+    return engine
+
+
+def pool_stats():
+    return [m.snapshot() for m in POOL_METRICS.values()]
@@ -0,0 +1,70 @@
+import time
+
+from sqlalchemy import event
+
+from app.core.request_metrics import current_request_stats
+
+
+class _RowCountingCursor:
+    """
+    DBAPI cursor wrapper: fetch* se aayi rows aur fetch ka time request stats mein, baaki sab asli cursor ka.
+    (SQLite execute lazy hai - asli kaam fetch mein hota hai.)
+    """
+
+    __slots__ = ("_cursor", "_stats")
+
+    def __init__(self, cursor, stats):
+        self._cursor = cursor
+        self._stats = stats
+
+    def _fetched(self, rows, started):
+        self._stats.rows += rows
+        self._stats.sql_seconds += time.perf_counter() - started
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._fetched(row is not None, started)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        started = time.perf_counter()
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._fetched(len(rows), started)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._fetched(len(rows), started)
+        return rows
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def track_queries(sync_engine):
+    """
+    🔍 Cursor events: request ke andar chale har statement ka time + count (+ SELECT rows).
+    Request context na ho (loaders, scheduler, warm-up) to kuch nahi - sirf ek ContextVar lookup.
+    Async engine ke liye uska sync_engine do.
+    """
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and current_request_stats() is not None:
+            context._metrics_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_metrics_started", None)
+        stats = current_request_stats()
+        if started is None or stats is None:
+            return
+        stats.statements += 1
+        stats.sql_seconds += time.perf_counter() - started
+        # Result isi cursor se baad mein banta hai - wrapper lagao taaki fetched rows gine jaayein
+        if cursor.description is not None and context.cursor is cursor:
+            context.cursor = _RowCountingCursor(cursor, stats)
+
+    return sync_engine
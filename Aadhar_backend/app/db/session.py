@@ -1,9 +1,114 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument
+from app.db.query_metrics import track_queries
 
-# SQLite ke liye connect_args zaroori hai, Postgres ke liye hata dena
-engine = create_engine(
-    settings.DATABASE_URL, connect_args={"check_same_thread": False}
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
+# Sync driver -> async driver (same database, async routes ke liye)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+def _is_file_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+def _sqlite_pragmas(read_only: bool):
+    pragmas = [
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_MB * 1024}",  # negative = KiB
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE_MB * 1024 * 1024}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    else:
+        # journal_mode file mein persist hota hai - writer connection set karta hai
+        pragmas += [
+            f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}",
+            f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        ]
+    return pragmas
+
+def _apply_pragmas(sync_engine, pragmas):
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, _record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+def _pool_kwargs(poolclass, pool_size):
+    return {
+        "poolclass": poolclass,
+        "pool_size": pool_size,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "query_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+
+def build_engine(url: str):
+    """
+    🔧 Backend ke hisaab se sync (writer) engine.
+    SQLite: check_same_thread off + WAL/pragmas. Postgres: sized QueuePool + pre-ping + recycle.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        kwargs = {"connect_args": {"check_same_thread": False}}
+        if _is_file_sqlite(parsed):
+            kwargs.update(_pool_kwargs(InstrumentedQueuePool, settings.DB_POOL_SIZE))
+        sync_engine = create_engine(url, **kwargs)
+        _apply_pragmas(sync_engine, _sqlite_pragmas(read_only=False))
+    else:
+        sync_engine = create_engine(
+            url,
+            pool_pre_ping=True,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            **_pool_kwargs(InstrumentedQueuePool, settings.DB_POOL_SIZE),
+        )
+    track_queries(sync_engine)
+    return instrument(sync_engine, "primary")
+
+def build_async_engine(url: str):
+    """
+    ⚡ Async engine. File SQLite par yeh read-only reader pool hai (mode=ro, query_only) -
+    WAL mein readers writer ke saath parallel chalte hain. Postgres par asyncpg ka sized pool
+    with prepared statement cache.
+    """
+    parsed = make_url(async_database_url(url))
+    if parsed.get_backend_name() == "sqlite":
+        if not _is_file_sqlite(parsed):
+            async_engine = create_async_engine(parsed)
+            track_queries(async_engine.sync_engine)
+            return async_engine
+        reader_url = parsed.set(database=f"file:{parsed.database}", query={"mode": "ro", "uri": "true"})
+        async_engine = create_async_engine(
+            reader_url, **_pool_kwargs(InstrumentedAsyncQueuePool, settings.SQLITE_READER_POOL_SIZE)
+        )
+        _apply_pragmas(async_engine.sync_engine, _sqlite_pragmas(read_only=True))
+    else:
+        async_engine = create_async_engine(
+            parsed,
+            pool_pre_ping=True,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+            **_pool_kwargs(InstrumentedAsyncQueuePool, settings.DB_POOL_SIZE),
+        )
+    track_queries(async_engine.sync_engine)
+    instrument(async_engine.sync_engine, "async_reader" if parsed.get_backend_name() == "sqlite" else "async")
+    return async_engine
+
+engine = build_engine(settings.DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async engine (aiosqlite / asyncpg) - cheap read endpoints event loop par hi chalte hain
+async_engine = build_async_engine(settings.DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
@@ -1,15 +1,51 @@
-from fastapi import FastAPI
+import threading
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 # --- Correction is here (Sahi imports) ---
-from app.db.base import Base
-from app.db.session import engine
+from app.db.migrations import run_migrations
+from app.db.pool_metrics import pool_stats
+from app.db.session import async_engine, engine
 # -----------------------------------------
 from app.api.endpoints import analytics
+from app.core.config import settings
+from app.core.executor import cpu_executor
+from app.core.request_metrics import PROMETHEUS_CONTENT_TYPE, RequestMetricsMiddleware, metric_family, render_metrics
+from app.services.analytics_engine import gap_ranking
+from app.services.forecast_store import forecast_scheduler
+from app.services.geo_index import geo_index
+from app.services.model_stack import model_stack
+from app.services.response_cache import response_cache
 
-# Database Tables create kar dega start hote hi
-Base.metadata.create_all(bind=engine)
+# Database Tables create kar dega start hote hi (aur purane DB ka migration)
+run_migrations(engine)
 
-app = FastAPI(title="Aadhaar Enrolment Analytics")
+def warm_up():
+    """
+    🔥 Warm-up phase (background thread): pehle geo filter index + gap ranking, phir Prophet / sklearn.
+    Server iska wait kiye bina serve karta hai - beech mein aayi request snapshot khud bana leti hai
+    (ensure: dobara build nahi), forecast request model khud load kar leti hai.
+    """
+    geo_index.ensure()
+    gap_ranking.ensure()
+    app.state.ready_at = time.time()
+    if settings.MODEL_WARMUP_ON_STARTUP:
+        model_stack.warm_up()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.ready_at = None
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    # Background forecast refit (stale pincodes) start/stop
+    if settings.FORECAST_SCHEDULER_ENABLED:
+        forecast_scheduler.start()
+    yield
+    forecast_scheduler.stop()
+    cpu_executor.shutdown(wait=False, cancel_futures=True)
+    await async_engine.dispose()
+
+app = FastAPI(title="Aadhaar Enrolment Analytics", lifespan=lifespan)
 
 # CORS (Frontend connect karne ke liye)
 origins = [
@@ -28,9 +64,69 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ⏱️ Sabse bahar: latency + per-request SQL / AIEngine timings (aur opt-in X-Profile)
+app.add_middleware(RequestMetricsMiddleware)
+
 # Routes Jodna
-app.include_router(analytics.router, prefix="/api/v1", tags=["analytics"])
+app.include_router(analytics.router)
 
 @app.get("/")
 def root():
     return {"message": "Aadhaar Analytics API is Running!"}
+
+# 🚦 Readiness: indexes (filters / dashboard) bante hi 200; forecast engines alag se report hote hain.
+# ?models=true wale probe ko 503 jab tak Prophet / sklearn load na ho jaayein (forecast-heavy replicas ke liye)
+@app.get("/ready")
+def readiness(response: Response, models: bool = False):
+    ready = geo_index.value is not None and gap_ranking.value is not None
+    if not ready or (models and not model_stack.ready):
+        response.status_code = 503
+    return {
+        "ready": ready,
+        "models_ready": model_stack.ready,
+        "ready_at": app.state.ready_at,
+        "indexes": {
+            "geo_index": geo_index.value.version if geo_index.value else None,
+            "gap_ranking": gap_ranking.value.version if gap_ranking.value else None,
+        },
+        "engines": model_stack.status(),
+    }
+
+# 📈 Connection pool health: checkout wait time + utilization (har engine ka)
+@app.get("/metrics/db-pool")
+def db_pool_metrics():
+    return pool_stats()
+
+# 🗃️ Response cache hit/miss (route-wise)
+@app.get("/metrics/response-cache")
+def response_cache_metrics():
+    return response_cache.stats()
+
+# 🗺️ Geo index ka size (arrays + lookup dict)
+@app.get("/metrics/geo-index")
+def geo_index_metrics():
+    return geo_index.value.memory_report() if geo_index.value else {}
+
+def _pool_and_cache_families():
+    pools = pool_stats()
+    caches = response_cache.stats()["routes"]
+    pool_label = lambda p: {"pool": p["pool"]}
+    return [
+        metric_family("db_pool_checkouts_total", "counter", "Pool checkouts",
+                      [(pool_label(p), p["checkouts"]) for p in pools]),
+        metric_family("db_pool_timeouts_total", "counter", "Pool checkouts that timed out",
+                      [(pool_label(p), p["timeouts"]) for p in pools]),
+        metric_family("db_pool_in_use", "gauge", "Connections checked out right now",
+                      [(pool_label(p), p["in_use"]) for p in pools]),
+        metric_family("db_pool_capacity", "gauge", "Pool size + max overflow",
+                      [(pool_label(p), p["capacity"]) for p in pools]),
+        metric_family("response_cache_hits_total", "counter", "Response cache hits",
+                      [({"route": r}, s["hits"]) for r, s in caches.items()]),
+        metric_family("response_cache_misses_total", "counter", "Response cache misses",
+                      [({"route": r}, s["misses"]) for r, s in caches.items()]),
+    ]
+
+# 📊 Prometheus scrape: request latency / SQL / AIEngine histograms + pool + response cache
+@app.get("/metrics")
+def prometheus_metrics():
+    return Response(render_metrics(_pool_and_cache_families()), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Float, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class IngestionManifest(Base):
+    """
+    Har source file ka record: kaunsi file, kitni badi, kab badli, content hash,
+    aur kitni rows commit ho chuki hain (crash ke baad resume ke liye).
+    """
+    __tablename__ = "ingestion_manifest"
+    __table_args__ = (UniqueConstraint("loader", "source_path", name="ux_manifest_loader_path"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    loader = Column(String, nullable=False)       # e.g., "daily_metrics:enrolment"
+    source_path = Column(String, nullable=False)
+    size_bytes = Column(BigInteger)
+    mtime = Column(Float)
+    content_hash = Column(String)                 # sha256
+    status = Column(String, default="in_progress")  # in_progress / done
+    rows_committed = Column(Integer, default=0)   # File ki kitni rows DB mein pahunch gayi
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -8,9 +8,14 @@ class RegionStats(Base):
     Har Pincode ka apna ek record hoga.
     """
     __tablename__ = "region_stats"
+    __table_args__ = (
+        # Allocation / filters: state (+ district) scope, pincode order mein - na full scan, na sort
+        Index("ix_region_stats_state_pincode", "state", "pincode"),
+        Index("ix_region_stats_geo", "state", "district", "pincode"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    state = Column(String, index=True)          # e.g., Rajasthan
+    state = Column(String)                      # e.g., Rajasthan
     district = Column(String, index=True)       # e.g., Jaipur
     pincode = Column(String, unique=True, index=True) # e.g., 302001
     
@@ -24,7 +29,7 @@ class RegionStats(Base):
     
     # Analytics Metrics (Hum calculate karenge)
     saturation_percentage = Column(Float)       # (Generated / Population) * 100
-    demand_score = Column(Float)                # AI Score: Kahan center chahiye
+    demand_score = Column(Float, index=True)    # AI Score: Kahan center chahiye (ranking ke liye indexed)
 
 class EnrolmentTrend(Base):
     """
@@ -40,12 +45,20 @@ class EnrolmentTrend(Base):
 
 class DailyAadhaarMetrics(Base):
     __tablename__ = "daily_aadhaar_metrics"
+    __table_args__ = (
+        # Upsert key: ek pincode ka ek din mein ek hi record (date range scan bhi isi se)
+        Index("ux_daily_metrics_date_pincode", "date", "pincode", unique=True),
+        # Dashboard filters: state -> district -> pincode -> date range
+        Index("ix_daily_metrics_geo_date", "state", "district", "pincode", "date"),
+        # Ek pincode ki history (AI Engine)
+        Index("ix_daily_metrics_pincode_date", "pincode", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    date = Column(String, index=True)  # Format: DD-MM-YYYY
-    state = Column(String, index=True)
-    district = Column(String, index=True)
-    pincode = Column(String, index=True)
+    date = Column(Date, nullable=False)  # Typed DATE (source CSV mein DD-MM-YYYY tha)
+    state = Column(String)
+    district = Column(String)
+    pincode = Column(String)
     
     # 1. New Enrolments Breakdown
     enrol_0_5 = Column(Integer, default=0)
@@ -60,4 +73,88 @@ class DailyAadhaarMetrics(Base):
 
     # 3. Calculated Workload (AI Logic)
     # New Enrollment = 20 mins, Bio Update = 15 mins, Demo Update = 8 mins
-    total_workload_hours = Column(Float, default=0.0)
\ No newline at end of file
+    total_workload_hours = Column(Float, default=0.0)
+
+class _RollupColumns:
+    """
+    Pre-aggregated dashboard totals. `level` batata hai row kis grain ki hai:
+    state (district/pincode = ""), district (pincode = ""), ya pincode.
+    """
+    id = Column(Integer, primary_key=True)
+    level = Column(String, nullable=False)      # state / district / pincode
+    state = Column(String, nullable=False, default="")
+    district = Column(String, nullable=False, default="")
+    pincode = Column(String, nullable=False, default="")
+    period = Column(Date, nullable=False)       # Din (daily) ya mahine ki pehli tareekh (monthly)
+
+    enrol_0_5 = Column(Integer, default=0)
+    enrol_5_17 = Column(Integer, default=0)
+    enrol_18_plus = Column(Integer, default=0)
+    bio_update_5_17 = Column(Integer, default=0)
+    bio_update_17_plus = Column(Integer, default=0)
+    demo_update_5_17 = Column(Integer, default=0)
+    demo_update_17_plus = Column(Integer, default=0)
+    total_workload_hours = Column(Float, default=0.0)
+
+    record_count = Column(Integer, default=0)   # Kitni daily rows jodi gayi
+    pincode_count = Column(Integer, default=0)  # Distinct pincodes (is period mein)
+
+class DailyMetricsRollup(_RollupColumns, Base):
+    __tablename__ = "metrics_rollup_daily"
+    __table_args__ = (
+        Index("ux_rollup_daily_key", "level", "state", "district", "pincode", "period", unique=True),
+        Index("ix_rollup_daily_level_period", "level", "period"),
+        Index("ix_rollup_daily_level_pincode", "level", "pincode", "period"),
+    )
+
+class MonthlyMetricsRollup(_RollupColumns, Base):
+    __tablename__ = "metrics_rollup_monthly"
+    __table_args__ = (
+        Index("ux_rollup_monthly_key", "level", "state", "district", "pincode", "period", unique=True),
+        Index("ix_rollup_monthly_level_period", "level", "period"),
+        Index("ix_rollup_monthly_level_pincode", "level", "pincode", "period"),
+    )
+
+class RollupDirtyRange(Base):
+    """
+    Ingestion har batch ke saath (usi transaction mein) affected date range yahan likhta hai.
+    Loader ke end par (ya crash ke baad agle run mein) rollups sirf in ranges ke liye refresh hote hain.
+    """
+    __tablename__ = "rollup_dirty_ranges"
+
+    id = Column(Integer, primary_key=True)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+
+class PincodeDataVersion(Base):
+    """
+    Har pincode ka data version. Ingestion jab bhi us pincode ki rows likhta hai,
+    version +1 hota hai - isi se pata chalta hai kaunse forecasts purane ho gaye.
+    """
+    __tablename__ = "pincode_data_versions"
+
+    pincode = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
+
+
+class DataScopeVersion(Base):
+    """
+    Data "scopes" (region_stats, daily_metrics, daily_metrics:<state>) ka version.
+    Loader scripts likhte waqt bump karte hain - API ka response cache isi se
+    sirf affected entries invalidate karta hai.
+    """
+    __tablename__ = "data_scope_versions"
+
+    scope = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
+
+
+class WorkloadWeightsVersion(Base):
+    """
+    Stored workload (total_workload_hours) kis weights version se likha gaya hai.
+    Code ka version isse naya ho to startup migration bulk backfill karti hai.
+    """
+    __tablename__ = "workload_weights_versions"
+
+    version = Column(Integer, primary_key=True)
+    weights_json = Column(String, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Index, Text
 from sqlalchemy.sql import func
 from app.db.base import Base
 
@@ -11,3 +11,77 @@ class PredictionLog(Base):
     confidence_score = Column(Float)
     prediction_date = Column(DateTime(timezone=True), server_default=func.now())
     algo_used = Column(String) # e.g., "LinearRegression"
+    run_id = Column(String, index=True)  # Batch forecast run (sortable UTC timestamp) - latest batch = MAX(run_id)
+
+class ForecastModel(Base):
+    """
+    Fitted forecast cache: pincode + data version ke hisaab se.
+    Request path yahin se padhta hai; background scheduler stale pincodes refit karta hai.
+    """
+    __tablename__ = "forecast_models"
+
+    pincode = Column(String, primary_key=True)
+    data_version = Column(Integer, nullable=False)
+    algo_used = Column(String)                       # e.g., "Prophet", "Mean"
+    forecast_json = Column(Text)                     # Agle 7 din ka daily workload (minutes)
+    predicted_workload_mins = Column(Float)          # 7 din ka average
+    anomaly_status = Column(String)
+    fit_seconds = Column(Float)
+    fitted_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class ForecastFailure(Base):
+    """Refit fail hua (ya history hi nahi) - backoff tak scheduler is pincode ko nahi uthata."""
+    __tablename__ = "forecast_failures"
+
+    pincode = Column(String, primary_key=True)
+    data_version = Column(Integer, nullable=False)   # Naya data aaya to backoff khatam, turant retry
+    failures = Column(Integer, nullable=False)
+    last_error = Column(Text)
+    retry_after = Column(Float, nullable=False)      # Epoch seconds
+
+class SchedulerLease(Base):
+    """Background job ka lease: kai workers / hosts mein ek hi process job chalaye."""
+    __tablename__ = "scheduler_leases"
+
+    name = Column(String, primary_key=True)
+    holder = Column(String, nullable=False)          # host:pid
+    expires_at = Column(Float, nullable=False)       # Epoch seconds
+
+class AnomalyState(Base):
+    """
+    Streaming anomaly detector ka per-pincode state (EWMA mean / variance of daily workload).
+    Load ke aakhir mein rollup refresh sabse purane dirty din se replay karta hai (late rows wale pincodes
+    shuru se); prev_* se last din ka revision (baaki category baad mein aaye) bina poore replay ke.
+    """
+    __tablename__ = "anomaly_states"
+
+    pincode = Column(String, primary_key=True)
+    last_date = Column(Date, nullable=False)
+    observations = Column(Integer, nullable=False)
+    mean = Column(Float, nullable=False)
+    variance = Column(Float, nullable=False)
+    prev_mean = Column(Float)                         # last_date se pehle ka state
+    prev_variance = Column(Float)
+    last_value = Column(Float)                        # last_date ka workload (minutes)
+    last_z = Column(Float)
+    status = Column(String)                           # "Normal Flow" / "High Surge Detected 🚨" / ...
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class AnomalyAlert(Base):
+    """Flagged din (surge / drop) - national 'current surges' isi table se."""
+    __tablename__ = "anomaly_alerts"
+    __table_args__ = (
+        Index("ux_anomaly_alerts_pincode_date", "pincode", "date", unique=True),
+        Index("ix_anomaly_alerts_kind_date", "kind", "date"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    pincode = Column(String, nullable=False)
+    state = Column(String)
+    district = Column(String)
+    date = Column(Date, nullable=False)
+    kind = Column(String, nullable=False)             # "surge" / "drop"
+    workload_mins = Column(Float)
+    expected_mins = Column(Float)                     # EWMA mean (us din se pehle)
+    z_score = Column(Float)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -9,3 +9,9 @@ class RegionFilter(BaseModel):
 class PredictionInput(BaseModel):
     pincode: str
     months_to_forecast: int = 3
+
+class BatchAllocationRequest(BaseModel):
+    """Ya to pincodes ki list, ya state / district (poora area)."""
+    pincodes: Optional[List[str]] = None
+    state: Optional[str] = None
+    district: Optional[str] = None
@@ -0,0 +1,27 @@
+import argparse
+import json
+
+from app.db.session import engine
+from app.db.migrations import run_migrations
+from app.services.ai_engine import FORECASTERS, backtest
+from app.services.batch_forecaster import fetch_histories, list_pincodes
+
+run_migrations(engine)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Forecasters ka holdout backtest (accuracy + speed)")
+    parser.add_argument("--limit", type=int, default=200, help="Kitne pincodes par backtest")
+    parser.add_argument("--horizon", type=int, default=7, help="Holdout din")
+    parser.add_argument("--only", choices=sorted(FORECASTERS), default=None, help="Sirf ek forecaster")
+    args = parser.parse_args()
+
+    pincodes = list_pincodes(engine, args.limit)
+    frames = [frame for _, frame in fetch_histories(engine, pincodes)]
+    forecasters = [FORECASTERS[args.only]] if args.only else None
+
+    print(f"🧪 Backtesting {len(frames)} pincodes (last {args.horizon} days held out)...")
+    report = backtest(frames, args.horizon, forecasters)
+    for name, row in report.items():
+        print(f"   {name:<18} MAE {row['mae']:>10}  sMAPE {row['smape']:>6}%  "
+              f"{row['seconds']:>8}s  ({row['series_per_sec']} series/sec)")
+    print(json.dumps(report, indent=2))
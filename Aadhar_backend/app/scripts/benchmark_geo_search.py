@@ -0,0 +1,91 @@
+import argparse
+import json
+import sqlite3
+import time
+
+import numpy as np
+
+from app.db.session import engine
+from app.db.migrations import run_migrations
+from app.services.geo_index import geo_index, load_hierarchy_frame
+
+run_migrations(engine)
+
+
+def make_queries(index, n: int, seed: int = 42):
+    """
+    Asli naamon se queries: poora naam, prefix, typo wala naam (ek char badla/hataya), pincode prefix.
+    """
+    rng = np.random.default_rng(seed)
+    names = index.districts.tolist() + index.states.tolist()
+    queries = []
+    for _ in range(n):
+        kind = rng.integers(4)
+        if kind == 3:
+            pincode = str(rng.choice(index.pincodes))
+            queries.append(pincode[:rng.integers(2, 7)])
+            continue
+        name = str(rng.choice(names)).lower()
+        if kind == 1:
+            name = name[:max(2, rng.integers(2, len(name) + 1))]
+        elif kind == 2 and len(name) > 3:
+            i = int(rng.integers(len(name)))
+            name = name[:i] + (chr(rng.integers(97, 123)) if rng.random() < 0.5 else "") + name[i + 1:]
+        queries.append(name)
+    return queries
+
+
+def _timings(fn, queries):
+    timings = []
+    for q in queries:
+        started = time.perf_counter()
+        fn(q)
+        timings.append(time.perf_counter() - started)
+    ms = np.array(timings) * 1000
+    return {
+        "queries": len(queries),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "max_ms": round(float(ms.max()), 3),
+    }
+
+
+def run_benchmark(n: int, limit: int, sql_queries: int):
+    index = geo_index.rebuild()
+    queries = make_queries(index, n)
+
+    results = {"ngram_index": _timings(lambda q: index.search(q, limit), queries)}
+
+    # 🐢 Baseline: LIKE '%x%' scan - wahi national rows (region_stats + directory) ek SQLite table mein
+    with engine.connect() as conn:
+        frame = load_hierarchy_frame(conn)
+    scan_db = sqlite3.connect(":memory:")
+    frame.to_sql("geo", scan_db, index=False)
+
+    def like_scan(q):
+        pattern = f"%{q}%"
+        scan_db.execute(
+            "SELECT state, district, pincode FROM geo WHERE pincode LIKE ? OR district LIKE ? OR state LIKE ? LIMIT ?",
+            (pattern, pattern, pattern, limit),
+        ).fetchall()
+    results["sql_like_scan"] = _timings(like_scan, queries[:sql_queries])
+    results["sql_like_scan"]["rows"] = len(frame)
+
+    report = index.memory_report()
+    results["index"] = {k: report[k] for k in ("states", "districts", "pincodes", "total_mb")}
+
+    print(f"\n🔎 Geo search benchmark ({n} queries, limit {limit})")
+    for name in ("ngram_index", "sql_like_scan"):
+        stats = results[name]
+        print(f"   {name:<14} p50 {stats['p50_ms']:>8} ms  p99 {stats['p99_ms']:>8} ms  max {stats['max_ms']:>8} ms")
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="N-gram geo search vs SQL LIKE benchmark")
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--sql-queries", type=int, default=500, help="LIKE baseline ke liye kitni queries")
+    args = parser.parse_args()
+    run_benchmark(args.queries, args.limit, args.sql_queries)
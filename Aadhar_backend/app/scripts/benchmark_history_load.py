@@ -0,0 +1,87 @@
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.models import models
+from app.services.ai_engine import AIEngine
+from app.services.metrics_history import load_history_arrays
+from app.services.workload_weights import workload_minutes
+
+PINCODE = "110001"
+
+
+def _seed_history(engine, days: int, seed: int = 42):
+    """Ek pincode ki `days` lambi synthetic daily history."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2000-01-01", periods=days).date
+    rows = [
+        {
+            "date": d, "state": "delhi", "district": "new delhi", "pincode": PINCODE,
+            "enrol_0_5": int(a), "enrol_5_17": 0, "enrol_18_plus": int(b),
+            "bio_update_5_17": int(c), "bio_update_17_plus": int(c),
+            "demo_update_5_17": int(e), "demo_update_17_plus": int(e),
+        }
+        for d, a, b, c, e in zip(dates, *rng.poisson(5, (4, days)))
+    ]
+    hours = workload_minutes(pd.DataFrame(rows)) / 60
+    for row, h in zip(rows, hours.tolist()):
+        row["total_workload_hours"] = h
+    with engine.begin() as conn:
+        conn.execute(insert(models.DailyAadhaarMetrics), rows)
+
+
+def _measure(fn, repeats: int):
+    tracemalloc.start()
+    started = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    elapsed = (time.perf_counter() - started) / repeats
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ms": round(elapsed * 1000, 2), "peak_mb": round(peak / 1e6, 2)}
+
+
+def run_benchmark(days: int, repeats: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'history.db')}")
+        models.Base.metadata.create_all(bind=engine)
+        _seed_history(engine, days)
+        db = sessionmaker(bind=engine)()
+
+        def orm_path():
+            # 🐢 Purana: poore ORM objects + per-row dict comprehension
+            history = db.query(models.DailyAadhaarMetrics)\
+                        .filter(models.DailyAadhaarMetrics.pincode == PINCODE)\
+                        .order_by(models.DailyAadhaarMetrics.date).all()
+            AIEngine(history)
+            db.expunge_all()
+
+        def array_path():
+            # ⚡ Naya: sirf zaroori columns, SQL mein jod, NumPy arrays
+            AIEngine.from_arrays(load_history_arrays(db, PINCODE))
+
+        results = {"orm": _measure(orm_path, repeats), "arrays": _measure(array_path, repeats)}
+        db.close()
+        engine.dispose()
+
+    print(f"\n📊 History load + engine prep ({days} days, avg of {repeats})")
+    for name, stats in results.items():
+        print(f"   {name:<7} {stats['ms']:>9} ms  peak {stats['peak_mb']:>8} MB")
+    print(f"   Speedup: {results['orm']['ms'] / results['arrays']['ms']:.1f}x, "
+          f"memory: {results['orm']['peak_mb'] / max(results['arrays']['peak_mb'], 0.01):.1f}x less")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ORM vs column-array history loading benchmark")
+    parser.add_argument("--days", type=int, default=3650)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    run_benchmark(args.days, args.repeats)
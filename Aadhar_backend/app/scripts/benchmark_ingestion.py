@@ -0,0 +1,95 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# ⚠️ load_advanced_data import par hi configured DATABASE_URL par migrations chalata hai -
+# isliye app imports functions ke andar, aur __main__ pehle env ko scratch DB par point karta hai.
+
+
+def make_merged_frame(rows: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Merge ke baad jaisa frame banta hai waisa hi synthetic frame (benchmark ke liye).
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2025-01-01", periods=365).strftime("%d-%m-%Y").to_numpy()
+    pincodes = np.arange(110001, 110001 + max(rows // 50, 1)).astype(str)
+
+    df = pd.DataFrame({
+        "date": rng.choice(dates, rows),
+        "state": "delhi",
+        "district": "new delhi",
+        "pincode": rng.choice(pincodes, rows),
+    })
+    for col in ["age_0_5", "age_5_17", "age_18_greater", "bio_age_5_17",
+                "bio_age_17_", "demo_age_5_17", "demo_age_17_"]:
+        df[col] = rng.poisson(3, rows).astype(float)
+    return df
+
+
+def _fresh_engine(path: str):
+    from app.models import models
+    if os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def run_benchmark(rows: int):
+    from app.scripts.load_advanced_data import legacy_ingest
+    from app.services.ingestion_engine import ingest_columnar
+
+    df = make_merged_frame(rows)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 🐢 Legacy: iterrows + ORM objects + bulk_save_objects
+        engine = _fresh_engine(os.path.join(tmp, "legacy.db"))
+        db = sessionmaker(bind=engine)()
+        started = time.perf_counter()
+        count = legacy_ingest(db, df)
+        elapsed = time.perf_counter() - started
+        db.close()
+        engine.dispose()
+        results["legacy"] = {"rows": count, "total_seconds": round(elapsed, 3),
+                             "rows_per_sec": round(count / elapsed, 1)}
+
+        # ⚡ Columnar: NumPy build + executemany
+        engine = _fresh_engine(os.path.join(tmp, "columnar.db"))
+        results["columnar"] = ingest_columnar(engine, df)
+        engine.dispose()
+
+    speedup = results["columnar"]["rows_per_sec"] / results["legacy"]["rows_per_sec"]
+    print("\n📊 Ingestion Benchmark")
+    for name, stats in results.items():
+        print(f"   {name:<9} {stats['rows']:>9} rows  {stats['total_seconds']:>8}s  {stats['rows_per_sec']:>12} rows/sec")
+    print(f"   Speedup: {speedup:.1f}x")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Legacy vs columnar ingestion benchmark")
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory(prefix="aadhaar-ingest-bench-")
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir.name, 'scratch.db')}",
+        "PARQUET_STORE_DIR": os.path.join(workdir.name, "parquet_store"),
+        "FORECAST_SCHEDULER_ENABLED": "false",
+        "MODEL_WARMUP_ON_STARTUP": "false",
+    })
+    for required in ("PROJECT_NAME", "SECRET_KEY", "ALGORITHM"):
+        os.environ.setdefault(required, "bench")
+    os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "5")
+
+    try:
+        run_benchmark(args.rows)
+    finally:
+        workdir.cleanup()
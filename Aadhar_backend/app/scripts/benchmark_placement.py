@@ -0,0 +1,74 @@
+import argparse
+import json
+
+import numpy as np
+
+from app.services.ai_engine import OPERATOR_CAPACITY_MINS
+from app.services.placement_optimizer import (
+    DEFAULT_SERVICE_RADIUS, UNREACHABLE, coverage_matrix, optimize_placement, served_minutes,
+)
+
+
+def synthetic_district(size: int, seed: int = 42):
+    """
+    Ek district jaisa data: 2-3 sorting districts (pincode prefixes), har pincode ka
+    lognormal daily workload (kuch shehri pincodes bahut bhaari).
+    """
+    rng = np.random.default_rng(seed)
+    prefixes = rng.choice(np.arange(110, 855), size=max(1, size // 300 + 1), replace=False)
+    per_prefix = np.array_split(np.arange(size), len(prefixes))
+    pincodes = []
+    for prefix, members in zip(prefixes, per_prefix):
+        offsets = np.sort(rng.choice(np.arange(1, 1000), size=len(members), replace=False))
+        pincodes.extend(f"{prefix}{o:03d}" for o in offsets)
+    demand = rng.lognormal(mean=np.log(240), sigma=1.0, size=size)
+    return pincodes, demand
+
+
+def threshold_baseline(pincodes, demand, centers, counters, radius):
+    """Purana rule jaisa: sabse zyada workload wale pincodes par center, nearest-center assignment."""
+    opened = np.argsort(-demand, kind="stable")[:centers]
+    d = coverage_matrix(pincodes, radius)[:, opened]
+    nearest = np.argmin(d, axis=1)
+    reachable = d[np.arange(len(demand)), nearest] < UNREACHABLE
+    loads = np.bincount(nearest[reachable], weights=demand[reachable], minlength=len(opened))
+    return float(served_minutes(loads, counters)[0])
+
+
+def run_benchmark(sizes, radius: int, time_limit: float, counter_ratio: float):
+    results = []
+    print(f"\n📍 Placement optimizer benchmark (radius {radius}, time limit {time_limit}s)")
+    for size in sizes:
+        pincodes, demand = synthetic_district(size, seed=size)
+        # Budget: demand ka counter_ratio hissa counters mein, har 8 pincodes par ek center
+        counters = max(1, int(demand.sum() * counter_ratio / OPERATOR_CAPACITY_MINS))
+        centers = max(1, size // 8)
+
+        result = optimize_placement(pincodes, demand, centers, counters, radius, time_limit)
+        baseline = threshold_baseline(pincodes, demand, centers, counters, radius)
+        row = {
+            "pincodes": size,
+            "centers": centers,
+            "counters": counters,
+            "solve_seconds": result["solve_seconds"],
+            "served_pct": result["served_pct"],
+            "greedy_served_pct": round(result["greedy_served_mins"] / result["total_demand_mins"] * 100, 2),
+            "baseline_served_pct": round(baseline / result["total_demand_mins"] * 100, 2),
+            "local_search_swaps": result["local_search_swaps"],
+        }
+        results.append(row)
+        print(f"   {size:>5} pincodes  {row['solve_seconds']:>7}s  served {row['served_pct']:>6}%  "
+              f"(greedy {row['greedy_served_pct']}%, top-demand baseline {row['baseline_served_pct']}%)")
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Center placement solve time vs district size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 250, 500, 1000])
+    parser.add_argument("--radius", type=int, default=DEFAULT_SERVICE_RADIUS)
+    parser.add_argument("--time-limit", type=float, default=5.0)
+    parser.add_argument("--counter-ratio", type=float, default=0.7,
+                        help="Counters budget / total demand (1+ = centers hi bottleneck)")
+    args = parser.parse_args()
+    run_benchmark(args.sizes, args.radius, args.time_limit, args.counter_ratio)
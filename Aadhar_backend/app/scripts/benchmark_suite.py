@@ -0,0 +1,355 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+# 📏 Reproducible benchmark suite: seeded synthetic dataset -> har loader, har analytics endpoint,
+# get_ai_insights, find_critical_gaps -> JSON results (+ baseline se regression check).
+# ⚠️ Settings / engine import par hi DATABASE_URL padhte hain - isliye saare app imports
+# env set hone ke BAAD (functions ke andar) hote hain, suite kabhi asli DB nahi chhooti.
+
+
+@contextlib.contextmanager
+def _cwd(path: str):
+    """Loaders relative paths (dataset/, pincode-dataset.csv) padhte hain - workdir se chalao."""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _record(results: list, name: str, group: str, metric: str, value: float, **extra):
+    """metric: "seconds" ya "p50_ms" - dono mein kam = behtar (baseline compare isi par)."""
+    results.append({"name": name, "group": group, "metric": metric, "value": round(value, 3), **extra})
+    print(f"   {name:<52} {value:>10.3f} {metric}" + (f"  {extra}" if extra else ""))
+
+
+def _latency(fn, repeats: int, before=None) -> dict:
+    """`repeats` calls ki latency (ms): p50 / p95 / min. `before` har call se pehle (cache clear, etc.)."""
+    samples = []
+    for _ in range(repeats):
+        if before:
+            before()
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    ms = np.array(samples)
+    return {"p50_ms": float(np.percentile(ms, 50)), "p95_ms": round(float(np.percentile(ms, 95)), 3),
+            "min_ms": round(float(ms.min()), 3), "repeats": repeats}
+
+
+def _reset_database():
+    """Saari tables drop + migrations: har daily loader khaali DB par naapa jaata hai."""
+    from app.db.migrations import run_migrations
+    from app.db.session import engine
+    from app.models import models
+    models.Base.metadata.drop_all(bind=engine)
+    engine.dispose()  # Pooled SQLite connections purana schema (index list) dikha sakte hain
+    run_migrations(engine)
+
+
+def _count(model) -> int:
+    from sqlalchemy import func, select
+    from app.db.session import engine
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(model)).scalar()
+
+
+def _run_loader(results, name, fn, model):
+    """Loaders errors print karke nigal jaate hain - row count se pass/fail tay hota hai."""
+    started = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - started
+    rows = _count(model)
+    if not rows:
+        raise RuntimeError(f"{name}: loader ne koi row nahi likhi (upar ka error dekho)")
+    _record(results, name, "loader", "seconds", seconds, rows=rows, rows_per_sec=round(rows / seconds, 1))
+
+
+def bench_loaders(results: list, workdir: str, seed: int, with_legacy: bool):
+    from sqlalchemy import delete
+    from app.db.session import engine
+    from app.models import models
+    from app.models.ingestion import IngestionManifest
+    from app.scripts.load_advanced_data import load_data, load_data_incremental, load_data_streaming
+    from app.scripts.load_data import LOADER_NAME as BIOMETRIC_LOADER, load_dataset
+    from app.scripts.load_full_india import LOADER_NAME as INDIA_LOADER, load_full_india_data
+
+    print("\n📥 Loaders")
+    daily = models.DailyAadhaarMetrics
+    with _cwd(workdir):
+        _reset_database()
+        _run_loader(results, "loader.incremental", load_data_incremental, daily)
+        # Dobara chalao: manifest sab files skip kare (nightly no-op ka kharcha)
+        _run_loader(results, "loader.incremental_unchanged_rerun", load_data_incremental, daily)
+        _reset_database()
+        _run_loader(results, "loader.streaming", load_data_streaming, daily)
+        if with_legacy:
+            _reset_database()
+            _run_loader(results, "loader.legacy", lambda: load_data(mode="legacy"), daily)
+        # Columnar full load sabse aakhir mein - endpoints isi data par chalte hain
+        _reset_database()
+        _run_loader(results, "loader.columnar", lambda: load_data(mode="columnar"), daily)
+
+        for loader_name, name, fn, folder in (
+            (BIOMETRIC_LOADER, "loader.region_stats_biometric", load_dataset,
+             os.path.join("dataset", "api_data_aadhar_biometric")),
+            (INDIA_LOADER, "loader.region_stats_full_india", lambda: load_full_india_data(seed), "."),
+        ):
+            with engine.begin() as conn:
+                conn.execute(delete(models.RegionStats))
+                conn.execute(delete(IngestionManifest).where(IngestionManifest.loader == loader_name))
+            with _cwd(folder):
+                _run_loader(results, name, fn, models.RegionStats)
+
+
+def _pick_targets():
+    """Benchmark params asli loaded data se: sabse bada state / district, heavy (Prophet) aur light pincode."""
+    from sqlalchemy import func, select
+    from app.db.session import engine
+    from app.models import models
+    from app.services.ai_engine import PROPHET_MIN_HISTORY_DAYS
+    m = models.DailyAadhaarMetrics
+    with engine.connect() as conn:
+        state, district = conn.execute(
+            select(m.state, m.district).group_by(m.state, m.district).order_by(func.count().desc()).limit(1)
+        ).one()
+        per_pincode = (
+            select(m.pincode, func.count().label("days"), func.avg(m.total_workload_hours).label("load"))
+            .group_by(m.pincode).subquery()
+        )
+        heavy = conn.execute(
+            select(per_pincode.c.pincode).where(per_pincode.c.days >= PROPHET_MIN_HISTORY_DAYS)
+            .order_by(per_pincode.c.load.desc()).limit(1)
+        ).scalar() or conn.execute(select(per_pincode.c.pincode).order_by(per_pincode.c.days.desc()).limit(1)).scalar()
+        light = conn.execute(select(per_pincode.c.pincode).order_by(per_pincode.c.load).limit(1)).scalar()
+    return {"state": state, "district": district, "heavy_pincode": heavy, "light_pincode": light}
+
+
+def bench_endpoints(results: list, workdir: str, repeats: int, targets: dict):
+    from fastapi.testclient import TestClient
+    from sqlalchemy import delete
+    from app.db.session import engine
+    from app.main import app
+    from app.models.prediction import ForecastModel
+    from app.services.analytics_engine import gap_ranking
+    from app.services.geo_index import geo_index
+    from app.services.model_stack import model_stack
+    from app.services.response_cache import response_cache
+
+    state, district, year = targets["state"], targets["district"], _latest_year()
+    # (name, method, url, params/json, response cache wala route?)
+    cases = [
+        ("filters.states", "get", "/api/v1/filters/states", {}, True),
+        ("filters.districts", "get", "/api/v1/filters/districts", {"state_name": state}, True),
+        ("filters.pincodes", "get", "/api/v1/filters/pincodes", {"district_name": district, "state_name": state}, True),
+        ("filters.search", "get", "/api/v1/filters/search", {"q": district[:6].lower()}, True),
+        ("gaps.ranking", "get", "/api/v1/gaps/ranking", {"limit": 50}, True),
+        ("gaps.ranking_state", "get", "/api/v1/gaps/ranking", {"state": state, "priority": "High"}, True),
+        ("gaps.top", "get", "/api/v1/gaps/top", {"group_by": "district", "k": 5}, True),
+        ("dashboard_stats.all", "get", "/api/v1/dashboard-stats", {"year": year}, True),
+        ("dashboard_stats.state", "get", "/api/v1/dashboard-stats", {"state": state, "year": year}, True),
+        ("anomalies.surges", "get", "/api/v1/anomalies/surges", {"days": 30}, True),
+        ("allocation.batch_state", "post", "/api/v1/allocation/batch", {"state": state}, False),
+        ("optimize.placement", "get", "/api/v1/optimize/placement", {"state": state, "district": district}, False),
+    ]
+
+    print(f"\n🌐 Endpoints (p50 of {repeats}; cold = response cache clear)")
+    with _cwd(workdir), TestClient(app) as client:
+        # Steady state: indexes + model stack pehle se (load time alag record hota hai)
+        geo_index.ensure()
+        gap_ranking.ensure()
+        started = time.perf_counter()
+        model_stack.warm_up()
+        _record(results, "startup.model_stack_warm_up", "startup", "seconds", time.perf_counter() - started)
+
+        for name, method, url, params, cached in cases:
+            def call(method=method, url=url, params=params):
+                kwargs = {"json": params} if method == "post" else {"params": params}
+                response = getattr(client, method)(url, **kwargs)
+                response.raise_for_status()
+                return response.content
+
+            stats = _latency(call, repeats, before=response_cache.clear)
+            _record(results, f"endpoint.{name}.cold", "endpoint", "p50_ms", stats.pop("p50_ms"), **stats)
+            if cached:
+                call()
+                stats = _latency(call, repeats)
+                _record(results, f"endpoint.{name}.cached", "endpoint", "p50_ms", stats.pop("p50_ms"), **stats)
+
+        # /predict: cold = forecast cache row delete (refit), warm = cache hit
+        for kind in ("heavy", "light"):
+            pincode = targets[f"{kind}_pincode"]
+
+            def predict(pincode=pincode):
+                client.get(f"/api/v1/predict/{pincode}").raise_for_status()
+
+            def drop_forecast(pincode=pincode):
+                with engine.begin() as conn:
+                    conn.execute(delete(ForecastModel).where(ForecastModel.pincode == pincode))
+
+            stats = _latency(predict, min(repeats, 3), before=drop_forecast)
+            _record(results, f"endpoint.predict_{kind}.refit", "endpoint", "p50_ms", stats.pop("p50_ms"), **stats)
+            stats = _latency(predict, repeats)
+            _record(results, f"endpoint.predict_{kind}.cached", "endpoint", "p50_ms", stats.pop("p50_ms"), **stats)
+
+
+def _latest_year() -> int:
+    from sqlalchemy import func, select
+    from app.db.session import engine
+    from app.models import models
+    with engine.connect() as conn:
+        return conn.execute(select(func.max(models.DailyAadhaarMetrics.date))).scalar().year
+
+
+def bench_functions(results: list, repeats: int, targets: dict):
+    from app.db.session import SessionLocal
+    from app.models import models
+    from app.services.ai_engine import get_ai_insights
+    from app.services.analytics_engine import find_critical_gaps
+
+    print("\n🧠 Functions")
+    db = SessionLocal()
+    try:
+        for kind in ("heavy", "light"):
+            records = db.query(models.DailyAadhaarMetrics).filter(
+                models.DailyAadhaarMetrics.pincode == targets[f"{kind}_pincode"]
+            ).all()
+            # Forecast + IsolationForest dono (cache ke bina wala raasta)
+            stats = _latency(lambda: get_ai_insights(records), min(repeats, 3))
+            _record(results, f"function.get_ai_insights_{kind}", "function", "p50_ms", stats.pop("p50_ms"),
+                    history_days=len(records), **stats)
+
+        stats = _latency(lambda: find_critical_gaps(db), repeats)
+        _record(results, "function.find_critical_gaps.national", "function", "p50_ms", stats.pop("p50_ms"), **stats)
+        stats = _latency(lambda: find_critical_gaps(db, targets["district"]), repeats)
+        _record(results, "function.find_critical_gaps.district", "function", "p50_ms", stats.pop("p50_ms"), **stats)
+    finally:
+        db.close()
+
+
+def compare_results(current: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> list:
+    """
+    Naam se match karke value / baseline ratio. Regression = ratio > 1 + tolerance AUR
+    absolute farak > min_delta_ms (chhote timings ka noise flag na ho).
+    """
+    if current["meta"].get("dataset") != baseline["meta"].get("dataset"):
+        print("⚠️ Dataset scale / seed alag hai - comparison sirf indicative hai")
+    base = {r["name"]: r for r in baseline["results"]}
+    regressions = []
+    print(f"\n📊 vs baseline ({baseline['meta'].get('git_commit')}, tolerance {tolerance:.0%})")
+    for result in current["results"]:
+        old = base.get(result["name"])
+        if not old or old["metric"] != result["metric"] or not old["value"]:
+            continue
+        ratio = result["value"] / old["value"]
+        delta_ms = (result["value"] - old["value"]) * (1000 if result["metric"] == "seconds" else 1)
+        regressed = ratio > 1 + tolerance and delta_ms > min_delta_ms
+        if regressed:
+            regressions.append({"name": result["name"], "baseline": old["value"], "current": result["value"],
+                                "ratio": round(ratio, 3)})
+        print(f"   {'❌' if regressed else '  '} {result['name']:<52} {old['value']:>10.3f} -> {result['value']:>10.3f} "
+              f"{result['metric']} ({ratio:.2f}x)")
+    print(f"{len(regressions)} regression(s)")
+    return regressions
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(args) -> dict:
+    from app.scripts.synthetic_data import write_dataset
+
+    print(f"🧪 Benchmark workdir: {args.workdir}")
+    started = time.perf_counter()
+    dataset = write_dataset(args.workdir, args.pincodes, args.days, args.density, args.start, args.seed)
+    results = []
+    _record(results, "generate.dataset", "generate", "seconds", time.perf_counter() - started)
+
+    bench_loaders(results, args.workdir, args.seed, args.with_legacy)
+    targets = _pick_targets()
+    bench_endpoints(results, args.workdir, args.repeats, targets)
+    bench_functions(results, args.repeats, targets)
+
+    from app.db.session import engine
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "database": engine.dialect.name,
+            "repeats": args.repeats,
+            "dataset": dataset,
+            "targets": targets,
+        },
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seeded synthetic data -> loaders / endpoints / AI benchmarks (JSON)")
+    parser.add_argument("--pincodes", type=int, default=2000, help="National scale: 19000")
+    parser.add_argument("--days", type=int, default=120, help="National scale: 1095 (3 saal)")
+    parser.add_argument("--density", type=float, default=0.25)
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2023, 1, 1))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--with-legacy", action="store_true", help="Purana iterrows loader bhi (bahut slow)")
+    parser.add_argument("--workdir", default=None, help="Default: temp folder (run ke baad delete)")
+    parser.add_argument("--database-url", default=None, help="Default: workdir mein SQLite; khaali Postgres DB bhi de sakte ho")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=None, help="Purana results JSON - regression par exit code 1")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-delta-ms", type=float, default=5.0)
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="Sirf do results files compare karo (koi run nahi)")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as old, open(args.compare[1]) as new:
+            regressions = compare_results(json.load(new), json.load(old), args.tolerance, args.min_delta_ms)
+        sys.exit(1 if regressions else 0)
+
+    temp = None if args.workdir else tempfile.TemporaryDirectory(prefix="aadhaar-bench-")
+    args.workdir = os.path.abspath(args.workdir or temp.name)
+    os.makedirs(args.workdir, exist_ok=True)
+    os.environ.update({
+        "DATABASE_URL": args.database_url or f"sqlite:///{os.path.join(args.workdir, 'bench.db')}",
+        "GEO_PINCODE_CSV": os.path.join(args.workdir, "pincode-dataset.csv"),
+        "PARQUET_STORE_DIR": os.path.join(args.workdir, "parquet_store"),
+        "FORECAST_SCHEDULER_ENABLED": "false",   # Background refit timings bigaad deta
+        "MODEL_WARMUP_ON_STARTUP": "false",      # Suite khud warm-up naapti hai
+    })
+    for required in ("PROJECT_NAME", "SECRET_KEY", "ALGORITHM"):
+        os.environ.setdefault(required, "benchmark")
+    os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "5")
+
+    try:
+        report = run_suite(args)
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2, default=str)
+        print(f"\n📝 Results written to {args.output}")
+        if args.baseline:
+            with open(args.baseline) as fh:
+                regressions = compare_results(report, json.load(fh), args.tolerance, args.min_delta_ms)
+            sys.exit(1 if regressions else 0)
+    finally:
+        if temp:
+            temp.cleanup()
@@ -0,0 +1,100 @@
+import argparse
+import json
+import time
+
+from sqlalchemy import func, select
+
+from app.db.session import engine
+from app.db.migrations import run_migrations
+from app.models import models
+from app.services.data_versions import bump_scope_versions, metrics_scopes
+from app.services.metrics_history import load_histories
+from app.services.parquet_store import ENROLMENT_TOTAL_COLUMNS, parquet_store
+from app.services.rollup_service import dashboard_rollup_statements
+
+run_migrations(engine)
+
+
+def _timed(fn, repeats: int):
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return round(best * 1000, 2), result
+
+
+def _raw_dashboard(conn, state: str, year: int):
+    """Wahi (total, distinct pincodes) seedha daily table scan se (rollups se pehle wala tareeka)."""
+    m = models.DailyAadhaarMetrics
+    total = sum(getattr(m, c) for c in ENROLMENT_TOTAL_COLUMNS)
+    query = select(func.coalesce(func.sum(total), 0), func.count(m.pincode.distinct())).where(
+        m.date.between(f"{year}-01-01", f"{year}-12-31")
+    )
+    if state != "All States":
+        query = query.where(m.state == state)
+    return tuple(int(v) for v in conn.execute(query).one())
+
+
+def _rollup_dashboard(conn, state: str, year: int):
+    total_stmt, regions_stmt = dashboard_rollup_statements(state, "All Districts", "All Pincodes", year)
+    return int(conn.execute(total_stmt).scalar() or 0), int(conn.execute(regions_stmt).scalar() or 0)
+
+
+def run_benchmark(repeats: int, history_pincodes: int):
+    m = models.DailyAadhaarMetrics
+    with engine.connect() as conn:
+        year = conn.execute(select(func.max(m.date))).scalar().year
+        top_state = conn.execute(
+            select(m.state).group_by(m.state).order_by(func.count().desc()).limit(1)
+        ).scalar()
+        pincodes = conn.execute(
+            select(m.pincode).distinct().order_by(m.pincode).limit(history_pincodes)
+        ).scalars().all()
+
+        results = []
+        print(f"\n🧱 Dashboard stats ({year}) - raw daily scan vs rollup vs Parquet (best of {repeats})")
+        for state in ("All States", top_state):
+            filter_ = parquet_store.dashboard_filter(state, "All Districts", "All Pincodes", year)
+            fragments = len(list(parquet_store.dataset().get_fragments(filter=filter_)))
+            raw_ms, raw = _timed(lambda: _raw_dashboard(conn, state, year), repeats)
+            rollup_ms, rollup = _timed(lambda: _rollup_dashboard(conn, state, year), repeats)
+            parquet_ms, parquet = _timed(
+                lambda: parquet_store.dashboard_stats(state, "All Districts", "All Pincodes", year), repeats
+            )
+            row = {
+                "query": f"dashboard {state}", "raw_sql_ms": raw_ms, "rollup_ms": rollup_ms, "parquet_ms": parquet_ms,
+                "fragments_read": fragments, "matches": raw == rollup == tuple(parquet),
+            }
+            results.append(row)
+            print(f"   {state:<28} raw {raw_ms:>8}ms  rollup {rollup_ms:>8}ms  parquet {parquet_ms:>8}ms  "
+                  f"({fragments} partitions, match={row['matches']})")
+
+        sql_ms, sql_histories = _timed(lambda: load_histories(conn, pincodes), repeats)
+    parquet_ms, parquet_histories = _timed(lambda: parquet_store.load_histories(pincodes), repeats)
+    matches = len(sql_histories) == len(parquet_histories) and all(
+        a == b and fa["ds"].equals(fb["ds"]) and (fa["y"] - fb["y"]).abs().max() < 1e-6
+        for (a, fa), (b, fb) in zip(sql_histories, parquet_histories)
+    )
+    results.append({"query": f"histories x{len(pincodes)}", "sql_ms": sql_ms, "parquet_ms": parquet_ms,
+                    "matches": matches})
+    print(f"   histories x{len(pincodes):<17} sql {sql_ms:>8}ms  parquet {parquet_ms:>8}ms  (match={matches})")
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Daily metrics -> partitioned Parquet store (+ SQL vs Parquet benchmark)")
+    parser.add_argument("--benchmark", action="store_true", help="Build ke baad SQL vs Parquet timings + results check")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--history-pincodes", type=int, default=500)
+    args = parser.parse_args()
+
+    if not parquet_store.enabled:
+        raise SystemExit("❌ PARQUET_STORE_ENABLED=true set karo (aur pyarrow install)")
+    with engine.begin() as conn:
+        parquet_store.rebuild(conn)
+        # Dashboard ab Parquet se padhta hai - purane SQL wale cached responses hatao
+        bump_scope_versions(conn, metrics_scopes(conn.execute(select(models.DailyAadhaarMetrics.state).distinct()).scalars()))
+    if args.benchmark:
+        run_benchmark(args.repeats, args.history_pincodes)
@@ -0,0 +1,114 @@
+import argparse
+import os
+import sys
+import tempfile
+
+# ✅ Incremental loader check: same dataset do alag chunk sizes par load -> har metric column ka total
+# barabar hona chahiye (aur poori files ke seedhe sum ke bhi). Same (date, pincode) kai chunks mein aata hai
+# (district spelling alag) - overwrite hua to chhote chunks par total kam aayega.
+# Saath mein fresh single-frame load (--full jaisa, accumulate ke bina): same-key rows dedupe mein jude, drop nahi.
+# ⚠️ Apni temp SQLite DB - settings import par DATABASE_URL padhte hain, isliye app imports env ke BAAD.
+
+
+def _reset_database():
+    from app.db.migrations import run_migrations
+    from app.db.session import engine
+    from app.models import models
+    models.Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+    run_migrations(engine)
+
+
+def _table_totals() -> dict:
+    from sqlalchemy import func, select
+    from app.db.session import engine
+    from app.models import models
+    from app.services.ingestion_engine import METRIC_COLUMNS
+    m = models.DailyAadhaarMetrics
+    columns = METRIC_COLUMNS + ["total_workload_hours"]
+    with engine.connect() as conn:
+        row = conn.execute(select(*(func.coalesce(func.sum(getattr(m, c)), 0) for c in columns))).one()
+    return dict(zip(columns, row))
+
+
+def _source_totals(root: str) -> dict:
+    """Reference: har category ki saari files ek saath (chunking ke bina) - jaise --full loader jodta hai."""
+    import pandas as pd
+    from app.services.ingestion_engine import CATEGORY_COLUMNS, METRIC_COLUMNS, build_metrics_frame, clean_source_frame
+    from app.services.streaming_loader import CATEGORIES, find_category_files
+    from app.services.workload_weights import WORKLOAD_WEIGHTS
+    totals = dict.fromkeys(METRIC_COLUMNS, 0)
+    for keyword in CATEGORIES:
+        for path in find_category_files(keyword, root):
+            source = pd.read_csv(path, dtype=str) if path.endswith(".csv") else pd.read_excel(path, dtype=str)
+            frame = build_metrics_frame(clean_source_frame(source))
+            for c in CATEGORY_COLUMNS[keyword]:
+                totals[c] += int(frame[c].sum())
+    totals["total_workload_hours"] = sum(totals[c] * w for c, w in WORKLOAD_WEIGHTS.items()) / 60
+    return totals
+
+
+def _load_single_frame(root: str) -> None:
+    """Saari categories ki saari files ek frame mein -> ek upsert (dedupe_metrics_frame ka path)."""
+    import pandas as pd
+    from app.db.session import engine
+    from app.services.ingestion_engine import build_metrics_frame, clean_source_frame, upsert_metrics_frame
+    from app.services.streaming_loader import CATEGORIES, find_category_files
+    frames = [
+        clean_source_frame(pd.read_csv(path, dtype=str) if path.endswith(".csv") else pd.read_excel(path, dtype=str))
+        for keyword in CATEGORIES for path in find_category_files(keyword, root)
+    ]
+    upsert_metrics_frame(engine, build_metrics_frame(pd.concat(frames, ignore_index=True)))
+
+
+def _same(a, b) -> bool:
+    return abs(float(a) - float(b)) <= 1e-6 * max(1.0, abs(float(b)))
+
+
+def check_chunked_totals(root: str, chunk_sizes) -> int:
+    from app.scripts.load_advanced_data import load_data_incremental
+
+    runs = {"source files": _source_totals(root)}
+    for chunk_rows in chunk_sizes:
+        _reset_database()
+        print(f"\n📦 Incremental load, chunk_rows={chunk_rows}")
+        load_data_incremental(root, chunk_rows=chunk_rows)
+        runs[f"chunk_rows={chunk_rows}"] = _table_totals()
+
+    _reset_database()
+    print("\n📦 Fresh single-frame load")
+    _load_single_frame(root)
+    runs["single frame"] = _table_totals()
+
+    reference = runs["source files"]
+    failures = 0
+    print()
+    for column, expected in reference.items():
+        got = {name: totals[column] for name, totals in runs.items()}
+        ok = all(_same(v, expected) for v in got.values())
+        failures += 0 if ok else 1
+        print(f"{'✅' if ok else '❌'} {column:<22} " + "  ".join(f"{n}: {v:,.2f}" for n, v in got.items()))
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incremental loader: totals must not depend on chunk size")
+    parser.add_argument("--root", default="dataset", help="Source CSV/Excel folder")
+    parser.add_argument("--chunk-rows", type=int, nargs=2, default=[1_000, 1_000_000])
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory(prefix="aadhaar-chunks-")
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir.name, 'check.db')}",
+        "PARQUET_STORE_DIR": os.path.join(workdir.name, "parquet_store"),
+        "FORECAST_SCHEDULER_ENABLED": "false",
+        "MODEL_WARMUP_ON_STARTUP": "false",
+    })
+    for required in ("PROJECT_NAME", "SECRET_KEY", "ALGORITHM"):
+        os.environ.setdefault(required, "check")
+    os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "5")
+
+    try:
+        sys.exit(1 if check_chunked_totals(args.root, args.chunk_rows) else 0)
+    finally:
+        workdir.cleanup()
@@ -0,0 +1,135 @@
+import argparse
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, func, select, text
+
+from app.db.migrations import run_migrations
+from app.models import models
+from app.services.analytics_engine import allocation_statement
+from app.services.export_service import export_statement
+from app.services.metrics_history import _history_select
+from app.services.rollup_service import dashboard_rollup_statements, trend_statement
+
+# 🔍 Khaali schema par planner ka index choice kuch nahi batata - pehle representative data
+# (seeded synthetic ya --database-url wala loaded DB), ANALYZE, phir EXPLAIN QUERY PLAN.
+TREND_DAYS = 180
+
+
+def _plan(conn, stmt):
+    sql = stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    return [row[-1] for row in rows]
+
+
+def _uses_range_scan(plan):
+    """
+    Full table/index scan nahi chahiye: har table access 'SEARCH ... USING ... INDEX' hona chahiye.
+    MATERIALIZE kiye subquery ka SCAN chalega - woh khud scope tak seemit result hai, table nahi.
+    """
+    materialized = {line.split()[1] for line in plan if line.startswith("MATERIALIZE")}
+    accesses = [line for line in plan if line.startswith(("SCAN", "SEARCH"))
+                and not (line.startswith("SCAN") and line.split()[1] in materialized)]
+    return bool(accesses) and all(line.startswith("SEARCH") and "INDEX" in line for line in accesses)
+
+
+def seed_database(engine, pincodes: int, days: int, seed: int = 42) -> None:
+    """Synthetic geography + daily metrics (asli ingestion path se), rollups aur RegionStats."""
+    from app.scripts.synthetic_data import category_frames, synthetic_geography
+    from app.services.ingestion_engine import CATEGORY_COLUMNS, ingest_columnar, insert_new_regions, merge_categories
+    from app.services.rollup_service import refresh_dirty_rollups
+
+    print(f"🌱 Seeding {pincodes} pincodes x {days} days...")
+    geography = synthetic_geography(pincodes, seed)
+    for frames in category_frames(geography, date(2025, 1, 1), days, density=0.25, seed=seed):
+        ingest_columnar(engine, merge_categories(*(frames[c] for c in CATEGORY_COLUMNS)))
+    refresh_dirty_rollups(engine)
+    regions = geography[["state", "district", "pincode"]].assign(pending_enrolments=100)
+    insert_new_regions(engine, regions)
+
+
+def _filter_cases(conn):
+    """Dashboard ke saare filter combinations (state, district, pincode) - DB ke ek asli pincode se."""
+    m = models.RegionStats
+    state, district, pincode = conn.execute(
+        select(m.state, m.district, m.pincode).order_by(m.pincode).limit(1)
+    ).one()
+    return [
+        ("All States", "All Districts", "All Pincodes"),
+        (state, "All Districts", "All Pincodes"),
+        (state, district, "All Pincodes"),
+        (state, district, pincode),
+        ("All States", "All Districts", pincode),
+    ]
+
+
+def check_query_plans(engine):
+    metrics = models.DailyAadhaarMetrics
+    failures = 0
+
+    cases = []
+    with engine.connect() as conn:
+        latest = conn.execute(select(func.max(metrics.date))).scalar()
+        trend_range = (latest - timedelta(days=TREND_DAYS), latest)
+        filter_cases = _filter_cases(conn)
+
+        # Endpoints yahi statements chalate hain: /dashboard-stats (monthly rollup) aur /trend
+        for state, district, pincode in filter_cases:
+            name = f"{state} / {district} / {pincode}"
+            total_stmt, regions_stmt = dashboard_rollup_statements(state, district, pincode, latest.year)
+            cases.append((f"dashboard total {name}", total_stmt))
+            cases.append((f"dashboard regions {name}", regions_stmt))
+            for granularity in ("day", "week", "month"):
+                cases.append((f"trend {granularity} {name}",
+                              trend_statement(conn, state, district, pincode, granularity, *trend_range)))
+
+        # /export/daily_metrics: raw table par geo filter - ix_daily_metrics_geo_date isi ke liye
+        # (bina filter ka export poori table padhta hi hai - woh case yahan nahi)
+        for state, district, pincode in filter_cases[1:4]:
+            name = f"{state} / {district} / {pincode}"
+            cases.append((f"export {name}", export_statement("daily_metrics", state, district, pincode)))
+            cases.append((f"export {name} {latest.year}",
+                          export_statement("daily_metrics", state, district, pincode, latest.year)))
+
+        # /allocation/batch: pincodes list, poora state, ek district
+        state, district, pincode = filter_cases[3]
+        cases.append(("allocation pincodes", allocation_statement(latest, [pincode])))
+        cases.append(("allocation state", allocation_statement(latest, None, state)))
+        cases.append(("allocation district", allocation_statement(latest, None, state, district)))
+
+        # Forecast: ek pincode ki poori history (metrics_history ki query)
+        cases.append(("pincode history", _history_select(metrics.pincode == pincode)))
+
+    with engine.connect() as conn:
+        for name, stmt in cases:
+            plan = _plan(conn, stmt)
+            ok = _uses_range_scan(plan)
+            failures += 0 if ok else 1
+            print(f"{'✅' if ok else '❌'} {name}")
+            for line in plan:
+                print(f"      {line}")
+
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EXPLAIN QUERY PLAN check for dashboard / trend / export / allocation queries (SQLite)")
+    parser.add_argument("--database-url", help="Loaded SQLite DB (ANALYZE ho jaata hai). Default: seeded scratch DB")
+    parser.add_argument("--pincodes", type=int, default=2000, help="Seeded scratch DB ke pincodes")
+    parser.add_argument("--days", type=int, default=365, help="Seeded scratch DB ke din")
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory(prefix="aadhaar-plans-")
+    engine = create_engine(args.database_url or f"sqlite:///{os.path.join(workdir.name, 'plans.db')}")
+    try:
+        run_migrations(engine)
+        if not args.database_url:
+            seed_database(engine, args.pincodes, args.days)
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))   # Planner ko asli row counts / selectivity chahiye
+        sys.exit(1 if check_query_plans(engine) else 0)
+    finally:
+        engine.dispose()
+        workdir.cleanup()
@@ -1,12 +1,30 @@
+import argparse
 import pandas as pd
 import os
 import glob
+import time
+from datetime import datetime
 from sqlalchemy.orm import Session
 from app.db.session import SessionLocal, engine
 from app.models import models
+from app.db.migrations import run_migrations
+from app.services.ingestion_engine import (
+    CATEGORY_COLUMNS, build_metrics_frame, category_has_data, clean_source_frame, ingest_columnar,
+    merge_categories, reset_category, upsert_metrics_frame,
+)
+from app.services.ingestion_manifest import (
+    changed_sources, checkpoint, forget_loader, has_entries, mark_done, plan_file, record_full_load,
+)
+from app.services.anomaly_detector import rebuild_anomaly_states
+from app.services.data_versions import bump_scope_versions, metrics_scopes
+from app.services.workload_weights import WORKLOAD_WEIGHTS
+from app.services.rollup_service import rebuild_all, refresh_dirty_rollups
+from app.services.streaming_loader import (
+    CATEGORIES, find_category_files, iter_file_chunks, plan_partitions, stream_merged_partitions,
+)
 
-# Database initialize
-models.Base.metadata.create_all(bind=engine)
+# Database initialize (naye tables + purane DB ka migration)
+run_migrations(engine)
 
 def load_category_files(keyword, root_folder="dataset"):
     """
@@ -37,11 +55,7 @@ def load_category_files(keyword, root_folder="dataset"):
                 df = pd.read_excel(file_path)
             
             # Column cleaning
-            df.columns = [c.strip().lower() for c in df.columns]
-            if 'pincode' in df.columns:
-                df['pincode'] = df['pincode'].astype(str).str.replace('.0', '', regex=False)
-                
-            all_dfs.append(df)
+            all_dfs.append(clean_source_frame(df))
         except Exception as e:
             print(f"   ⚠️ Error reading {file_path}: {e}")
 
@@ -52,7 +66,187 @@ def load_category_files(keyword, root_folder="dataset"):
         return combined_df
     return None
 
-def load_data():
+def legacy_ingest(db: Session, final_df):
+    """
+    Purana row-by-row loader (iterrows + ORM objects).
+    Sirf benchmark / comparison ke liye rakha hai (plain INSERT, khaali table par hi chalao).
+    Same (date, pincode) kai rows mein aata hai (district spelling alag) - unique key ki wajah se
+    counts pehle wale record mein jodo, phir 5000 ke batches mein save.
+    """
+    records = {}
+    count = 0
+    
+    for _, row in final_df.iterrows():
+        # Pincode check
+        if not row['pincode'] or str(row['pincode']).lower() == 'nan':
+            continue
+
+        # Safe value extraction function
+        def get_val(col_name):
+            try:
+                return int(float(row.get(col_name, 0)))
+            except:
+                return 0
+
+        # Values nikalo
+        e_0_5 = get_val('age_0_5')
+        e_5_17 = get_val('age_5_17')
+        e_18 = get_val('age_18_greater')
+        
+        b_5_17 = get_val('bio_age_5_17')
+        b_17 = get_val('bio_age_17_')
+        
+        d_5_17 = get_val('demo_age_5_17')
+        d_17 = get_val('demo_age_17_')
+
+        # Workload weights module wale minutes (row-by-row - yahi to purana tareeka hai)
+        counts = {"enrol_0_5": e_0_5, "enrol_5_17": e_5_17, "enrol_18_plus": e_18,
+                  "bio_update_5_17": b_5_17, "bio_update_17_plus": b_17,
+                  "demo_update_5_17": d_5_17, "demo_update_17_plus": d_17}
+        workload_hours = sum(counts[c] * w for c, w in WORKLOAD_WEIGHTS.items()) / 60
+
+        row_date = datetime.strptime(str(row.get('date')), '%d-%m-%Y').date()
+        key = (row_date, str(row.get('pincode')))
+        record = records.get(key)
+        if record is not None:
+            for col, value in counts.items():
+                setattr(record, col, getattr(record, col) + value)
+            record.total_workload_hours += float(workload_hours)
+            continue
+
+        records[key] = models.DailyAadhaarMetrics(
+            date=row_date,
+            state=str(row.get('state', '')).title(),
+            district=str(row.get('district', '')).title(),
+            pincode=key[1],
+            
+            enrol_0_5=e_0_5,
+            enrol_5_17=e_5_17,
+            enrol_18_plus=e_18,
+            
+            bio_update_5_17=b_5_17,
+            bio_update_17_plus=b_17,
+            
+            demo_update_5_17=d_5_17,
+            demo_update_17_plus=d_17,
+            
+            total_workload_hours=float(workload_hours)
+        )
+
+    pending = list(records.values())
+    for start in range(0, len(pending), 5000):
+        batch_data = pending[start:start + 5000]
+        db.bulk_save_objects(batch_data)
+        db.commit()
+        count += len(batch_data)
+        print(f"   Saved {count} records...")
+
+    return count
+
+def record_full_load_manifest(root_folder="dataset"):
+    """Full / streaming load ke baad: har category ki files manifest mein done (incremental inhe skip kare)."""
+    db = SessionLocal()
+    try:
+        for keyword in CATEGORIES:
+            record_full_load(db, f"daily_metrics:{keyword}", find_category_files(keyword, root_folder))
+    finally:
+        db.close()
+
+def load_data_incremental(root_folder="dataset", chunk_rows=None):
+    """
+    🔁 Nightly mode: manifest dekh kar sirf nayi/badli files process hoti hain.
+    Har category apne columns ko (date, pincode) par upsert karti hai - counts JODE jaate hain,
+    kyunki same key kai chunks / files mein aati hai (district spelling alag). Har chunk ke saath
+    manifest checkpoint usi transaction mein commit hota hai - crash ho to wahin se resume, kuch double nahi.
+    Pehle load hui koi file badli / hati to woh category reset hokar shuru se dobara.
+    Category ka data table mein hai par manifest mein kuch nahi (manifest se pehle ka load) -> run band,
+    warna saari files us data par dobara jud jaati.
+    chunk_rows: default memory budget se (plan_partitions).
+    """
+    db = SessionLocal()
+    print("🔁 Starting INCREMENTAL Data Fusion...")
+    started = time.perf_counter()
+    total = 0
+    if chunk_rows is None:
+        _, chunk_rows = plan_partitions(0)
+
+    try:
+        for keyword in CATEGORIES:
+            loader = f"daily_metrics:{keyword}"
+            if not has_entries(db, loader) and category_has_data(db.connection(), CATEGORY_COLUMNS[keyword]):
+                print(f"🚨 Stop: {keyword} data table mein hai par ingestion manifest khaali hai. "
+                      f"Ek baar --full (ya --streaming) chalao, phir incremental.")
+                return
+        db.commit()   # Read transaction band (SQLite par engine ke connections likhenge)
+
+        for keyword in CATEGORIES:
+            columns = CATEGORY_COLUMNS[keyword]
+            loader = f"daily_metrics:{keyword}"
+            files = find_category_files(keyword, root_folder)
+
+            changed = changed_sources(db, loader, files)
+            if changed:
+                print(f"♻️ {keyword}: {len(changed)} loaded file(s) changed/removed - reloading whole category")
+                with engine.begin() as conn:
+                    reset_category(conn, columns)
+                    forget_loader(conn, loader)
+
+            for file_path in files:
+                plan = plan_file(db, loader, file_path)
+                if plan is None:
+                    print(f"⏭️ Unchanged, skipping: {os.path.basename(file_path)}")
+                    continue
+
+                manifest_id, offset = plan
+                if offset:
+                    print(f"↩️ Resuming {os.path.basename(file_path)} from row {offset}")
+                else:
+                    print(f"📥 Loading {os.path.basename(file_path)}")
+
+                for chunk in iter_file_chunks(file_path, chunk_rows, skip_rows=offset):
+                    offset += len(chunk)
+                    frame = build_metrics_frame(chunk)
+                    total += upsert_metrics_frame(
+                        engine, frame, columns, batch_size=max(len(frame), 1), accumulate=True,
+                        on_batch=lambda conn, _, done=offset: checkpoint(conn, manifest_id, done),
+                    )
+                mark_done(db, manifest_id)
+
+        refresh_dirty_rollups(engine)
+        elapsed = time.perf_counter() - started
+        print(f"✅ MISSION ACCOMPLISHED! {total} rows upserted in {elapsed:.1f}s")
+    except Exception as e:
+        print(f"❌ Critical Error: {e}")
+    finally:
+        db.close()
+
+def load_data_streaming():
+    """
+    🌊 Bounded-memory loader: har (date, pincode) partition alag se merge + save hota hai.
+    RAM ki limit INGEST_MEMORY_BUDGET_MB se set hoti hai.
+    """
+    print("🔥 Starting STREAMING Data Fusion...")
+    started = time.perf_counter()
+    total = 0
+
+    try:
+        for partition_df in stream_merged_partitions("dataset"):
+            stats = ingest_columnar(engine, partition_df)
+            total += stats["rows"]
+
+        refresh_dirty_rollups(engine)
+        if total:
+            record_full_load_manifest("dataset")
+        elapsed = time.perf_counter() - started
+        print(f"✅ MISSION ACCOMPLISHED! {total} rows in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.1f} rows/sec)")
+    except Exception as e:
+        print(f"❌ Critical Error: {e}")
+
+def load_data(mode="columnar"):
+    """
+    mode="columnar" -> NumPy frame build + executemany/COPY (fast, default)
+    mode="legacy"   -> purana iterrows loader
+    """
     db = SessionLocal()
     print("🔥 Starting ULTIMATE Data Fusion...")
 
@@ -69,85 +263,25 @@ def load_data():
         print("\n🔄 Merging Datasets (Isme thoda waqt lag sakta hai)...")
 
         # 2. Merge Logic (Date + Location par jodo)
-        # Pehle Enrolment aur Bio
-        merged_df = pd.merge(
-            df_enrol, df_bio, 
-            on=['date', 'state', 'district', 'pincode'], 
-            how='outer'
-        ).fillna(0)
-
-        # Phir Demographic
-        final_df = pd.merge(
-            merged_df, df_demo, 
-            on=['date', 'state', 'district', 'pincode'], 
-            how='outer'
-        ).fillna(0)
-
-        print(f"🤖 Calculating AI Workload for {len(final_df)} rows...")
+        final_df = merge_categories(df_enrol, df_bio, df_demo)
 
-        # 3. Workload Calculation & Saving
-        batch_data = []
-        count = 0
-        
-        for _, row in final_df.iterrows():
-            # Pincode check
-            if not row['pincode'] or str(row['pincode']).lower() == 'nan':
-                continue
-
-            # Safe value extraction function
-            def get_val(col_name):
-                try:
-                    return int(float(row.get(col_name, 0)))
-                except:
-                    return 0
-
-            # Values nikalo
-            e_0_5 = get_val('age_0_5')
-            e_5_17 = get_val('age_5_17')
-            e_18 = get_val('age_18_greater')
-            
-            b_5_17 = get_val('bio_age_5_17')
-            b_17 = get_val('bio_age_17_')
-            
-            d_5_17 = get_val('demo_age_5_17')
-            d_17 = get_val('demo_age_17_')
-
-            # AI Logic: New=20m, Bio=15m, Demo=8m
-            workload_hours = ((e_0_5 + e_5_17 + e_18) * 20 + 
-                              (b_5_17 + b_17) * 15 + 
-                              (d_5_17 + d_17) * 8) / 60
-
-            record = models.DailyAadhaarMetrics(
-                date=str(row.get('date')),
-                state=str(row.get('state', '')).title(),
-                district=str(row.get('district', '')).title(),
-                pincode=str(row.get('pincode')),
-                
-                enrol_0_5=e_0_5,
-                enrol_5_17=e_5_17,
-                enrol_18_plus=e_18,
-                
-                bio_update_5_17=b_5_17,
-                bio_update_17_plus=b_17,
-                
-                demo_update_5_17=d_5_17,
-                demo_update_17_plus=d_17,
-                
-                total_workload_hours=float(workload_hours)
-            )
-            batch_data.append(record)
-            count += 1
-            
-            if len(batch_data) >= 5000:
-                db.bulk_save_objects(batch_data)
-                db.commit()
-                batch_data = []
-                print(f"   Saved {count} records...")
+        print(f"🤖 Calculating AI Workload for {len(final_df)} rows ({mode} mode)...")
 
-        if batch_data:
-            db.bulk_save_objects(batch_data)
-            db.commit()
+        # 3. Workload Calculation & Saving
+        if mode == "legacy":
+            started = time.perf_counter()
+            count = legacy_ingest(db, final_df)
+            elapsed = time.perf_counter() - started
+            print(f"🐢 Legacy ingest: {count} rows in {elapsed:.2f}s ({count / elapsed if elapsed else 0:.1f} rows/sec)")
+            with engine.begin() as conn:
+                rebuild_all(conn)  # ORM path dirty ranges nahi likhta
+                rebuild_anomaly_states(conn)
+                bump_scope_versions(conn, metrics_scopes(final_df["state"].dropna().astype(str).str.title().unique()))
+        else:
+            ingest_columnar(engine, final_df)
 
+        refresh_dirty_rollups(engine)
+        record_full_load_manifest("dataset")
         print("✅ MISSION ACCOMPLISHED! All data loaded.")
 
     except Exception as e:
@@ -156,4 +290,15 @@ def load_data():
         db.close()
 
 if __name__ == "__main__":
-    load_data()
+    parser = argparse.ArgumentParser(description="Enrolment + Biometric + Demographic data loader")
+    parser.add_argument("--full", action="store_true", help="Saari files dobara merge karke load karo")
+    parser.add_argument("--mode", choices=["columnar", "legacy"], default="columnar")
+    parser.add_argument("--streaming", action="store_true", help="Chunked, bounded-memory merge")
+    args = parser.parse_args()
+
+    if args.streaming:
+        load_data_streaming()
+    elif args.full:
+        load_data(mode=args.mode)
+    else:
+        load_data_incremental()
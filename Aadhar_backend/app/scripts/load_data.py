@@ -1,23 +1,56 @@
 import pandas as pd
+import numpy as np
 import glob
 import os
 from sqlalchemy.orm import Session
 from app.db.session import SessionLocal, engine
-from app.models import models
+from app.db.migrations import run_migrations
+from app.services.ingestion_engine import insert_new_regions
+from app.services.ingestion_manifest import checkpoint, mark_done, plan_file
+from app.services.streaming_loader import iter_file_chunks, plan_partitions
 
-# Database initialize
-models.Base.metadata.create_all(bind=engine)
+# Database initialize (naye tables + purane DB ka migration)
+run_migrations(engine)
+
+LOADER_NAME = "region_stats:biometric"
+
+def build_region_frame(df):
+    """
+    Biometric chunk se RegionStats rows (vectorized).
+    Ek chunk mein same pincode dobara aaye to pehla wala rakho.
+    """
+    pincode = df['pincode'].astype(str).str.split('.').str[0].str.strip()
+    valid = (pincode.str.len() >= 6).to_numpy()
+    df = df.loc[valid].assign(pincode=pincode[valid])
+    df = df.drop_duplicates('pincode', keep='first')
+
+    def clean_int(col):
+        if col not in df.columns:
+            return np.zeros(len(df), dtype=np.int64)
+        values = pd.to_numeric(df[col], errors='coerce').fillna(0).to_numpy()
+        return np.trunc(values).astype(np.int64)
+
+    total_aadhaar = clean_int('bio_age_5') + clean_int('bio_age_17_')
+
+    # Population Logic
+    estimated_population = np.where(total_aadhaar > 0, (total_aadhaar * 1.3).astype(np.int64), 5000)
+    saturation = (total_aadhaar / estimated_population) * 100
+    pending = estimated_population - total_aadhaar
+    demand_score = (pending * 0.6) + ((100 - saturation) * 10)
+
+    return pd.DataFrame({
+        'state': df['state'].to_numpy() if 'state' in df.columns else 'Unknown',
+        'district': df['district'].to_numpy() if 'district' in df.columns else 'Unknown',
+        'pincode': df['pincode'].to_numpy(),
+        'total_population': estimated_population,
+        'aadhaar_generated': total_aadhaar,
+        'pending_enrolments': pending,
+        'saturation_percentage': saturation,
+        'demand_score': demand_score,
+    })
 
 def load_dataset():
     db: Session = SessionLocal()
-    
-    # Step 1: Pehle se moujood Pincodes ki list nikal lo
-    # Taaki hum dobara same pincode add na karein (Crash se bachne ke liye)
-    print("🔄 Fetching existing data to avoid duplicates...")
-    existing_pincodes = set(
-        flat_result[0] for flat_result in db.query(models.RegionStats.pincode).all()
-    )
-    print(f"✅ Found {len(existing_pincodes)} existing pincodes in database.")
 
     # Files dhundo
     csv_files = glob.glob("api_data_aadhar_biometric*.csv")
@@ -26,80 +59,32 @@ def load_dataset():
         return
 
     print(f"📂 Found {len(csv_files)} files. Starting processing...")
+    _, chunk_rows = plan_partitions(0)
     
     total_added = 0
-    skipped_count = 0
+    skipped_files = 0
     
     for file_path in csv_files:
-        print(f"🔄 Reading file: {file_path}...")
-        try:
-            # CSV Load karo
-            df = pd.read_csv(file_path, low_memory=False)
-            df.columns = [c.strip().lower() for c in df.columns]
-            
-            rows_to_add = []
-            
-            for index, row in df.iterrows():
-                try:
-                    # Pincode cleaning
-                    pincode_raw = row.get('pincode', '')
-                    pincode = str(pincode_raw).split('.')[0].strip()
-                    
-                    # --- CRITICAL CHECK ---
-                    # Agar ye pincode pehle se DB mein hai ya abhi humne add kiya hai -> SKIP
-                    if not pincode or len(pincode) < 6 or pincode in existing_pincodes:
-                        skipped_count += 1
-                        continue 
-                    
-                    # Add to tracking set immediately
-                    existing_pincodes.add(pincode)
-
-                    # Data Extraction
-                    state = row.get('state', 'Unknown')
-                    district = row.get('district', 'Unknown')
-                    
-                    bio_5 = row.get('bio_age_5', 0)
-                    bio_17 = row.get('bio_age_17_', 0)
-                    
-                    def clean_int(val):
-                        try:
-                            return int(float(val))
-                        except:
-                            return 0
+        # Manifest check: unchanged file dobara scan nahi hogi
+        plan = plan_file(db, LOADER_NAME, file_path)
+        if plan is None:
+            print(f"⏭️ Unchanged, skipping: {file_path}")
+            skipped_files += 1
+            continue
 
-                    total_aadhaar = clean_int(bio_5) + clean_int(bio_17)
-                    
-                    # Population Logic
-                    estimated_population = int(total_aadhaar * 1.3) if total_aadhaar > 0 else 5000
-                    saturation = (total_aadhaar / estimated_population) * 100 if estimated_population > 0 else 0
-                    pending = estimated_population - total_aadhaar
-                    demand_score = (pending * 0.6) + ((100 - saturation) * 10)
-
-                    # Object create karo
-                    region = models.RegionStats(
-                        state=state,
-                        district=district,
-                        pincode=pincode,
-                        total_population=estimated_population,
-                        aadhaar_generated=total_aadhaar,
-                        pending_enrolments=pending,
-                        saturation_percentage=saturation,
-                        demand_score=demand_score
-                    )
-                    
-                    db.add(region)
-                    total_added += 1
-                    
-                    # Har 1000 records par save karo taaki RAM full na ho
-                    if total_added % 1000 == 0:
-                        db.commit()
-                        print(f"   Saved {total_added} records so far...")
-
-                except Exception as row_e:
-                    continue
+        manifest_id, offset = plan
+        print(f"🔄 Reading file: {file_path} (from row {offset})...")
+        try:
+            for chunk in iter_file_chunks(file_path, chunk_rows, skip_rows=offset):
+                offset += len(chunk)
+                # Duplicate pincodes DB khud skip karta hai (ON CONFLICT DO NOTHING)
+                total_added += insert_new_regions(
+                    engine, build_region_frame(chunk),
+                    on_batch=lambda conn, _, done=offset: checkpoint(conn, manifest_id, done),
+                )
+                print(f"   Saved {total_added} records so far...")
 
-            # File khatam hone par final commit
-            db.commit()
+            mark_done(db, manifest_id)
             print(f"✅ Finished file: {file_path}")
 
         except Exception as e:
@@ -109,7 +94,7 @@ def load_dataset():
     db.close()
     print(f"\n🎉 GRAND SUCCESS!")
     print(f"✅ Total New Pincodes Added: {total_added}")
-    print(f"⏭️ Duplicates Skipped: {skipped_count}")
+    print(f"⏭️ Unchanged Files Skipped: {skipped_files}")
 
 if __name__ == "__main__":
-    load_dataset()
\ No newline at end of file
+    load_dataset()
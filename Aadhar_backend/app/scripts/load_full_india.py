@@ -1,94 +1,85 @@
+import argparse
 import pandas as pd
-import random
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import text
 from app.db.session import SessionLocal, engine
-from app.models import models
-
-# 1. Database Wapas Banao
-models.Base.metadata.create_all(bind=engine)
-
-def load_full_india_data():
+from app.db.migrations import run_migrations
+from app.services.ingestion_engine import insert_new_regions
+from app.services.ingestion_manifest import checkpoint, mark_done, plan_file
+
+# 1. Database Wapas Banao (naye tables + purane DB ka migration)
+run_migrations(engine)
+
+SOURCE_FILE = "pincode-dataset.csv"
+LOADER_NAME = "region_stats:pincode_directory"
+
+def build_india_frame(df, rng):
+    """
+    Pincode directory se RegionStats rows (fake demographics, vectorized).
+    """
+    pincode = df['pincode'].astype(str).str.replace('.0', '', regex=False).str.strip()
+    df = df.assign(pincode=pincode)
+    df = df[(df['pincode'].str.len() >= 6) & df['district'].notna() & df['statename'].notna()]
+    df = df.drop_duplicates('pincode', keep='first')
+
+    # Fake Data Generation
+    n = len(df)
+    estimated_population = rng.integers(5000, 80001, n)
+    saturation_random = rng.choice([0.45, 0.60, 0.75, 0.90, 0.98], n)
+    aadhaar_generated = (estimated_population * saturation_random).astype(np.int64)
+
+    pending = estimated_population - aadhaar_generated
+    saturation_percentage = (aadhaar_generated / estimated_population) * 100
+
+    demand_score = np.select(
+        [saturation_percentage < 70, saturation_percentage < 90],
+        [rng.integers(80, 101, n), rng.integers(50, 80, n)],
+        default=rng.integers(10, 50, n),
+    )
+
+    return pd.DataFrame({
+        'state': df['statename'].astype(str).str.title().to_numpy(),
+        'district': df['district'].astype(str).str.title().to_numpy(),
+        'pincode': df['pincode'].to_numpy(),
+        'total_population': estimated_population,
+        'aadhaar_generated': aadhaar_generated,
+        'pending_enrolments': pending,
+        'saturation_percentage': saturation_percentage,
+        'demand_score': demand_score,
+    })
+
+def load_full_india_data(seed=None):
     db: Session = SessionLocal()
     print("🚀 Starting Full India Data Load...")
 
     try:
-        # 2. Existing Pincodes check kar lo (Taaki dobara add na ho)
-        existing_pincodes = set(
-            row[0] for row in db.query(models.RegionStats.pincode).all()
-        )
-        print(f"ℹ️ Database mein pehle se {len(existing_pincodes)} pincodes hain.")
+        # 2. Manifest check: file nahi badli to kuch karna hi nahi
+        plan = plan_file(db, LOADER_NAME, SOURCE_FILE)
+        if plan is None:
+            print(f"⏭️ {SOURCE_FILE} unchanged since last load. Nothing to do.")
+            return
+        manifest_id, offset = plan
 
         # File read
-        df = pd.read_csv("pincode-dataset.csv")
+        df = pd.read_csv(SOURCE_FILE)
         df.columns = [c.strip().lower() for c in df.columns]
 
-        batch_data = []
-        count = 0
-        skipped = 0
-
         print(f"📊 Found {len(df)} pincodes in CSV. Processing...")
 
-        for index, row in df.iterrows():
-            try:
-                # Pincode safai
-                pincode = str(row.get('pincode', '')).replace('.0', '').strip()
-                
-                # --- DUPLICATE CHECK ---
-                if pincode in existing_pincodes:
-                    skipped += 1
-                    continue
-                
-                existing_pincodes.add(pincode) # Set mein add karo taaki isi loop mein dobara na aaye
-
-                district = row.get('district', 'Unknown').title()
-                state = row.get('statename', 'Unknown').title()
-
-                if len(pincode) < 6: continue
-
-                # Fake Data Generation
-                estimated_population = random.randint(5000, 80000)
-                saturation_random = random.choice([0.45, 0.60, 0.75, 0.90, 0.98])
-                aadhaar_generated = int(estimated_population * saturation_random)
-                
-                pending = estimated_population - aadhaar_generated
-                saturation_percentage = (aadhaar_generated / estimated_population) * 100
-                
-                demand_score = 0
-                if saturation_percentage < 70: demand_score = random.randint(80, 100)
-                elif saturation_percentage < 90: demand_score = random.randint(50, 79)
-                else: demand_score = random.randint(10, 49)
-
-                region = models.RegionStats(
-                    state=state,
-                    district=district,
-                    pincode=pincode,
-                    total_population=estimated_population,
-                    aadhaar_generated=aadhaar_generated,
-                    pending_enrolments=pending,
-                    saturation_percentage=saturation_percentage,
-                    demand_score=demand_score
-                )
-                
-                batch_data.append(region)
-                count += 1
-                
-                # Batch Save (Fast)
-                if len(batch_data) >= 5000:
-                    db.bulk_save_objects(batch_data)
-                    db.commit()
-                    batch_data = []
-                    print(f"✅ Saved {count} records...")
-
-            except Exception:
-                continue
-
-        # Bacha hua data save
-        if batch_data:
-            db.bulk_save_objects(batch_data)
-            db.commit()
-
-        print(f"🎉 GRAND SUCCESS! Added: {count}, Skipped (Duplicates): {skipped}")
+        # seed do to fake demographics har run mein same (benchmarks ke liye)
+        frame = build_india_frame(df, np.random.default_rng(seed))
+
+        # Batch Save (Fast) - duplicates DB khud skip karta hai (ON CONFLICT DO NOTHING)
+        count = 0
+        for start in range(offset, len(frame), 5000):
+            count += insert_new_regions(
+                engine, frame.iloc[start:start + 5000],
+                on_batch=lambda conn, n, done=start: checkpoint(conn, manifest_id, done + n),
+            )
+            print(f"✅ Saved {count} records...")
+
+        mark_done(db, manifest_id)
+        print(f"🎉 GRAND SUCCESS! Added: {count}, Skipped (Duplicates): {len(frame) - count}")
 
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -96,4 +87,7 @@ def load_full_india_data():
         db.close()
 
 if __name__ == "__main__":
-    load_full_india_data()
+    parser = argparse.ArgumentParser(description="Pincode directory -> RegionStats")
+    parser.add_argument("--seed", type=int, default=None, help="Fake demographics ka seed (default: random)")
+    args = parser.parse_args()
+    load_full_india_data(args.seed)
@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+import numpy as np
+from sqlalchemy import delete
+
+from app.db.session import engine
+from app.models.prediction import ForecastModel
+from app.services.batch_forecaster import list_pincodes
+
+FILTER_URLS = [
+    "/api/v1/filters/states",
+    "/api/v1/filters/districts?state_name={state}",
+    "/api/v1/dashboard-stats",
+]
+
+
+def _percentiles(latencies):
+    if not latencies:
+        return {"requests": 0}
+    ms = np.array(latencies) * 1000
+    return {
+        "requests": len(ms),
+        "p50_ms": round(float(np.percentile(ms, 50)), 1),
+        "p99_ms": round(float(np.percentile(ms, 99)), 1),
+        "max_ms": round(float(ms.max()), 1),
+    }
+
+
+async def _filter_worker(client, urls, deadline, sink):
+    i = 0
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.get(urls[i % len(urls)])
+        response.raise_for_status()
+        sink.append(time.perf_counter() - started)
+        i += 1
+
+
+async def _forecast_worker(client, pincodes, deadline, sink):
+    while pincodes and time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await client.get(f"/api/v1/predict/{pincodes.pop()}")
+        sink.append(time.perf_counter() - started)
+
+
+async def _phase(client, urls, seconds, concurrency, pincodes=None, forecast_concurrency=0):
+    deadline = time.perf_counter() + seconds
+    filter_latencies, forecast_latencies = [], []
+    tasks = [_filter_worker(client, urls, deadline, filter_latencies) for _ in range(concurrency)]
+    tasks += [_forecast_worker(client, pincodes, deadline, forecast_latencies) for _ in range(forecast_concurrency)]
+    await asyncio.gather(*tasks)
+    return _percentiles(filter_latencies), _percentiles(forecast_latencies)
+
+
+async def run_load_test(base_url, seconds, concurrency, forecast_concurrency, forecast_pincodes, refit):
+    """
+    🚦 Do phase: (1) sirf filter/dashboard traffic, (2) wahi traffic + parallel forecasts (cache miss).
+    Dono ka p99 compare karo - forecasts se filters ka p99 nahi badhna chahiye.
+    """
+    pincodes = list_pincodes(engine, forecast_pincodes)
+    if refit:
+        # Local DB: forecast cache khali karo taaki har predict request model fit kare
+        with engine.begin() as conn:
+            conn.execute(delete(ForecastModel))
+
+    if base_url:
+        client = httpx.AsyncClient(base_url=base_url, timeout=120)
+    else:
+        from app.main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test", timeout=120)
+
+    async with client:
+        states = (await client.get("/api/v1/filters/states")).json()
+        urls = [u.format(state=states[0] if states else "") for u in FILTER_URLS]
+
+        baseline, _ = await _phase(client, urls, seconds, concurrency)
+        loaded, forecasts = await _phase(client, urls, seconds, concurrency, list(pincodes), forecast_concurrency)
+
+    report = {"filters_baseline": baseline, "filters_during_forecasts": loaded, "forecasts": forecasts}
+    print(f"\n🚦 Filters p99: {baseline.get('p99_ms')} ms idle -> {loaded.get('p99_ms')} ms during "
+          f"{forecasts.get('requests', 0)} forecasts")
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Filter/dashboard latency ka load test, forecasts ke saath aur bina")
+    parser.add_argument("--url", default=None, help="Chalta hua server (default: in-process app)")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=8, help="Parallel filter clients")
+    parser.add_argument("--forecast-concurrency", type=int, default=4, help="Parallel forecast clients")
+    parser.add_argument("--pincodes", type=int, default=200, help="Forecast ke liye kitne pincodes")
+    parser.add_argument("--refit", action="store_true", help="Pehle forecast cache khali karo (local DB)")
+    args = parser.parse_args()
+    asyncio.run(run_load_test(args.url, args.seconds, args.concurrency,
+                              args.forecast_concurrency, args.pincodes, args.refit))
@@ -0,0 +1,90 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+HEAVY_MODULES = ["prophet", "sklearn", "scipy", "cmdstanpy", "matplotlib", "pandas", "pyarrow"]
+
+
+def import_profile(top: int):
+    """`python -X importtime -c "import app.main"` -> sabse mehenge imports (cumulative) + kaunse heavy modules aaye."""
+    code = f"import sys, json, app.main; print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True, check=True)
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|", 1).split("|"))
+        entries.append({"module": name.strip(), "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000})
+    total = next((e["cumulative_ms"] for e in entries if e["module"] == "app.main"), None)
+    return {
+        "app_main_import_ms": total,
+        "heavy_modules_loaded": json.loads(proc.stdout.strip().splitlines()[-1]),
+        "top_imports": sorted(entries, key=lambda e: -e["cumulative_ms"])[:top],
+    }
+
+
+def _wait_for(url: str, started: float, timeout: float):
+    """URL 200 dene tak poll; process start se seconds (ya None agar timeout)."""
+    while time.perf_counter() - started < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as resp:
+                if resp.status == 200:
+                    return round(time.perf_counter() - started, 3)
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.02)
+    return None
+
+
+def cold_start(port: int, timeout: float):
+    """
+    Asli uvicorn process: spawn se pehle 200 tak (/, filters) aur /ready?models=true tak ka time.
+    Forecast scheduler band (uska refit models ko jaldi load kar deta).
+    """
+    env = dict(os.environ, FORECAST_SCHEDULER_ENABLED="false")
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        report = {
+            "root_ready_s": _wait_for(f"{base}/", started, timeout),
+            "filters_ready_s": _wait_for(f"{base}/api/v1/filters/states", started, timeout),
+            "models_ready_s": _wait_for(f"{base}/ready?models=true", started, timeout),
+        }
+        with urllib.request.urlopen(f"{base}/ready", timeout=5) as resp:
+            report["engines"] = json.load(resp)["engines"]
+        return report
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API cold start: import-time profile + time to first 200 / models ready")
+    parser.add_argument("--top", type=int, default=15, help="Kitne sabse mehenge imports dikhane hain")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--skip-server", action="store_true", help="Sirf import profile (uvicorn spawn nahi)")
+    args = parser.parse_args()
+
+    result = {"imports": import_profile(args.top)}
+    print(f"\n⏱️ import app.main: {result['imports']['app_main_import_ms']:.0f}ms "
+          f"(heavy modules: {', '.join(result['imports']['heavy_modules_loaded']) or 'none'})")
+    for entry in result["imports"]["top_imports"]:
+        print(f"   {entry['cumulative_ms']:>9.1f}ms  {entry['module']}")
+
+    if not args.skip_server:
+        result["cold_start"] = cold_start(args.port, args.timeout)
+        print(f"🚀 Cold start: / in {result['cold_start']['root_ready_s']}s, "
+              f"filters in {result['cold_start']['filters_ready_s']}s, "
+              f"models ready in {result['cold_start']['models_ready_s']}s")
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,25 @@
+import argparse
+import json
+
+from app.db.session import engine
+from app.db.migrations import run_migrations
+from app.services.batch_forecaster import run_batch_forecast
+
+# Database initialize (PredictionLog table bhi)
+run_migrations(engine)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Saare pincodes ka forecast (parallel) -> prediction_logs")
+    parser.add_argument("--workers", type=int, default=None, help="Default: BATCH_FORECAST_WORKERS / CPU count")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Ek worker task mein kitne pincodes")
+    parser.add_argument("--limit", type=int, default=None, help="Sirf pehle N pincodes (testing)")
+    parser.add_argument("--report", default=None, help="Per-pincode timings + summary JSON file")
+    args = parser.parse_args()
+
+    results, summary = run_batch_forecast(engine, args.workers, args.chunk_size, args.limit)
+    print(json.dumps(summary, indent=2))
+
+    if args.report:
+        with open(args.report, "w") as fh:
+            json.dump({"summary": summary, "pincodes": results}, fh, indent=2)
+        print(f"📝 Report written to {args.report}")
@@ -0,0 +1,149 @@
+import argparse
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from app.services.ingestion_engine import CATEGORY_COLUMNS, SOURCE_COLUMN_MAP
+
+# 🧪 Seeded synthetic UIDAI-jaisa data: wahi source files jo loaders padhte hain
+# (dataset/ ke category CSVs + pincode-dataset.csv), taaki har loader asli raaste se chale.
+# Same seed + same scale = byte-for-byte same files.
+PINCODE_PREFIXES = np.arange(110, 855)      # 3-digit sorting districts (placement optimizer inhi se distance nikalta hai)
+PINCODES_PER_DISTRICT = 26                  # ~19k pincodes / ~730 districts (asli India)
+N_STATES = 36
+ROWS_PER_FILE = 1_000_000                   # Asli dump jaisa: bade files kai hisson mein
+CATEGORY_DENSITY = {"enrolment": 1.0, "biometric": 0.8, "demographic": 1.2}  # Har category ka relative reporting rate
+CATEGORY_SCALE = {"enrolment": 1.0, "biometric": 2.5, "demographic": 1.5}    # Relative volume
+WEEKDAY_FACTOR = np.array([1.0, 1.0, 1.0, 1.0, 1.0, 0.8, 0.3])              # Mon..Sun
+SURGE_PROBABILITY = 0.002                   # Kisi (pincode, din) par camp / surge
+SURGE_FACTOR = 5.0
+
+
+def synthetic_geography(pincodes: int, seed: int = 42) -> pd.DataFrame:
+    """
+    States -> districts -> pincodes. Har district ek 3-digit prefix ke andar (zyada districts hon
+    to prefixes share hote hain, pincodes phir bhi unique). base_rate = pincode ka daily activity level.
+    """
+    rng = np.random.default_rng(seed)
+    n_districts = max(1, pincodes // PINCODES_PER_DISTRICT)
+    # District sizes lognormal (shehri districts bade), total = pincodes
+    weights = rng.lognormal(0, 0.5, n_districts)
+    sizes = np.maximum(1, np.floor(weights / weights.sum() * pincodes)).astype(int)
+    sizes[np.argmax(sizes)] += pincodes - sizes.sum()
+    district_state = np.sort(rng.integers(0, min(N_STATES, n_districts), n_districts))
+
+    prefix_of = PINCODE_PREFIXES[np.arange(n_districts) % len(PINCODE_PREFIXES)]
+    free_offsets = {p: rng.permutation(np.arange(1, 1000)) for p in np.unique(prefix_of)}
+    used = dict.fromkeys(free_offsets, 0)
+    codes = []
+    for prefix, size in zip(prefix_of, sizes):
+        offsets = np.sort(free_offsets[prefix][used[prefix]:used[prefix] + size])
+        used[prefix] += size
+        codes.append(prefix * 1000 + offsets)
+
+    district_idx = np.repeat(np.arange(n_districts), sizes)
+    return pd.DataFrame({
+        "state": np.char.mod("State %02d", district_state[district_idx] + 1).astype(object),
+        "district": np.char.mod("District %03d", district_idx + 1).astype(object),
+        "pincode": np.concatenate(codes).astype(str).astype(object),
+        "base_rate": rng.lognormal(np.log(3), 1.0, len(district_idx)),
+    })
+
+
+def _month_spans(start: date, days: int):
+    end = start + timedelta(days=days - 1)
+    month = start
+    while month <= end:
+        next_month = (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+        yield month, min(end, next_month - timedelta(days=1))
+        month = next_month
+
+
+def category_frames(geography: pd.DataFrame, start: date, days: int, density: float, seed: int = 42):
+    """
+    Mahine-dar generator: {category: source-format frame} (date DD-MM-YYYY, state, district, pincode,
+    category ke count columns). Har category ka reporting mask alag - merge outer join hota hai
+    aur incremental loader partial category updates karta hai, asli data jaisa.
+    """
+    rng = np.random.default_rng(seed + 1)
+    base = geography["base_rate"].to_numpy()
+    for month_start, month_end in _month_spans(start, days):
+        dates = pd.date_range(month_start, month_end)
+        shape = (len(dates), len(base))
+        weekday = WEEKDAY_FACTOR[dates.weekday.to_numpy()][:, None]
+        surge = np.where(rng.random(shape) < SURGE_PROBABILITY, SURGE_FACTOR, 1.0)
+        frames = {}
+        for category, metric_columns in CATEGORY_COLUMNS.items():
+            reports = rng.random(shape) < min(1.0, density * CATEGORY_DENSITY[category])
+            day_idx, pin_idx = np.nonzero(reports)
+            lam = (base[pin_idx] * CATEGORY_SCALE[category] * weekday[day_idx, 0] * surge[day_idx, pin_idx])
+            frame = pd.DataFrame({
+                "date": dates.strftime("%d-%m-%Y").to_numpy()[day_idx],
+                "state": geography["state"].to_numpy()[pin_idx],
+                "district": geography["district"].to_numpy()[pin_idx],
+                "pincode": geography["pincode"].to_numpy()[pin_idx],
+            })
+            for column in metric_columns:
+                frame[SOURCE_COLUMN_MAP[column]] = rng.poisson(lam / len(metric_columns))
+            frames[category] = frame
+        yield frames
+
+
+def write_dataset(root: str, pincodes: int, days: int, density: float = 0.25,
+                  start: date = date(2023, 1, 1), seed: int = 42) -> dict:
+    """
+    root/ mein loaders ke input likho:
+      dataset/api_data_aadhar_<category>/api_data_aadhar_<category>_<part>.csv  (daily metrics loaders)
+      pincode-dataset.csv                                                       (load_full_india: RegionStats)
+    Returns summary (rows per category, files) - benchmark results ke meta mein jaata hai.
+    """
+    geography = synthetic_geography(pincodes, seed)
+    geography.rename(columns={"pincode": "Pincode", "district": "District", "state": "StateName"})[
+        ["Pincode", "District", "StateName"]
+    ].to_csv(os.path.join(root, "pincode-dataset.csv"), index=False)
+
+    rows = dict.fromkeys(CATEGORY_COLUMNS, 0)
+    file_rows = dict.fromkeys(CATEGORY_COLUMNS, 0)   # Current file mein kitni rows (mahine-dar append)
+    files = {c: [] for c in CATEGORY_COLUMNS}
+    for frames in category_frames(geography, start, days, density, seed):
+        for category, frame in frames.items():
+            folder = os.path.join(root, "dataset", f"api_data_aadhar_{category}")
+            os.makedirs(folder, exist_ok=True)
+            if not files[category] or file_rows[category] >= ROWS_PER_FILE:
+                files[category].append(os.path.join(folder, f"api_data_aadhar_{category}_{len(files[category]):03d}.csv"))
+                frame.to_csv(files[category][-1], index=False)
+                file_rows[category] = 0
+            else:
+                frame.to_csv(files[category][-1], index=False, mode="a", header=False)
+            file_rows[category] += len(frame)
+            rows[category] += len(frame)
+
+    summary = {
+        "pincodes": len(geography),
+        "districts": int(geography["district"].nunique()),
+        "states": int(geography["state"].nunique()),
+        "days": days,
+        "start": start.isoformat(),
+        "density": density,
+        "seed": seed,
+        "rows": rows,
+        "files": {c: len(f) for c, f in files.items()},
+    }
+    print(f"🧪 Synthetic dataset: {summary['pincodes']} pincodes x {days} days -> "
+          + ", ".join(f"{c} {n}" for c, n in rows.items()) + " rows")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seeded synthetic UIDAI source files (daily metrics + pincode directory)")
+    parser.add_argument("root", help="Output folder (dataset/ + pincode-dataset.csv yahan banenge)")
+    parser.add_argument("--pincodes", type=int, default=19000)
+    parser.add_argument("--days", type=int, default=3 * 365)
+    parser.add_argument("--density", type=float, default=0.25, help="Ek pincode kisi din report kare, uski probability")
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2023, 1, 1))
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    os.makedirs(args.root, exist_ok=True)
+    write_dataset(args.root, args.pincodes, args.days, args.density, args.start, args.seed)
@@ -1,83 +1,200 @@
-import numpy as np
-
-# 🔥 JUGAAD: Numpy ka naya version patch karne ke liye
-if not hasattr(np, 'float'):
-    np.float = float
-
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import IsolationForest
-from prophet import Prophet
 import datetime
+import time
 
-# 🎯 CONFIGURATION (Standard Times in Minutes)
-# Tumhare Algorithm ke hisaab se weights
-TIME_WEIGHTS = {
-    "enrol_0_5": 10,   # Child Enrollment (Tablet)
-    "enrol_18_plus": 25, # Adult Enrollment (Iris/Fingerprint)
-    "bio_update": 15,  # Mandatory Biometric Update
-    "demo_update": 8   # Demographic Update (Address/Name)
-}
+from app.core.request_metrics import AI_ERRORS, stage_timer
+from app.services.model_stack import model_stack  # Prophet / IsolationForest lazy (import time par nahi)
+from app.services.workload_weights import workload_minutes
 
+# 🎯 CONFIGURATION (Standard Times in Minutes)
+# Per-transaction weights ab app/services/workload_weights.py mein (SQL + NumPy dono wahi se)
 OPERATOR_CAPACITY_MINS = 480  # 8 Hours * 60 Mins
 
+FORECAST_HORIZON = 7  # Agle 7 din
+
+# 🧭 Backend selection: Prophet sirf lambi history + bade volume wale pincodes par
+PROPHET_MIN_HISTORY_DAYS = 60
+PROPHET_MIN_DAILY_WORKLOAD_MINS = OPERATOR_CAPACITY_MINS  # ~1 counter se kam kaam -> fast backend
+
+
+class ProphetForecaster:
+    """Prophet (Stan) fit - accurate lekin har series par ~sau ms se zyada."""
+    name = "Prophet"
+
+    def forecast(self, df, horizon=FORECAST_HORIZON):
+        """df: daily (ds, y). Returns (fitted model, horizon daily values)."""
+        Prophet = model_stack.prophet()
+        m = Prophet(daily_seasonality=True, yearly_seasonality=False)
+        with stage_timer("prophet_fit"):
+            m.fit(df[['ds', 'y']])
+        with stage_timer("prophet_predict"):
+            future = m.make_future_dataframe(periods=horizon)
+            forecast = m.predict(future)
+        return m, [float(v) for v in forecast.tail(horizon)['yhat']]
+
+
+class SeasonalSmoothingForecaster:
+    """
+    ⚡ NumPy backend: exponential smoothing level + weekly seasonal profile.
+    `forecast_many` hazaaron series ek saath (matrix ops) forecast karta hai - koi per-series fit nahi.
+    """
+    name = "SeasonalSmoothing"
+
+    def __init__(self, alpha=0.3, window=56, season_weeks=4):
+        self.alpha = alpha
+        self.window = window          # Sirf last itne din dekhte hain (purane weights ~0 ho jaate hain)
+        self.season_weeks = season_weeks
+
+    def to_matrix(self, series_list):
+        """
+        Alag-alag length ki series -> right-aligned (n, window) matrix + validity mask.
+        Har series apne last din par khatam hoti hai.
+        """
+        values = np.zeros((len(series_list), self.window))
+        mask = np.zeros((len(series_list), self.window), dtype=bool)
+        for i, y in enumerate(series_list):
+            tail = np.asarray(y, dtype=float)[-self.window:]
+            if len(tail):
+                values[i, -len(tail):] = tail
+                mask[i, -len(tail):] = True
+        return values, mask
+
+    def forecast_many(self, values, mask, horizon=FORECAST_HORIZON):
+        """
+        values/mask: (n_series, window). Returns (n_series, horizon) forecasts.
+        """
+        n, window = values.shape
+        valid = mask.astype(float)
+
+        # 1. Weekly profile: last season_weeks*7 din, weekday-wise masked mean
+        span = min(self.season_weeks * 7, window - window % 7)
+        recent = values[:, -span:].reshape(n, -1, 7)
+        recent_valid = valid[:, -span:].reshape(n, -1, 7)
+        counts = recent_valid.sum(axis=1)
+        profile = np.divide((recent * recent_valid).sum(axis=1), counts,
+                            out=np.zeros((n, 7)), where=counts > 0)
+        seen = counts > 0
+        profile_mean = np.divide((profile * seen).sum(axis=1), seen.sum(axis=1),
+                                 out=np.zeros(n), where=seen.any(axis=1))
+        season = np.where(seen, profile - profile_mean[:, None], 0.0)
+        # Do hafte se kam data par season noise hai - use mat karo
+        season[valid.sum(axis=1) < 14] = 0.0
+
+        # 2. Level: deseasonalized series ka EWMA = ek weight vector se matmul
+        weekday = np.arange(window) % 7
+        shift = (window - span) % 7          # profile ka column 0 window ke kis din par hai
+        deseasonalized = values - season[:, (weekday - shift) % 7]
+        weights = self.alpha * (1 - self.alpha) ** np.arange(window - 1, -1, -1)
+        masked_weights = valid * weights
+        norm = masked_weights.sum(axis=1)
+        level = np.divide((deseasonalized * masked_weights).sum(axis=1), norm,
+                          out=np.zeros(n), where=norm > 0)
+
+        # 3. Forecast: level + agle din ka seasonal offset (window ke baad wale din)
+        future_weekday = (window + np.arange(horizon) - shift) % 7
+        return np.maximum(level[:, None] + season[:, future_weekday], 0.0)
+
+    def forecast(self, df, horizon=FORECAST_HORIZON):
+        with stage_timer("smoothing_forecast"):
+            values, mask = self.to_matrix([df['y'].to_numpy()])
+            return None, [float(v) for v in self.forecast_many(values, mask, horizon)[0]]
+
+
+FORECASTERS = {f.name: f for f in (ProphetForecaster(), SeasonalSmoothingForecaster())}
+
+
+def select_forecaster(df):
+    """Chhoti history ya kam volume -> NumPy backend; baaki Prophet."""
+    if len(df) >= PROPHET_MIN_HISTORY_DAYS and df['y'].mean() >= PROPHET_MIN_DAILY_WORKLOAD_MINS:
+        return FORECASTERS[ProphetForecaster.name]
+    return FORECASTERS[SeasonalSmoothingForecaster.name]
+
+
 class AIEngine:
     def __init__(self, data_records):
         """
         data_records: List of database objects (DailyAadhaarMetrics)
         """
-        # Data ko DataFrame mein convert karo
-        self.df = pd.DataFrame([
-            {
-                "ds": r.date,  # Date for Prophet
-                "enrol_0_5": r.enrol_0_5,
-                "enrol_18_plus": r.enrol_18_plus,
-                "bio_update": r.bio_update_5_17 + r.bio_update_17_plus,
-                "demo_update": r.demo_update_5_17 + r.demo_update_17_plus
-            }
-            for r in data_records
-        ])
-        
-        # Date format fix karo
-        self.df['ds'] = pd.to_datetime(self.df['ds'], dayfirst=True)
+        # Data ko DataFrame mein convert karo (workload row par pehle se stored hai)
+        with stage_timer("dataframe_build"):
+            df = pd.DataFrame([
+                {
+                    "ds": r.date,  # Date for Prophet
+                    "y": (r.total_workload_hours or 0) * 60,
+                }
+                for r in data_records
+            ])
+            self._prepare(df)
+
+    @classmethod
+    def from_frame(cls, frame):
+        """
+        Pehle se bana frame (ds, y) - ya y ki jagah raw count columns - se engine - ORM objects ki zaroorat nahi (batch jobs ke liye).
+        """
+        engine = cls.__new__(cls)
+        with stage_timer("dataframe_build"):
+            engine._prepare(frame.copy())
+        return engine
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """
+        SQL se aaye column arrays ({ds: datetime64, y}) se seedha engine -
+        per-row Python objects nahi bante (metrics_history.load_history_arrays).
+        """
+        engine = cls.__new__(cls)
+        with stage_timer("dataframe_build"):
+            engine._prepare(pd.DataFrame(arrays, copy=False))
+        return engine
+
+    def _prepare(self, df):
+        self.df = df
+
+        # Date format fix karo (typed arrays pehle se datetime hain - dobara parse nahi)
+        if not pd.api.types.is_datetime64_any_dtype(self.df['ds']):
+            self.df['ds'] = pd.to_datetime(self.df['ds'], dayfirst=True)
         
-        # 1. ✅ Calculate Actual Workload (Minutes)
-        self.df['y'] = (
-            (self.df['enrol_0_5'] * TIME_WEIGHTS['enrol_0_5']) +
-            (self.df['enrol_18_plus'] * TIME_WEIGHTS['enrol_18_plus']) +
-            (self.df['bio_update'] * TIME_WEIGHTS['bio_update']) +
-            (self.df['demo_update'] * TIME_WEIGHTS['demo_update'])
-        )
+        # 1. ✅ Actual Workload (Minutes): SQL se stored workload aata hai,
+        # sirf raw counts wale frame par shared weights ka NumPy kernel
+        if 'y' not in self.df:
+            self.df['y'] = workload_minutes(self.df)
         # Sort by date
         self.df = self.df.sort_values('ds')
         
         # ✅ Fix: Ensure daily frequency with 0 fill for missing days
         self.df = self.df.set_index('ds').asfreq('D').fillna(0).reset_index()
 
-    def predict_next_7_days(self):
+    def fit_forecast(self, forecaster=None):
         """
-        🔮 Prophet Algorithm se Future Workload Predict karega
+        🔮 Forecast fit + agle 7 din ka daily forecast.
+        forecaster na diya ho to series length/volume se chuna jaata hai (self.algo_used mein naam).
+        Returns (fitted model ya None, 7 daily workload values in minutes).
         """
         if len(self.df) < 5:
             # Agar data kam hai, to simple Average return karo (Fallback)
-            return self.df['y'].mean()
+            self.algo_used = "Mean"
+            return None, [float(self.df['y'].mean())] * FORECAST_HORIZON
 
+        forecaster = forecaster or select_forecaster(self.df)
         try:
-            # Prophet Model Setup
-            m = Prophet(daily_seasonality=True, yearly_seasonality=False)
-            m.fit(self.df[['ds', 'y']])
-            
-            # Future Dataframe (Next 7 Days)
-            future = m.make_future_dataframe(periods=7)
-            forecast = m.predict(future)
-            
-            # Sirf future ka average workload return karo
-            next_week = forecast.tail(7)
-            avg_predicted_workload = next_week['yhat'].mean()
-            return max(0, avg_predicted_workload) # Negative nahi ho sakta
+            model, next_week = forecaster.forecast(self.df, FORECAST_HORIZON)
+            self.algo_used = forecaster.name
+            return model, next_week
         except Exception as e:
-            print(f"⚠️ Prophet Error: {e}")
-            return self.df['y'].mean()
+            print(f"⚠️ {forecaster.name} Error: {e}")
+            AI_ERRORS.inc(component=forecaster.name)
+            self.algo_used = "Mean"
+            return None, [float(self.df['y'].mean())] * FORECAST_HORIZON
+
+    def predict_next_7_days(self):
+        """
+        🔮 Forecaster (Prophet / NumPy backend) se Future Workload Predict karega
+        """
+        _, next_week = self.fit_forecast()
+        # Sirf future ka average workload return karo
+        avg_predicted_workload = sum(next_week) / len(next_week)
+        return max(0, avg_predicted_workload) # Negative nahi ho sakta
 
     def detect_anomalies(self):
         """
@@ -87,8 +204,10 @@ class AIEngine:
             return "Normal"
 
         try:
+            IsolationForest = model_stack.isolation_forest()
             model = IsolationForest(contamination=0.1) # 10% data anomalous ho sakta hai
-            self.df['anomaly'] = model.fit_predict(self.df[['y']])
+            with stage_timer("isolation_forest"):
+                self.df['anomaly'] = model.fit_predict(self.df[['y']])
             
             # Check karo kya last entry anomaly hai? (-1 means Anomaly)
             latest_status = self.df.iloc[-1]['anomaly']
@@ -100,10 +219,13 @@ class AIEngine:
                 else:
                     return "Unusual Drop 📉"
             return "Normal Flow"
-        except:
+        except Exception as e:
+            print(f"⚠️ IsolationForest Error: {e}")
+            AI_ERRORS.inc(component="IsolationForest")
             return "Normal Flow"
 
-    def optimize_resources(self, predicted_workload):
+    @staticmethod
+    def optimize_resources(predicted_workload):
         """
         ⚖️ Linear Logic se Counters Calculate karega
         """
@@ -111,18 +233,95 @@ class AIEngine:
         required_counters = np.ceil(predicted_workload / OPERATOR_CAPACITY_MINS)
         return int(required_counters)
 
+def forecast_engines(engines):
+    """
+    🏭 Bahut saare engines ka forecast ek saath: NumPy backend wali saari series
+    ek hi matrix call mein, baaki (Prophet) ek-ek karke.
+    Returns list of (algo_used, 7 daily values) - engines ke order mein.
+    """
+    fast = FORECASTERS[SeasonalSmoothingForecaster.name]
+    results = [None] * len(engines)
+    batched = []
+    for i, engine in enumerate(engines):
+        if len(engine.df) >= 5 and select_forecaster(engine.df) is fast:
+            batched.append(i)
+        else:
+            _, next_week = engine.fit_forecast()
+            results[i] = (engine.algo_used, next_week)
+
+    if batched:
+        with stage_timer("smoothing_forecast"):
+            values, mask = fast.to_matrix([engines[i].df['y'].to_numpy() for i in batched])
+            forecasts = fast.forecast_many(values, mask, FORECAST_HORIZON)
+        for i, row in zip(batched, forecasts):
+            engines[i].algo_used = fast.name
+            results[i] = (fast.name, [float(v) for v in row])
+    return results
+
+def backtest(frames, horizon=FORECAST_HORIZON, forecasters=None):
+    """
+    🧪 Holdout backtest: har series ke last `horizon` din chhupao, baaki par forecast karo.
+    frames: list of (ds, y) frames (metrics_history.load_histories).
+    Returns {forecaster name: {series, mae, smape, seconds, series_per_sec}}.
+    NumPy backend saari series ek matrix call mein karta hai, Prophet ek-ek karke.
+    """
+    forecasters = forecasters or list(FORECASTERS.values())
+    train, actual = [], []
+    for frame in frames:
+        df = AIEngine.from_frame(frame).df
+        if len(df) >= horizon + 5:
+            train.append(df.iloc[:-horizon].reset_index(drop=True))
+            actual.append(df['y'].to_numpy()[-horizon:])
+    if not train:
+        return {}
+    actual = np.array(actual)
+
+    report = {}
+    for forecaster in forecasters:
+        started = time.perf_counter()
+        if hasattr(forecaster, "forecast_many"):
+            values, mask = forecaster.to_matrix([df['y'].to_numpy() for df in train])
+            predicted = forecaster.forecast_many(values, mask, horizon)
+        else:
+            rows = []
+            for df in train:
+                try:
+                    rows.append(forecaster.forecast(df, horizon)[1])
+                except Exception:
+                    rows.append([float(df['y'].mean())] * horizon)
+            predicted = np.maximum(np.array(rows), 0.0)
+        seconds = time.perf_counter() - started
+
+        error = np.abs(predicted - actual)
+        denom = np.abs(predicted) + np.abs(actual)
+        smape = np.divide(2 * error, denom, out=np.zeros_like(error), where=denom > 0)
+        report[forecaster.name] = {
+            "series": len(train),
+            "mae": round(float(error.mean()), 2),
+            "smape": round(float(smape.mean()) * 100, 2),
+            "seconds": round(seconds, 3),
+            "series_per_sec": round(len(train) / seconds, 1) if seconds else None,
+        }
+    return report
+
 # Helper function to use easily
-def get_ai_insights(metrics_list):
-    engine = AIEngine(metrics_list)
+def get_ai_insights(metrics_list, predicted_mins=None, status=None):
+    """
+    predicted_mins / status pehle se (forecast cache se) mile hon to
+    Prophet / IsolationForest dobara nahi chalte.
+    """
+    engine = AIEngine(metrics_list) if predicted_mins is None or status is None else None
     
     # 1. Forecast
-    predicted_mins = engine.predict_next_7_days()
+    if predicted_mins is None:
+        predicted_mins = engine.predict_next_7_days()
     
     # 2. Anomaly
-    status = engine.detect_anomalies()
+    if status is None:
+        status = engine.detect_anomalies()
     
     # 3. Optimization
-    counters = engine.optimize_resources(predicted_mins)
+    counters = AIEngine.optimize_resources(predicted_mins)
     
     return {
         "predicted_workload_hours": round(predicted_mins / 60, 1),
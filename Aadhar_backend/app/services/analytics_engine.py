@@ -1,6 +1,19 @@
+import base64
+import json
+from datetime import timedelta
+
+import numpy as np
 from sqlalchemy.orm import Session
 from app.models import models
-from sqlalchemy import desc
+from sqlalchemy import desc, func, select
+from app.models.prediction import ForecastModel
+from app.services.ai_engine import OPERATOR_CAPACITY_MINS
+from app.services.snapshots import VersionedSnapshot
+
+# Resource planning assumptions
+MACHINE_DAILY_CAPACITY = 50     # 1 Machine = 50 enrolments/day
+BACKLOG_CLEARANCE_DAYS = 90     # Backlog 3 mahine mein clear
+RECENT_WORKLOAD_DAYS = 28       # Forecast cache na ho to itne din ka avg workload
 
 def find_critical_gaps(db: Session, district_name: str = None):
     """
@@ -40,13 +53,251 @@ def predict_resource_allocation(db: Session, pincode: str):
         
     # Logic: 1 Machine can handle 50 enrolments/day.
     # Target: Clear backlog in 3 months (90 days).
-    daily_target = area.pending_enrolments / 90
-    machines_needed = round(daily_target / 50) + 1 # Buffer
+    daily_target = area.pending_enrolments / BACKLOG_CLEARANCE_DAYS
+    machines_needed = round(daily_target / MACHINE_DAILY_CAPACITY) + 1 # Buffer
     
     return {
         "pincode": pincode,
         "backlog": area.pending_enrolments,
         "suggested_machines": machines_needed,
         "suggested_staff": machines_needed, # 1 Operator per machine
-        "estimated_completion_days": 90
-    }
\ No newline at end of file
+        "estimated_completion_days": BACKLOG_CLEARANCE_DAYS
+    }
+
+# 🏭 Batch allocation: bahut saare pincodes, ek set-based query + vectorized math
+ALLOCATION_FIELDS = ("pincode", "state", "district", "pending_enrolments", "forecast_mins", "recent_mins")
+
+
+def allocation_statement(latest_period, pincodes=None, state=None, district=None):
+    """
+    RegionStats + cached forecast + pichle RECENT_WORKLOAD_DAYS ka avg workload (pincode rollup),
+    sab ek query mein. Rollup subquery bhi sirf scope ke pincodes tak seemit hai.
+    """
+    r = models.RegionStats
+    scope = []
+    if pincodes is not None:
+        scope.append(r.pincode.in_(pincodes))
+    if state:
+        scope.append(r.state == state)
+    if district:
+        scope.append(r.district == district)
+    scope_pincodes = select(r.pincode).where(*scope)
+
+    rollup = models.DailyMetricsRollup
+    recent_conditions = [rollup.level == "pincode", rollup.pincode.in_(scope_pincodes)]
+    if latest_period is not None:
+        recent_conditions.append(rollup.period > latest_period - timedelta(days=RECENT_WORKLOAD_DAYS))
+    recent = (
+        select(rollup.pincode, (func.sum(rollup.total_workload_hours) * 60.0 / RECENT_WORKLOAD_DAYS).label("recent_mins"))
+        .where(*recent_conditions)
+        .group_by(rollup.pincode)
+        .subquery()
+    )
+    forecast = ForecastModel
+    return (
+        select(r.pincode, r.state, r.district, r.pending_enrolments,
+               forecast.predicted_workload_mins.label("forecast_mins"), recent.c.recent_mins)
+        .outerjoin(forecast, forecast.pincode == r.pincode)
+        .outerjoin(recent, recent.c.pincode == r.pincode)
+        .where(*scope)
+        .order_by(r.pincode)
+    )
+
+
+def compute_allocations(rows) -> dict:
+    """
+    Rows (ALLOCATION_FIELDS order) -> column arrays + machines/staff/counters, ek vectorized pass.
+    Workload: cached forecast, warna recent average.
+    """
+    if not rows:
+        return {}
+    cols = dict(zip(ALLOCATION_FIELDS, (np.array(v, dtype=object) for v in zip(*rows))))
+    backlog = np.nan_to_num(cols["pending_enrolments"].astype(float))
+    forecast = cols["forecast_mins"].astype(float)
+    recent = cols["recent_mins"].astype(float)
+
+    machines = np.round(backlog / BACKLOG_CLEARANCE_DAYS / MACHINE_DAILY_CAPACITY).astype(np.int64) + 1
+    workload = np.where(np.isnan(forecast), recent, forecast)
+    source = np.where(~np.isnan(forecast), "forecast", np.where(~np.isnan(recent), "recent_avg", "none"))
+    workload = np.nan_to_num(np.maximum(workload, 0))
+    counters = np.ceil(workload / OPERATOR_CAPACITY_MINS).astype(np.int64)
+
+    return {
+        "pincode": cols["pincode"], "state": cols["state"], "district": cols["district"],
+        "backlog": backlog.astype(np.int64),
+        "suggested_machines": machines,
+        "suggested_staff": machines,
+        "predicted_workload_mins": np.round(workload, 1),
+        "workload_source": source,
+        "required_counters": counters,
+    }
+
+
+def allocation_records(allocations: dict):
+    """Column arrays -> per-pincode dicts (sirf serialization ke waqt)."""
+    if not allocations:
+        return []
+    columns = {k: v.tolist() for k, v in allocations.items()}
+    keys = list(columns)
+    return [
+        {**dict(zip(keys, values)), "estimated_completion_days": BACKLOG_CLEARANCE_DAYS}
+        for values in zip(*columns.values())
+    ]
+
+# 🚦 Gap classification (RecommendationService ke rules) - codes: 0 = Low, 1 = Medium, 2 = High
+PRIORITIES = np.array(["Low", "Medium", "High"])
+ACTIONS = np.array(["No Action Needed", "Organize Enrolment Camp", "Open New Center Immediately"])
+RANK_METRICS = ("demand_score", "pending_enrolments", "saturation_percentage", "total_population", "aadhaar_generated")
+RANK_COLUMNS = ("pincode", "state", "district") + RANK_METRICS
+
+
+def classify_gaps(saturation: np.ndarray, population: np.ndarray) -> np.ndarray:
+    """Saare regions ek vectorized pass mein: Low saturation + High population = High priority."""
+    return np.select(
+        [(saturation < 70) & (population > 10000), saturation < 85],
+        [2, 1],
+        default=0,
+    ).astype(np.int8)
+
+
+def gap_reason(code: int, saturation: float) -> str:
+    if code == 2:
+        return f"Saturation is only {saturation}% with high population."
+    if code == 1:
+        return "Moderate gap detected."
+    return "Sufficient coverage"
+
+
+def encode_cursor(value, pincode: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([value, pincode]).encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    value, pincode = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    return float(value), str(pincode)
+
+
+class GapRanking:
+    """
+    📊 RegionStats ka ranked snapshot: har (metric, direction) ke liye pehle se sorted order
+    (pincode tie-break). Keyset page = do binary searches, deep pages bhi O(log n).
+    """
+
+    def __init__(self, columns: dict, version: int = 0):
+        self.version = version
+        self.columns = columns
+        self.codes = classify_gaps(columns["saturation_percentage"], columns["total_population"])
+        pincodes = columns["pincode"]
+        self.orders, self.sorted_keys, self.sorted_pincodes = {}, {}, {}
+        for metric in RANK_METRICS:
+            for ascending in (True, False):
+                keys = columns[metric] if ascending else -columns[metric]
+                order = np.lexsort((pincodes, keys)).astype(np.int32)
+                self.orders[metric, ascending] = order
+                self.sorted_keys[metric, ascending] = keys[order]
+                self.sorted_pincodes[metric, ascending] = pincodes[order]
+
+    def __len__(self):
+        return len(self.columns["pincode"])
+
+    def _row(self, i: int, rank: int):
+        c = self.columns
+        saturation = round(float(c["saturation_percentage"][i]), 2)
+        code = int(self.codes[i])
+        return {
+            "rank": rank,
+            "pincode": str(c["pincode"][i]),
+            "state": str(c["state"][i]),
+            "district": str(c["district"][i]),
+            "total_population": int(c["total_population"][i]),
+            "aadhaar_generated": int(c["aadhaar_generated"][i]),
+            "pending_enrolments": int(c["pending_enrolments"][i]),
+            "saturation": saturation,
+            "demand_score": round(float(c["demand_score"][i]), 2),
+            "priority": str(PRIORITIES[code]),
+            "suggested_action": str(ACTIONS[code]),
+            "reason": gap_reason(code, saturation),
+        }
+
+    def _after_cursor(self, sort: str, ascending: bool, cursor) -> int:
+        """Sorted order mein cursor (value, pincode) ke just baad wali position."""
+        value, pincode = cursor
+        key = value if ascending else -value
+        keys = self.sorted_keys[sort, ascending]
+        lo = np.searchsorted(keys, key, side="left")
+        hi = np.searchsorted(keys, key, side="right")
+        return int(lo + np.searchsorted(self.sorted_pincodes[sort, ascending][lo:hi], pincode, side="right"))
+
+    def _mask(self, state=None, district=None, priority=None):
+        c = self.columns
+        mask = np.ones(len(self), dtype=bool)
+        if state:
+            mask &= c["state"] == state
+        if district:
+            mask &= c["district"] == district
+        if priority:
+            mask &= self.codes == int(np.flatnonzero(PRIORITIES == priority)[0])
+        return mask
+
+    def page(self, sort="demand_score", ascending=False, limit=50, cursor=None,
+             state=None, district=None, priority=None):
+        """
+        Keyset pagination (cursor = pichle page ki last row ka (value, pincode)).
+        Returns (rows, next_cursor, total_matching).
+        """
+        order = self.orders[sort, ascending]
+        start = self._after_cursor(sort, ascending, cursor) if cursor is not None else 0
+
+        if state or district or priority:
+            # Filter: matches ki sorted positions; cursor ke baad wale pehle `limit`
+            positions = np.flatnonzero(self._mask(state, district, priority)[order])
+            total = len(positions)
+            first = int(np.searchsorted(positions, start))
+            chosen = order[positions[first:first + limit]]
+        else:
+            total = len(order)
+            first = start
+            chosen = order[start:start + limit]
+
+        rows = [self._row(int(i), first + n + 1) for n, i in enumerate(chosen)]
+        next_cursor = None
+        if first + len(chosen) < total and len(chosen):
+            last = int(chosen[-1])
+            next_cursor = encode_cursor(float(self.columns[sort][last]), str(self.columns["pincode"][last]))
+        return rows, next_cursor, total
+
+    def top_per_group(self, group_by="state", k=5, sort="demand_score", priority=None):
+        """Har state/district ke top-k (ek lexsort + group ke andar rank, koi loop nahi)."""
+        c = self.columns
+        groups = c["state"] if group_by == "state" else np.char.add(np.char.add(c["state"], "|"), c["district"])
+        order = np.lexsort((c["pincode"], -c[sort], groups))  # group, phir metric desc
+        if priority:
+            order = order[self._mask(priority=priority)[order]]
+        sorted_groups = groups[order]
+        boundaries = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+        group_start = np.repeat(boundaries, np.diff(np.r_[boundaries, len(order)]))
+        rank = np.arange(len(order)) - group_start
+        keep = rank < k
+
+        result = {}
+        for i, r in zip(order[keep], rank[keep]):
+            key = str(c["state"][i]) if group_by == "state" else f"{c['state'][i]} / {c['district'][i]}"
+            result.setdefault(key, []).append(self._row(int(i), int(r) + 1))
+        return result
+
+
+def build_gap_ranking(conn, version: int) -> GapRanking:
+    """RegionStats -> column arrays (ek query) -> GapRanking."""
+    r = models.RegionStats
+    rows = conn.execute(select(*(getattr(r, c) for c in RANK_COLUMNS))).all()
+    values = list(zip(*rows)) if rows else [()] * len(RANK_COLUMNS)
+    columns = {}
+    for name, col in zip(RANK_COLUMNS, values):
+        if name in RANK_METRICS:
+            columns[name] = np.nan_to_num(np.array(col, dtype=float))
+        else:
+            columns[name] = np.array([v or "" for v in col], dtype=str)
+    return GapRanking(columns, version)
+
+
+gap_ranking = VersionedSnapshot("region_stats", build_gap_ranking, "Gap ranking")
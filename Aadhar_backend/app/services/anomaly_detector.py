@@ -0,0 +1,252 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import bindparam, delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+
+from app.models import models
+from app.models.prediction import AnomalyAlert, AnomalyState
+
+# 🚨 Streaming detector: har pincode ka EWMA mean/variance (sirf reported din, zero-fill nahi)
+EWMA_ALPHA = 0.1          # ~10 din ki yaad
+SURGE_Z = 3.0             # |z| >= 3 -> alert
+WARMUP_DAYS = 14          # Itne din se pehle koi alert nahi
+MIN_STD_MINS = 30.0       # Chhote pincodes par 2-3 extra enrolment "surge" nahi hai
+PINCODE_CHUNK = 5000      # IN (...) list ka size
+REBUILD_WINDOW_DAYS = 31
+
+STATUS_NORMAL = "Normal Flow"
+STATUS_SURGE = "High Surge Detected 🚨"
+STATUS_DROP = "Unusual Drop 📉"
+
+STATE_COLUMNS = ["pincode", "last_date", "observations", "mean", "variance",
+                 "prev_mean", "prev_variance", "last_value", "last_z", "status"]
+
+
+def _observation_select(*conditions):
+    """Stored workload (minutes) - wahi 'y' jo forecasts dekhte hain."""
+    m = models.DailyAadhaarMetrics
+    return select(m.pincode, m.state, m.district, m.date, (m.total_workload_hours * 60.0).label("value")).where(*conditions)
+
+
+def _frame(rows) -> pd.DataFrame:
+    frame = pd.DataFrame(rows, columns=["pincode", "state", "district", "date", "value"])
+    frame["date"] = pd.to_datetime(frame["date"].astype(str))
+    frame["value"] = frame["value"].astype(float)
+    return frame
+
+
+def _load_states(conn: Connection, pincodes) -> pd.DataFrame:
+    frames = []
+    for i in range(0, len(pincodes), PINCODE_CHUNK):
+        chunk = pincodes[i:i + PINCODE_CHUNK]
+        rows = conn.execute(select(*(getattr(AnomalyState, c) for c in STATE_COLUMNS))
+                            .where(AnomalyState.pincode.in_(chunk))).all()
+        frames.append(pd.DataFrame(rows, columns=STATE_COLUMNS))
+    states = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=STATE_COLUMNS)
+    states["last_date"] = pd.to_datetime(states["last_date"].astype(str))
+    return states.set_index("pincode")
+
+
+def _status(z: np.ndarray) -> np.ndarray:
+    return np.select([z >= SURGE_Z, z <= -SURGE_Z], [STATUS_SURGE, STATUS_DROP], default=STATUS_NORMAL)
+
+
+def apply_observations(conn: Connection, observed: pd.DataFrame) -> dict:
+    """
+    ⚡ Observations (pincode, state, district, date, value) ko state par lagao - har row O(1).
+    Rows pincode ke andar date order mein chalti hain; step k par har pincode ki k-th row ek
+    vectorized update hai. Last din dobara aaye (revision) to prev_* se undo karke dobara lagta hai.
+    Usse purane din yahan skip hote hain - late / partial data ke liye `replay_anomaly_states`
+    pehle un pincodes ka state hata kar history date order mein dobara chalata hai.
+    """
+    if observed.empty:
+        return {"rows": 0, "stale": 0, "alerts": 0}
+    observed = observed.sort_values(["pincode", "date"], kind="stable").reset_index(drop=True)
+    pincodes, codes = np.unique(observed["pincode"].to_numpy(dtype=str), return_inverse=True)
+    states = _load_states(conn, pincodes.tolist()).reindex(pincodes)
+
+    known = states["observations"].notna().to_numpy()
+    n = states["observations"].fillna(0).to_numpy(dtype=np.int64, copy=True)
+    mean = states["mean"].fillna(0).to_numpy(dtype=float, copy=True)
+    var = states["variance"].fillna(0).to_numpy(dtype=float, copy=True)
+    prev_mean = states["prev_mean"].to_numpy(dtype=float, copy=True)
+    prev_var = states["prev_variance"].to_numpy(dtype=float, copy=True)
+    last_date = states["last_date"].to_numpy(dtype="datetime64[ns]", copy=True)
+    last_value = states["last_value"].to_numpy(dtype=float, copy=True)
+    last_z = states["last_z"].fillna(0).to_numpy(dtype=float, copy=True)
+
+    dates = observed["date"].to_numpy(dtype="datetime64[ns]")
+    values = observed["value"].to_numpy(dtype=float)
+    stale = known[codes] & (dates < last_date[codes])
+    revised = known[codes] & (dates == last_date[codes])
+
+    # Revision: last din ka update undo (sirf ek baar per pincode - sorted hai, woh pehli row hai)
+    undo = np.unique(codes[revised])
+    mean[undo], var[undo], n[undo] = prev_mean[undo], prev_var[undo], n[undo] - 1
+    mean, var = np.nan_to_num(mean), np.nan_to_num(var)
+
+    keep = np.flatnonzero(~stale)
+    rank = observed.loc[keep].groupby("pincode", sort=False).cumcount().to_numpy()
+    z_scores = np.zeros(len(observed))
+    expected = np.zeros(len(observed))
+    for step in range(int(rank.max()) + 1 if len(rank) else 0):
+        rows = keep[rank == step]
+        p, x = codes[rows], values[rows]
+        prev_mean[p], prev_var[p] = mean[p], var[p]
+        std = np.maximum(np.sqrt(var[p]), MIN_STD_MINS)
+        z = np.where(n[p] >= WARMUP_DAYS, (x - mean[p]) / std, 0.0)
+        z_scores[rows], expected[rows] = z, mean[p]
+
+        first = n[p] == 0
+        diff = x - mean[p]
+        increment = EWMA_ALPHA * diff
+        mean[p] = np.where(first, x, mean[p] + increment)
+        var[p] = np.where(first, 0.0, (1 - EWMA_ALPHA) * (var[p] + diff * increment))
+        n[p] += 1
+        last_date[p], last_value[p], last_z[p] = dates[rows], x, z
+
+    touched = np.unique(codes[keep])
+    state_rows = pd.DataFrame({
+        "pincode": pincodes[touched],
+        "last_date": pd.to_datetime(last_date[touched]).date,
+        "observations": n[touched],
+        "mean": mean[touched],
+        "variance": var[touched],
+        "prev_mean": prev_mean[touched],
+        "prev_variance": prev_var[touched],
+        "last_value": last_value[touched],
+        "last_z": np.round(last_z[touched], 3),
+        "status": _status(last_z[touched]),
+    })
+
+    flagged = keep[np.abs(z_scores[keep]) >= SURGE_Z]
+    alerts = pd.DataFrame({
+        "pincode": observed["pincode"].to_numpy()[flagged],
+        "state": observed["state"].to_numpy()[flagged],
+        "district": observed["district"].to_numpy()[flagged],
+        "date": pd.to_datetime(dates[flagged]).date,
+        "kind": np.where(z_scores[flagged] > 0, "surge", "drop"),
+        "workload_mins": values[flagged],
+        "expected_mins": np.round(expected[flagged], 1),
+        "z_score": np.round(z_scores[flagged], 3),
+    })
+
+    insert = pg_insert if conn.dialect.name == "postgresql" else sqlite_insert
+    revised_rows = np.flatnonzero(revised)
+    if len(revised_rows):
+        # Revision ke baad purana alert galat ho sakta hai - hatao, zaroorat ho to neeche dobara banega
+        conn.execute(
+            delete(AnomalyAlert).where(AnomalyAlert.pincode == bindparam("b_pincode"),
+                                       AnomalyAlert.date == bindparam("b_date")),
+            [{"b_pincode": observed["pincode"].iat[i], "b_date": pd.Timestamp(dates[i]).date()} for i in revised_rows],
+        )
+    _upsert(conn, insert, AnomalyState, state_rows, ["pincode"])
+    _upsert(conn, insert, AnomalyAlert, alerts, ["pincode", "date"])
+    return {"rows": int(len(keep)), "stale": int(stale.sum()), "alerts": int(len(flagged))}
+
+
+def _upsert(conn: Connection, insert, model, frame: pd.DataFrame, keys):
+    if frame.empty:
+        return
+    records = frame.astype(object).where(frame.notna(), None).to_dict("records")
+    stmt = insert(model)
+    update = {c: stmt.excluded[c] for c in frame.columns if c not in keys}
+    conn.execute(stmt.on_conflict_do_update(index_elements=keys, set_=update), records)
+
+
+def _forget_pincodes(conn: Connection, pincodes) -> None:
+    for i in range(0, len(pincodes), PINCODE_CHUNK):
+        chunk = pincodes[i:i + PINCODE_CHUNK]
+        conn.execute(delete(AnomalyAlert).where(AnomalyAlert.pincode.in_(chunk)))
+        conn.execute(delete(AnomalyState).where(AnomalyState.pincode.in_(chunk)))
+
+
+def _replay_windows(conn: Connection, start, end, only_before=None, since=None) -> dict:
+    """
+    [start, end] ko REBUILD_WINDOW_DAYS ke windows mein date order se detector par lagao.
+    since diya ho to usse pehle ke din sirf `only_before` pincodes ke (baaki un dino ko dekh chuke hain).
+    """
+    m = models.DailyAadhaarMetrics
+    totals = {"rows": 0, "stale": 0, "alerts": 0}
+    start, end = pd.Timestamp(str(start)), pd.Timestamp(str(end))
+    while start <= end:
+        window_end = start + pd.Timedelta(days=REBUILD_WINDOW_DAYS - 1)
+        frame = _frame(conn.execute(_observation_select(m.date.between(start.date(), window_end.date()))).all())
+        if since is not None and start < since:
+            frame = frame[(frame["date"] >= since) | frame["pincode"].isin(only_before)]
+        for key, value in apply_observations(conn, frame).items():
+            totals[key] += value
+        start = window_end + pd.Timedelta(days=1)
+    return totals
+
+
+def replay_anomaly_states(conn: Connection, start) -> dict:
+    """
+    Loader ke end par (dirty ranges ke saath, ek transaction): `start` (sabse purana badla din) se aage
+    ka data detector par. EWMA order par tikta hai - jin pincodes ka state `start` se aage ja chuka hai
+    (category-wise load, late files, hash partitions) unka state + alerts hata kar poori history se replay.
+    Nightly append (naye din) mein aise pincodes nahi hote - sirf naye din lagte hain.
+    """
+    m = models.DailyAadhaarMetrics
+    start = pd.Timestamp(str(start))
+    end = conn.execute(select(func.max(m.date))).scalar()
+    if end is None:
+        return {"rows": 0, "stale": 0, "alerts": 0}
+    late = conn.execute(select(AnomalyState.pincode).where(AnomalyState.last_date > start.date())).scalars().all()
+    first = start
+    if late:
+        _forget_pincodes(conn, late)
+        first = min(start, pd.Timestamp(str(conn.execute(select(func.min(m.date))).scalar())))
+    totals = _replay_windows(conn, first, end, only_before=set(late), since=start)
+    print(f"🚨 Anomaly states replayed from {start.date()}: {totals['rows']} rows "
+          f"({len(late)} pincodes from full history), {totals['alerts']} alerts")
+    return totals
+
+
+def rebuild_anomaly_states(conn: Connection) -> dict:
+    """Poori history date windows mein replay karo (naya DB / legacy loader / detector settings badle)."""
+    conn.execute(delete(AnomalyAlert))
+    conn.execute(delete(AnomalyState))
+    m = models.DailyAadhaarMetrics
+    start, end = conn.execute(select(func.min(m.date), func.max(m.date))).one()
+    if start is None:
+        return {"rows": 0, "stale": 0, "alerts": 0}
+    totals = _replay_windows(conn, start, end)
+    print(f"🚨 Anomaly states rebuilt: {totals['rows']} rows, {totals['alerts']} alerts")
+    return totals
+
+
+def anomaly_status(db, pincode: str):
+    """Cheap lookup: pincode ka current status (detector ne abhi tak dekha hi nahi to None)."""
+    return db.execute(select(AnomalyState.status).where(AnomalyState.pincode == pincode)).scalar()
+
+
+def anomaly_statuses(db, pincodes) -> dict:
+    pincodes = list(pincodes)
+    statuses = {}
+    for i in range(0, len(pincodes), PINCODE_CHUNK):
+        chunk = pincodes[i:i + PINCODE_CHUNK]
+        statuses.update(db.execute(select(AnomalyState.pincode, AnomalyState.status)
+                                   .where(AnomalyState.pincode.in_(chunk))).all())
+    return statuses
+
+
+def current_surges_statement(days: int, latest, state=None, district=None, kind="surge", limit=100):
+    """Pichle `days` din ke alerts (latest alert date se), z-score ke hisaab se."""
+    a = AnomalyAlert
+    conditions = [a.kind == kind]
+    if latest is not None:
+        conditions.append(a.date > latest - pd.Timedelta(days=days).to_pytimedelta())
+    if state:
+        conditions.append(a.state == state)
+    if district:
+        conditions.append(a.district == district)
+    order = a.z_score.desc() if kind == "surge" else a.z_score.asc()
+    return (
+        select(a.pincode, a.state, a.district, a.date, a.workload_mins, a.expected_mins, a.z_score)
+        .where(*conditions)
+        .order_by(order, a.pincode)
+        .limit(limit)
+    )
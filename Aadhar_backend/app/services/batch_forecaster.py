@@ -0,0 +1,175 @@
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+
+import numpy as np
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.models import models
+from app.models.prediction import PredictionLog
+from app.services.anomaly_detector import anomaly_statuses
+from app.services.metrics_history import load_histories
+from app.services.parquet_store import parquet_store
+
+
+def list_pincodes(engine: Engine, limit: int = None):
+    m = models.DailyAadhaarMetrics
+    stmt = select(m.pincode).distinct().order_by(m.pincode)
+    if limit:
+        stmt = stmt.limit(limit)
+    with engine.connect() as conn:
+        return [row[0] for row in conn.execute(stmt)]
+
+
+def fetch_histories(engine: Engine, pincodes):
+    """
+    Chunk ke saare pincodes ki history -> [(pincode, frame)]: Parquet store ho to uska scan
+    (sirf pincode/date/workload columns), warna ek SQL query.
+    """
+    if parquet_store.ready:
+        return parquet_store.load_histories(pincodes)
+    with engine.connect() as conn:
+        return load_histories(conn, pincodes)
+
+
+def fetch_statuses(engine: Engine, pincodes) -> dict:
+    """Streaming detector ke statuses (ek lookup) - workers mein IsolationForest nahi chalana padta."""
+    with engine.connect() as conn:
+        return anomaly_statuses(conn, pincodes)
+
+
+def _forecast_chunk(chunk, statuses=None):
+    """
+    Worker process mein chalta hai: chunk ke low-volume pincodes NumPy backend par
+    ek matrix call mein, baaki Prophet fit. Anomaly status detector state se aata hai;
+    jo pincode detector ne nahi dekha sirf uska IsolationForest.
+    (Top-level function - ProcessPoolExecutor ko pickle karna padta hai.)
+    """
+    statuses = statuses or {}
+    from app.services.ai_engine import AIEngine, forecast_engines
+
+    results = []
+    engines = []
+    for pincode, frame in chunk:
+        started = time.perf_counter()
+        try:
+            engines.append((pincode, AIEngine.from_frame(frame), time.perf_counter() - started))
+        except Exception as e:
+            results.append({"pincode": pincode, "seconds": time.perf_counter() - started, "error": str(e)})
+    if not engines:
+        return results
+
+    started = time.perf_counter()
+    forecasts = forecast_engines([engine for _, engine, _ in engines])
+    # Batched forecast ka time saare pincodes mein barabar baanto
+    shared_seconds = (time.perf_counter() - started) / len(engines)
+
+    for (pincode, engine, prep_seconds), (algo_used, next_week) in zip(engines, forecasts):
+        started = time.perf_counter()
+        try:
+            status = statuses.get(pincode) or engine.detect_anomalies()
+            predicted = max(0, sum(next_week) / len(next_week))
+            results.append({
+                "pincode": pincode,
+                "predicted_workload_mins": predicted,
+                "required_counters": AIEngine.optimize_resources(predicted),
+                "anomaly_status": status,
+                "algo_used": algo_used,
+                "seconds": prep_seconds + shared_seconds + time.perf_counter() - started,
+                "error": None,
+            })
+        except Exception as e:
+            results.append({"pincode": pincode, "seconds": time.perf_counter() - started, "error": str(e)})
+    return results
+
+
+def new_run_id() -> str:
+    """UTC timestamp (microseconds tak) - string order = time order, to sabse naya run = MAX(run_id)."""
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+
+
+def _write_predictions(engine: Engine, results, run_id: str) -> int:
+    """
+    PredictionLog mein bulk insert (executemany). predicted_demand = agle 7 din ka avg workload (minutes/day).
+    Run ki saari rows ek run_id ke saath - readers naya batch purane runs se alag kar sakte hain.
+    """
+    rows = [
+        {
+            "run_id": run_id,
+            "pincode": r["pincode"],
+            "predicted_demand": int(round(r["predicted_workload_mins"])),
+            "confidence_score": None,
+            "algo_used": r["algo_used"],
+        }
+        for r in results if r["error"] is None
+    ]
+    if rows:
+        with engine.begin() as conn:
+            conn.execute(insert(PredictionLog), rows)
+    return len(rows)
+
+
+def _summary(results, elapsed, workers, chunk_size):
+    ok = [r for r in results if r["error"] is None]
+    timings = np.array([r["seconds"] for r in results]) if results else np.zeros(1)
+    slowest = sorted(results, key=lambda r: r["seconds"], reverse=True)[:5]
+    return {
+        "pincodes": len(results),
+        "succeeded": len(ok),
+        "failed": len(results) - len(ok),
+        "workers": workers,
+        "chunk_size": chunk_size,
+        "algorithms": dict(Counter(r["algo_used"] for r in ok)),
+        "total_seconds": round(elapsed, 2),
+        "pincodes_per_sec": round(len(results) / elapsed, 2) if elapsed else 0.0,
+        "fit_seconds_p50": round(float(np.percentile(timings, 50)), 3),
+        "fit_seconds_p95": round(float(np.percentile(timings, 95)), 3),
+        "fit_seconds_max": round(float(timings.max()), 3),
+        "slowest": [{"pincode": r["pincode"], "seconds": round(r["seconds"], 3)} for r in slowest],
+    }
+
+
+def run_batch_forecast(engine: Engine, workers: int = None, chunk_size: int = None, limit: int = None):
+    """
+    🏭 National batch forecast: pincodes ko chunks mein baant kar ProcessPoolExecutor par fit karo,
+    results PredictionLog mein bulk likho (ek run_id ke saath). In-flight chunks workers*2 tak limited
+    (memory bounded). Returns (per-pincode results, summary).
+    """
+    workers = workers or settings.BATCH_FORECAST_WORKERS or os.cpu_count() or 1
+    chunk_size = chunk_size or settings.BATCH_FORECAST_CHUNK_SIZE
+
+    pincodes = list_pincodes(engine, limit)
+    chunks = [pincodes[i:i + chunk_size] for i in range(0, len(pincodes), chunk_size)]
+    run_id = new_run_id()
+    print(f"🏭 Batch forecast {run_id}: {len(pincodes)} pincodes, {len(chunks)} chunks, {workers} workers")
+
+    started = time.perf_counter()
+    results = []
+    written = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for chunk in chunks:
+            pending.add(pool.submit(_forecast_chunk, fetch_histories(engine, chunk), fetch_statuses(engine, chunk)))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk_results = future.result()
+                    written += _write_predictions(engine, chunk_results, run_id)
+                    results.extend(chunk_results)
+                print(f"   Forecasted {len(results)}/{len(pincodes)} pincodes...")
+
+        for future in wait(pending).done:
+            chunk_results = future.result()
+            written += _write_predictions(engine, chunk_results, run_id)
+            results.extend(chunk_results)
+
+    summary = _summary(results, time.perf_counter() - started, workers, chunk_size)
+    summary["run_id"] = run_id
+    summary["predictions_written"] = written
+    print(f"✅ {summary['succeeded']} forecasts in {summary['total_seconds']}s "
+          f"({summary['pincodes_per_sec']} pincodes/sec, p95 fit {summary['fit_seconds_p95']}s)")
+    return results, summary
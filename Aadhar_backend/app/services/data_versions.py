@@ -0,0 +1,48 @@
+from sqlalchemy import select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models import models
+
+
+def bump_pincode_versions(conn: Connection, pincodes) -> None:
+    """
+    Ingestion batch ke saath (same transaction) in pincodes ka data version +1 karo.
+    """
+    pincodes = sorted(set(pincodes))
+    if not pincodes:
+        return
+    table = models.PincodeDataVersion.__tablename__
+    mark = "?" if conn.dialect.paramstyle == "qmark" else "%s"
+    conn.exec_driver_sql(
+        f"INSERT INTO {table} (pincode, version) VALUES ({mark}, 1) "
+        f"ON CONFLICT (pincode) DO UPDATE SET version = {table}.version + 1",
+        [(p,) for p in pincodes],
+    )
+
+
+def metrics_scopes(states) -> list:
+    """Daily metrics likhne par kaunse scopes badle: global + har affected state."""
+    return ["daily_metrics"] + [f"daily_metrics:{s}" for s in sorted(set(states)) if s]
+
+
+def bump_scope_versions(conn: Connection, scopes) -> None:
+    """Ingestion ke transaction mein scopes ka version +1 (response cache invalidation)."""
+    scopes = sorted(set(scopes))
+    if not scopes:
+        return
+    table = models.DataScopeVersion.__tablename__
+    mark = "?" if conn.dialect.paramstyle == "qmark" else "%s"
+    conn.exec_driver_sql(
+        f"INSERT INTO {table} (scope, version) VALUES ({mark}, 1) "
+        f"ON CONFLICT (scope) DO UPDATE SET version = {table}.version + 1",
+        [(s,) for s in scopes],
+    )
+
+
+def get_pincode_version(db: Session, pincode: str) -> int:
+    """Pincode ka current data version (agar kabhi bump nahi hua to 0)."""
+    version = db.execute(
+        select(models.PincodeDataVersion.version).where(models.PincodeDataVersion.pincode == pincode)
+    ).scalar()
+    return version or 0
@@ -0,0 +1,38 @@
+import numpy as np
+
+
+def lttb_indices(x, series, target: int) -> np.ndarray:
+    """
+    📉 Largest-Triangle-Three-Buckets: `target` points chuno jo chart ki shakal (spikes, dips) bachaate hain.
+    x: increasing numbers (e.g. day ordinals); series: same length wali y arrays ki list.
+    Kai series ek x-axis share karti hain - har series apni range se normalize hoti hai aur triangle
+    areas jode jaate hain, taaki ek hi set of points saari lines ke liye kaam kare.
+    Returns sorted indices (pehla + aakhri point hamesha).
+    """
+    n = len(x)
+    if target >= n or target < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.column_stack([np.asarray(s, dtype=np.float64) for s in series])
+    span = y.max(axis=0) - y.min(axis=0)
+    y = (y - y.min(axis=0)) / np.where(span > 0, span, 1.0)
+
+    # Beech ke n-2 points ko target-2 buckets mein baanto; har bucket se ek point
+    edges = np.linspace(1, n - 1, target - 1).astype(int)
+    selected = np.empty(target, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(target - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x, next_y = x[hi:edges[i + 2]].mean(), y[hi:edges[i + 2]].mean(axis=0)
+        else:
+            next_x, next_y = x[-1], y[-1]
+        # Triangle (a, candidate, next bucket ka average) ka area - sabse bada wala point rakho
+        areas = np.abs(
+            (x[a] - next_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi, None]) * (next_y - y[a])
+        ).sum(axis=1)
+        a = lo + int(np.argmax(areas))
+        selected[i + 1] = a
+    return selected
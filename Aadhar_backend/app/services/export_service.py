@@ -0,0 +1,212 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date
+
+from sqlalchemy import Date, Float, Integer, select
+
+from app.core.executor import run_cpu_bound
+from app.db.session import async_engine
+from app.models import models
+
+# 📤 Bulk export: server-side cursor + yield_per se partitions, har partition encode hoke turant flush.
+# Memory = ek partition (+ encoder buffer), poora result kabhi nahi.
+# Chhote partitions: har partition ka fetch + row processing (SQLAlchemy / aiosqlite, greenlet ke through)
+# event loop par chalta hai - sirf encoding CPU executor par jaati hai. Partition chhota = loop slice chhota,
+# to doosri requests nahi atakti
+EXPORT_BATCH_ROWS = 2_000
+PARQUET_ROW_GROUP_ROWS = 65_536   # Itni rows jama karke ek row group (chhote row groups = kharab compression)
+
+EXPORT_DATASETS = {
+    "daily_metrics": models.DailyAadhaarMetrics,
+    "region_stats": models.RegionStats,
+}
+
+EXPORT_FORMATS = {
+    # format -> (media type, file extension)
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def _parquet():
+    """pyarrow optional hai - na ho to Parquet export band (CSV / NDJSON chalte rehte hain)."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        return None
+
+
+def parquet_available() -> bool:
+    return _parquet() is not None
+
+
+def export_columns(dataset: str):
+    """Table ke saare columns, surrogate id ke bina."""
+    return [c for c in EXPORT_DATASETS[dataset].__table__.columns if c.name != "id"]
+
+
+def export_statement(dataset: str, state: str, district: str, pincode: str, year=None):
+    """
+    Dashboard wale filters ("All ..." = filter nahi). year sirf daily_metrics par (region_stats mein date nahi).
+    Order unique index ke hisaab se - SQLite ko alag sort nahi karna padta.
+    """
+    model = EXPORT_DATASETS[dataset]
+    stmt = select(*export_columns(dataset))
+    if state != "All States":
+        stmt = stmt.where(model.state == state)
+    if district != "All Districts":
+        stmt = stmt.where(model.district == district)
+    if pincode != "All Pincodes":
+        stmt = stmt.where(model.pincode == pincode)
+    if dataset == "daily_metrics":
+        if year is not None:
+            stmt = stmt.where(model.date.between(date(year, 1, 1), date(year, 12, 31)))
+        return stmt.order_by(model.date, model.pincode)
+    return stmt.order_by(model.pincode)
+
+
+class CsvEncoder:
+    def __init__(self, names):
+        self.names = names
+
+    def start(self) -> bytes:
+        return self.encode([self.names])
+
+    def encode(self, rows) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class NdjsonEncoder:
+    def __init__(self, names):
+        self.names = names
+        self._dumps = json.JSONEncoder(default=str).encode   # json.dumps(default=...) har call par naya encoder banata
+
+    def start(self) -> bytes:
+        return b""
+
+    def encode(self, rows) -> bytes:
+        names, dumps = self.names, self._dumps
+        return "".join(dumps(dict(zip(names, row))) + "\n" for row in rows).encode()
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class _ByteSink(io.RawIOBase):
+    """ParquetWriter ka file: likhe gaye bytes jama karo, har row group ke baad drain karke bhej do."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ParquetEncoder:
+    """Partitions Arrow batches mein jama, PARQUET_ROW_GROUP_ROWS par ek row group; footer finish() par."""
+    ARROW_TYPES = {Integer: "int64", Float: "float64", Date: "date32"}
+
+    def __init__(self, columns):
+        pa = _parquet()
+        self.pa = pa
+        self.schema = pa.schema([
+            (c.name, next((getattr(pa, t)() for k, t in self.ARROW_TYPES.items() if isinstance(c.type, k)), pa.string()))
+            for c in columns
+        ])
+        self.sink = _ByteSink()
+        self.writer = pa.parquet.ParquetWriter(self.sink, self.schema, compression="zstd")
+        self.pending = []
+        self.pending_rows = 0
+
+    def start(self) -> bytes:
+        return self.sink.drain()
+
+    def _flush(self):
+        if self.pending:
+            self.writer.write_table(self.pa.Table.from_batches(self.pending, schema=self.schema),
+                                    row_group_size=PARQUET_ROW_GROUP_ROWS)
+            self.pending, self.pending_rows = [], 0
+
+    def encode(self, rows) -> bytes:
+        values = list(zip(*rows)) if rows else [[] for _ in self.schema]
+        self.pending.append(self.pa.RecordBatch.from_arrays(
+            [self.pa.array(v, type=f.type) for v, f in zip(values, self.schema)], schema=self.schema
+        ))
+        self.pending_rows += len(rows)
+        if self.pending_rows >= PARQUET_ROW_GROUP_ROWS:
+            self._flush()
+        return self.sink.drain()
+
+    def finish(self) -> bytes:
+        self._flush()
+        self.writer.close()
+        return self.sink.drain()
+
+
+class GzipEncoder:
+    """Kisi bhi encoder ke output ko on-the-fly gzip (ek hi .gz stream)."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.compressor = zlib.compressobj(6, zlib.DEFLATED, 31)   # wbits 31 = gzip header/trailer
+
+    def start(self) -> bytes:
+        return self.compressor.compress(self.inner.start())
+
+    def encode(self, rows) -> bytes:
+        return self.compressor.compress(self.inner.encode(rows))
+
+    def finish(self) -> bytes:
+        return self.compressor.compress(self.inner.finish()) + self.compressor.flush()
+
+
+def build_encoder(dataset: str, fmt: str, gzip: bool):
+    columns = export_columns(dataset)
+    if fmt == "parquet":
+        encoder = ParquetEncoder(columns)
+    elif fmt == "ndjson":
+        encoder = NdjsonEncoder([c.name for c in columns])
+    else:
+        encoder = CsvEncoder([c.name for c in columns])
+    return GzipEncoder(encoder) if gzip else encoder
+
+
+async def stream_export(stmt, encoder):
+    """
+    Async reader connection par server-side cursor (Core rows - ORM loading ka overhead nahi);
+    encoding CPU executor par. Connection stream ke andar - response khatam hone tak khula.
+    """
+    async with async_engine.connect() as conn:
+        header = encoder.start()
+        if header:
+            yield header
+        result = await conn.stream(stmt.execution_options(yield_per=EXPORT_BATCH_ROWS))
+        async for partition in result.partitions():
+            chunk = await run_cpu_bound(encoder.encode, partition)
+            if chunk:
+                yield chunk
+        yield encoder.finish()
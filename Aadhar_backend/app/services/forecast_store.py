@@ -0,0 +1,206 @@
+import json
+import os
+import socket
+import threading
+import time
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models import models
+from app.models.prediction import ForecastFailure, ForecastModel, SchedulerLease
+from app.services.ai_engine import AIEngine
+from app.services.anomaly_detector import anomaly_status
+from app.services.data_versions import get_pincode_version
+from app.services.metrics_history import load_history_arrays
+
+
+def fit_and_store(db: Session, pincode: str, version: int = None):
+    """
+    Pincode ka model fit karo aur cache mein likho (forecast + anomaly status ke saath).
+    `version` fit se *pehle* padha jaata hai - fit ke dauraan naya data aaye to agle round refit hoga.
+    """
+    if version is None:
+        version = get_pincode_version(db, pincode)
+
+    history = load_history_arrays(db, pincode)
+    if history is None:
+        return None
+
+    started = time.perf_counter()
+    engine = AIEngine.from_arrays(history)
+    _, next_week = engine.fit_forecast()
+    # Streaming detector ka status (lookup); detector ne pincode nahi dekha to purana IsolationForest
+    status = anomaly_status(db, pincode) or engine.detect_anomalies()
+    fit_seconds = time.perf_counter() - started
+
+    values = {
+        "data_version": version,
+        "algo_used": engine.algo_used,
+        "forecast_json": json.dumps(next_week),
+        "predicted_workload_mins": max(0, sum(next_week) / len(next_week)),
+        "anomaly_status": status,
+        "fit_seconds": round(fit_seconds, 3),
+    }
+    # Upsert: scheduler aur on-demand request same pincode ek saath fit kar sakte hain
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(ForecastModel).values(pincode=pincode, **values)
+    db.execute(stmt.on_conflict_do_update(index_elements=["pincode"], set_={**values, "fitted_at": func.now()}))
+    db.execute(delete(ForecastFailure).where(ForecastFailure.pincode == pincode))
+    db.commit()
+    return db.get(ForecastModel, pincode, populate_existing=True)
+
+
+def get_forecast(db: Session, pincode: str, allow_fit: bool = True):
+    """
+    ⚡ Cache lookup. Returns (entry, cache_hit).
+    Hit = stored data_version pincode ke current version ke barabar hai.
+    Miss par (allow_fit=True) on-demand fit hota hai.
+    """
+    version = get_pincode_version(db, pincode)
+    entry = db.get(ForecastModel, pincode)
+    if entry is not None and entry.data_version == version:
+        return entry, True
+    if not allow_fit:
+        return None, False
+    return fit_and_store(db, pincode, version), False
+
+
+def stale_pincodes(db: Session, limit: int):
+    """
+    Woh pincodes jinka data model fit hone ke baad badal gaya (ya model hai hi nahi).
+    Isi version par fail hue pincodes backoff tak skip - warna har round LIMIT ke aage wahi baithe rehte.
+    """
+    versions = models.PincodeDataVersion
+    failure = ForecastFailure
+    backing_off = and_(failure.data_version == versions.version, failure.retry_after > time.time())
+    stmt = (
+        select(versions.pincode, versions.version)
+        .outerjoin(ForecastModel, ForecastModel.pincode == versions.pincode)
+        .outerjoin(failure, failure.pincode == versions.pincode)
+        .where(or_(ForecastModel.pincode.is_(None), ForecastModel.data_version != versions.version))
+        .where(or_(failure.pincode.is_(None), ~backing_off))
+        .limit(limit)
+    )
+    return db.execute(stmt).all()
+
+
+def record_failure(db: Session, pincode: str, version: int, error: str) -> None:
+    """Lagataar failures par exponential backoff (same data version); naya version -> ginti 1 se."""
+    entry = db.get(ForecastFailure, pincode)
+    failures = entry.failures + 1 if entry is not None and entry.data_version == version else 1
+    backoff = min(settings.FORECAST_FAILURE_BACKOFF_SECONDS * 2 ** (failures - 1),
+                  settings.FORECAST_FAILURE_MAX_BACKOFF_SECONDS)
+    if entry is None:
+        entry = ForecastFailure(pincode=pincode)
+        db.add(entry)
+    entry.data_version = version
+    entry.failures = failures
+    entry.last_error = error[:500]
+    entry.retry_after = time.time() + backoff
+    db.commit()
+
+
+def refresh_stale_forecasts(limit: int = None) -> int:
+    """Ek round: stale pincodes refit karo. Returns kitne refit hue."""
+    db = SessionLocal()
+    refreshed = 0
+    try:
+        for pincode, version in stale_pincodes(db, limit or settings.FORECAST_REFRESH_BATCH_SIZE):
+            try:
+                if fit_and_store(db, pincode, version) is not None:
+                    refreshed += 1
+                else:
+                    record_failure(db, pincode, version, "No history")
+            except Exception as e:
+                db.rollback()
+                print(f"⚠️ Forecast refit failed for {pincode}: {e}")
+                record_failure(db, pincode, version, str(e))
+    finally:
+        db.close()
+
+    if refreshed:
+        print(f"🔮 Refitted {refreshed} stale forecasts")
+    return refreshed
+
+
+LEASE_NAME = "forecast_scheduler"
+
+
+def acquire_lease(name: str, holder: str, ttl_seconds: float) -> bool:
+    """
+    DB lease (saare workers / hosts ek hi DB dekhte hain): khaali, expired ya apna ho to le lo / badhao.
+    Holder process mar jaaye to ttl ke baad koi aur le leta hai.
+    """
+    now = time.time()
+    lease = SchedulerLease
+    with SessionLocal() as db:
+        taken = db.execute(
+            update(lease)
+            .where(lease.name == name, or_(lease.holder == holder, lease.expires_at < now))
+            .values(holder=holder, expires_at=now + ttl_seconds)
+        ).rowcount
+        if not taken:
+            insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+            taken = db.execute(
+                insert(lease).values(name=name, holder=holder, expires_at=now + ttl_seconds)
+                .on_conflict_do_nothing(index_elements=["name"])
+            ).rowcount
+        db.commit()
+    return bool(taken)
+
+
+def release_lease(name: str, holder: str) -> None:
+    with SessionLocal() as db:
+        db.execute(delete(SchedulerLease).where(SchedulerLease.name == name, SchedulerLease.holder == holder))
+        db.commit()
+
+
+class ForecastScheduler:
+    """
+    Background thread: har interval par stale pincodes refit karta hai,
+    taaki request path ko sirf cache padhna pade.
+    Har worker ki lifespan ise start karti hai, lekin refit sirf lease holder karta hai (baaki wait).
+    """
+
+    def __init__(self, interval_seconds: int = None):
+        self.interval_seconds = interval_seconds or settings.FORECAST_REFRESH_INTERVAL_SECONDS
+        self.holder = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="forecast-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            try:
+                release_lease(LEASE_NAME, self.holder)
+            except Exception as e:
+                print(f"⚠️ Forecast scheduler lease release failed: {e}")
+
+    def _run(self):
+        # Lease ek round (poora batch fit) se lamba chalna chahiye; har round par renew
+        ttl = 3 * self.interval_seconds
+        while not self._stop.is_set():
+            try:
+                # Poora batch bhar ke aaya to turant agla round, warna interval ka wait
+                if acquire_lease(LEASE_NAME, self.holder, ttl) and \
+                        refresh_stale_forecasts() >= settings.FORECAST_REFRESH_BATCH_SIZE:
+                    continue
+            except Exception as e:
+                print(f"⚠️ Forecast scheduler error: {e}")
+            self._stop.wait(self.interval_seconds)
+
+
+forecast_scheduler = ForecastScheduler()
@@ -0,0 +1,259 @@
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+
+from app.core.config import BACKEND_DIR, settings
+from app.models import models
+from app.services.snapshots import VersionedSnapshot
+
+GEO_SCOPE = "region_stats"
+FUZZY_MIN_SCORE = 0.35  # Isse kam trigram overlap = match nahi
+
+
+def _canonical(names: pd.Series, keys) -> pd.Series:
+    """Case/spacing alag ho ("CENTRAL DELHI" vs "Central Delhi") to group ki pehli spelling rakho."""
+    return names.groupby(keys, sort=False).transform("first")
+
+
+def _prefix_range(sorted_keys: np.ndarray, prefix: str):
+    """Sorted (lowercase) keys mein prefix wali range - do binary searches."""
+    lo = np.searchsorted(sorted_keys, prefix, side="left")
+    hi = np.searchsorted(sorted_keys, prefix + "\uffff", side="left")
+    return int(lo), int(hi)
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {_normalize(text)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    🔤 Fuzzy name search: trigram -> entity ids (CSR postings).
+    Query ke trigrams ki postings jod kar np.bincount = har naam ke shared trigrams,
+    score = Dice (2 * shared / (query grams + naam grams)). Koi LIKE '%x%' scan nahi.
+    """
+
+    def __init__(self, names):
+        grams_per_name = [sorted(_trigrams(n)) for n in names]
+        self.gram_counts = np.array([len(g) for g in grams_per_name], dtype=np.int32)
+
+        pairs = sorted((g, i) for i, grams in enumerate(grams_per_name) for g in grams)
+        all_grams = np.array([g for g, _ in pairs], dtype="<U3")
+        self.postings = np.array([i for _, i in pairs], dtype=np.int32)
+        self.grams, starts = np.unique(all_grams, return_index=True)
+        self.offsets = np.append(starts, len(all_grams)).astype(np.int32)
+
+    def scores(self, query: str) -> np.ndarray:
+        grams = np.array(sorted(_trigrams(query)), dtype="<U3")
+        if not len(grams) or not len(self.grams):
+            return np.zeros(len(self.gram_counts))
+        pos = np.searchsorted(self.grams, grams)
+        found = pos < len(self.grams)
+        found[found] = self.grams[pos[found]] == grams[found]
+        pos = pos[found]
+        if not len(pos):
+            return np.zeros(len(self.gram_counts))
+        ids = np.concatenate([self.postings[self.offsets[p]:self.offsets[p + 1]] for p in pos])
+        shared = np.bincount(ids, minlength=len(self.gram_counts))
+        return 2 * shared / (len(grams) + self.gram_counts)
+
+
+class GeoIndex:
+    """
+    🗺️ State -> District -> Pincode hierarchy, sorted arrays + CSR offsets mein.
+    states[i] ke districts = districts[state_offsets[i]:state_offsets[i+1]],
+    districts[j] ke pincodes = pincodes[district_offsets[j]:district_offsets[j+1]].
+    """
+
+    def __init__(self, frame: pd.DataFrame, version: int = 0):
+        self.version = version
+        frame = frame.sort_values(["state", "district", "pincode"], kind="stable")
+
+        state_codes, states = pd.factorize(frame["state"], sort=True)
+        pair = pd.MultiIndex.from_arrays([state_codes, frame["district"].to_numpy()])
+        district_codes, district_pairs = pd.factorize(pair, sort=True)
+
+        self.states = np.asarray(states, dtype=str)
+        self.districts = np.asarray(district_pairs.get_level_values(1), dtype=str)
+        self.district_state = np.asarray(district_pairs.get_level_values(0), dtype=np.int32)
+        self.pincodes = frame["pincode"].to_numpy(dtype=str)
+        self.pincode_district = district_codes.astype(np.int32)
+
+        self.state_offsets = np.searchsorted(self.district_state, np.arange(len(self.states) + 1)).astype(np.int32)
+        self.district_offsets = np.searchsorted(self.pincode_district, np.arange(len(self.districts) + 1)).astype(np.int32)
+        self.state_ids = {name: i for i, name in enumerate(self.states.tolist())}
+
+        # District naam -> district ids (same naam alag states mein ho sakta hai)
+        order = np.argsort(self.districts, kind="stable")
+        self._district_names_sorted = self.districts[order]
+        self._district_order = order.astype(np.int32)
+
+        # Autocomplete: lowercase sorted keys + original positions
+        state_keys = np.char.lower(self.states)
+        state_order = np.argsort(state_keys, kind="stable")
+        self._state_keys, self._state_order = state_keys[state_order], state_order.astype(np.int32)
+        district_keys = np.char.lower(self.districts)
+        district_order = np.argsort(district_keys, kind="stable")
+        self._district_keys, self._district_key_order = district_keys[district_order], district_order.astype(np.int32)
+        pincode_order = np.argsort(self.pincodes, kind="stable")
+        self._pincode_keys, self._pincode_order = self.pincodes[pincode_order], pincode_order.astype(np.int32)
+
+        # Fuzzy: states + districts ek hi trigram index mein (id < n_states -> state)
+        self._names = TrigramIndex(self.states.tolist() + self.districts.tolist())
+
+    # --- Filter endpoints ---
+
+    def state_list(self):
+        return self.states.tolist()
+
+    def district_list(self, state: str):
+        i = self.state_ids.get(state)
+        if i is None:
+            return []
+        return self.districts[self.state_offsets[i]:self.state_offsets[i + 1]].tolist()
+
+    def _district_ids(self, district: str):
+        lo = np.searchsorted(self._district_names_sorted, district, side="left")
+        hi = np.searchsorted(self._district_names_sorted, district, side="right")
+        return self._district_order[lo:hi]
+
+    def pincode_list(self, district: str, state: str = None):
+        ids = self._district_ids(district)
+        if state is not None:
+            i = self.state_ids.get(state)
+            ids = ids[self.district_state[ids] == i] if i is not None else ids[:0]
+        if len(ids) == 1:
+            j = ids[0]
+            return self.pincodes[self.district_offsets[j]:self.district_offsets[j + 1]].tolist()
+        # Bina state ke same naam wale districts - purane DISTINCT ORDER BY jaisa merged list
+        parts = [self.pincodes[self.district_offsets[j]:self.district_offsets[j + 1]] for j in ids]
+        return np.unique(np.concatenate(parts)).tolist() if parts else []
+
+    # --- Autocomplete ---
+
+    def search_prefix(self, query: str, limit: int = 10):
+        """Prefix match: states, phir districts, phir pincodes (har ek sorted)."""
+        prefix = query.strip().lower()
+        if not prefix:
+            return []
+        results = []
+
+        lo, hi = _prefix_range(self._state_keys, prefix)
+        for i in self._state_order[lo:min(hi, lo + limit)]:
+            results.append({"type": "state", "state": str(self.states[i])})
+
+        lo, hi = _prefix_range(self._district_keys, prefix)
+        for j in self._district_key_order[lo:min(hi, lo + limit - len(results))]:
+            results.append({"type": "district", "state": str(self.states[self.district_state[j]]),
+                            "district": str(self.districts[j])})
+
+        if prefix.isdigit():
+            lo, hi = _prefix_range(self._pincode_keys, prefix)
+            for k in self._pincode_order[lo:min(hi, lo + limit - len(results))]:
+                j = self.pincode_district[k]
+                results.append({"type": "pincode", "state": str(self.states[self.district_state[j]]),
+                                "district": str(self.districts[j]), "pincode": str(self.pincodes[k])})
+        return results[:limit]
+
+    def _entity(self, entity_id: int):
+        if entity_id < len(self.states):
+            return {"type": "state", "state": str(self.states[entity_id])}
+        j = entity_id - len(self.states)
+        return {"type": "district", "state": str(self.states[self.district_state[j]]), "district": str(self.districts[j])}
+
+    def search(self, query: str, limit: int = 10, kind: str = None):
+        """
+        🔎 Ranked search: exact naam (1.0) > prefix (0.9) / pincode prefix > trigram fuzzy (Dice score).
+        "Bangalore Urban" likho to "Bengaluru Urban" bhi mil jaata hai.
+        """
+        query = query.strip()
+        best = {}
+
+        def add(item, score):
+            key = (item["type"], item["state"], item.get("district"), item.get("pincode"))
+            if (kind is None or item["type"] == kind) and score > best.get(key, (0,))[0]:
+                best[key] = (score, item)
+
+        normalized = _normalize(query)
+        for item in self.search_prefix(query, limit * 2):
+            if item["type"] == "pincode":
+                add(item, round(0.5 + 0.5 * len(query) / max(len(item["pincode"]), 1), 3))
+            else:
+                name = item.get("district", item["state"])
+                add(item, 1.0 if _normalize(name) == normalized else 0.9)
+
+        if not query.isdigit():
+            scores = self._names.scores(query)
+            candidates = np.flatnonzero(scores >= FUZZY_MIN_SCORE)
+            if len(candidates) > limit * 2:
+                candidates = candidates[np.argpartition(-scores[candidates], limit * 2)[:limit * 2]]
+            for entity_id in candidates:
+                add(self._entity(int(entity_id)), round(float(scores[entity_id]) * 0.85, 3))
+
+        ranked = sorted(best.values(), key=lambda pair: (-pair[0], pair[1]["state"], pair[1].get("district", "")))
+        return [{**item, "score": score} for score, item in ranked[:limit]]
+
+    def memory_report(self):
+        arrays = {name: value for name, value in vars(self).items() if isinstance(value, np.ndarray)}
+        arrays.update({f"names.{name}": value for name, value in vars(self._names).items()})
+        array_bytes = sum(a.nbytes for a in arrays.values())
+        dict_bytes = sys.getsizeof(self.state_ids) + sum(sys.getsizeof(k) for k in self.state_ids)
+        return {
+            "version": self.version,
+            "states": len(self.states),
+            "districts": len(self.districts),
+            "pincodes": len(self.pincodes),
+            "array_bytes": int(array_bytes),
+            "dict_bytes": int(dict_bytes),
+            "total_mb": round((array_bytes + dict_bytes) / 1e6, 3),
+            "arrays": {name: int(a.nbytes) for name, a in arrays.items()},
+        }
+
+
+def load_hierarchy_frame(conn) -> pd.DataFrame:
+    """
+    region_stats (data wale pincodes) + pincode-dataset.csv (India Post directory) ka union.
+    Same pincode dono mein ho to region_stats jeet-ta hai.
+    """
+    r = models.RegionStats
+    rows = conn.execute(select(r.state, r.district, r.pincode)).all()
+    frames = [pd.DataFrame(rows, columns=["state", "district", "pincode"], dtype=str)]
+
+    csv_path = settings.GEO_PINCODE_CSV and BACKEND_DIR / settings.GEO_PINCODE_CSV   # Absolute path waisa hi rehta hai
+    if csv_path and not csv_path.exists():
+        print(f"⚠️ Geo index: {csv_path} nahi mila - sirf region_stats ke pincodes")
+    elif csv_path:
+        directory = pd.read_csv(csv_path, dtype=str).rename(
+            columns={"StateName": "state", "District": "district", "Pincode": "pincode"}
+        )
+        frames.append(directory[["state", "district", "pincode"]])
+
+    frame = pd.concat(frames, ignore_index=True).dropna()
+    for col in ("state", "district", "pincode"):
+        frame[col] = frame[col].str.strip()
+    frame = frame[(frame["state"] != "") & (frame["district"] != "") & (frame["pincode"] != "")]
+    frame = frame.drop_duplicates("pincode", keep="first")
+
+    state_key = frame["state"].str.casefold()
+    frame["state"] = _canonical(frame["state"], state_key)
+    frame["district"] = _canonical(frame["district"], [state_key, frame["district"].str.casefold()])
+    return frame.reset_index(drop=True)
+
+
+def build_geo_index(conn, version: int) -> GeoIndex:
+    index = GeoIndex(load_hierarchy_frame(conn), version)
+    report = index.memory_report()
+    print(f"🗺️ Geo index: {report['states']} states, {report['districts']} districts, "
+          f"{report['pincodes']} pincodes, {report['total_mb']} MB")
+    return index
+
+
+geo_index = VersionedSnapshot(GEO_SCOPE, build_geo_index, "Geo index")
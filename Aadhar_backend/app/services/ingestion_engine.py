@@ -0,0 +1,283 @@
+import io
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, literal, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection, Engine
+
+from app.models import models
+from app.services.data_versions import bump_pincode_versions, bump_scope_versions, metrics_scopes
+from app.services.rollup_service import mark_dirty
+from app.services.workload_weights import workload_minutes, workload_sql
+
+# 🗂️ Source CSV column -> DailyAadhaarMetrics column
+# (enrolment / biometric / demographic teeno categories ka mapping)
+SOURCE_COLUMN_MAP = {
+    "enrol_0_5": "age_0_5",
+    "enrol_5_17": "age_5_17",
+    "enrol_18_plus": "age_18_greater",
+    "bio_update_5_17": "bio_age_5_17",
+    "bio_update_17_plus": "bio_age_17_",
+    "demo_update_5_17": "demo_age_5_17",
+    "demo_update_17_plus": "demo_age_17_",
+}
+
+METRIC_COLUMNS = list(SOURCE_COLUMN_MAP.keys())
+
+# Insert order (id auto-increment hai, isliye skip)
+INSERT_COLUMNS = ["date", "state", "district", "pincode"] + METRIC_COLUMNS + ["total_workload_hours"]
+
+
+MERGE_KEYS = ["date", "state", "district", "pincode"]
+KEY_COLUMNS = ["date", "pincode"]
+
+# Har source category sirf apne columns ki maalik hai (incremental upsert mein)
+CATEGORY_COLUMNS = {
+    "enrolment": ["enrol_0_5", "enrol_5_17", "enrol_18_plus"],
+    "biometric": ["bio_update_5_17", "bio_update_17_plus"],
+    "demographic": ["demo_update_5_17", "demo_update_17_plus"],
+}
+
+
+def clean_source_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Column cleaning: naam lowercase/strip, aur pincode se '.0' hatao.
+    """
+    df.columns = [c.strip().lower() for c in df.columns]
+    if "pincode" in df.columns:
+        df["pincode"] = df["pincode"].astype(str).str.replace(".0", "", regex=False)
+    return df
+
+
+def merge_categories(df_enrol: pd.DataFrame, df_bio: pd.DataFrame, df_demo: pd.DataFrame) -> pd.DataFrame:
+    """
+    Teeno categories ko (Date + Location) par jodta hai.
+    """
+    # Pehle Enrolment aur Bio
+    merged_df = pd.merge(df_enrol, df_bio, on=MERGE_KEYS, how="outer").fillna(0)
+
+    # Phir Demographic
+    return pd.merge(merged_df, df_demo, on=MERGE_KEYS, how="outer").fillna(0)
+
+
+def parse_source_dates(values: pd.Series) -> pd.Series:
+    """
+    UIDAI CSV ki DD-MM-YYYY dates -> datetime (ek hi vectorized pass).
+    Jo format match na ho unhe dayfirst parsing se dobara try karo; phir bhi na bane to NaT.
+    """
+    raw = values.astype(str).str.strip()
+    parsed = pd.to_datetime(raw, format="%d-%m-%Y", errors="coerce")
+    retry = parsed.isna() & values.notna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(raw[retry], dayfirst=True, errors="coerce", format="mixed")
+    return parsed
+
+
+def _int_column(df: pd.DataFrame, source_col: str) -> np.ndarray:
+    """
+    Row-wise `int(float(val))` ka vectorized version.
+    Jo value number nahi hai (ya column hi nahi hai) woh 0 ban jaati hai.
+    """
+    if source_col not in df.columns:
+        return np.zeros(len(df), dtype=np.int64)
+    values = pd.to_numeric(df[source_col], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    values = np.where(np.isfinite(values), values, 0.0)
+    return np.trunc(values).astype(np.int64)
+
+
+def build_metrics_frame(final_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Merged enrolment/biometric/demographic frame ko ek hi pass mein
+    DailyAadhaarMetrics ke columns mein convert karta hai (no iterrows).
+    """
+    pincode = final_df["pincode"].astype(str).str.strip()
+    dates = parse_source_dates(final_df["date"])
+    valid = (pincode != "") & (pincode.str.lower() != "nan") & dates.notna()
+    df = final_df.loc[valid.to_numpy()]
+    pincode = pincode[valid]
+
+    out = pd.DataFrame({
+        "date": dates[valid].dt.strftime("%Y-%m-%d").to_numpy(),
+        "state": df["state"].astype(str).str.title().to_numpy() if "state" in df.columns else "",
+        "district": df["district"].astype(str).str.title().to_numpy() if "district" in df.columns else "",
+        "pincode": pincode.to_numpy(),
+    })
+
+    for col, source_col in SOURCE_COLUMN_MAP.items():
+        out[col] = _int_column(df, source_col)
+
+    # Workload weights module ka NumPy kernel (SQL backfill wala hi formula)
+    out["total_workload_hours"] = workload_minutes(out) / 60
+    return out
+
+
+def dedupe_metrics_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ek hi batch mein same (date, pincode) do baar ho to unhe jod do - rows drop nahi hoti, har
+    metric (aur workload) ka sum; state / district pehli row ka. Asli CSVs mein same key district
+    spelling alag hone se kai baar aati hai, to fresh load ka total purane 4-column data jitna hi.
+    (Postgres ka ON CONFLICT ek row ko ek statement mein do baar update nahi karta.)
+    """
+    if not frame.duplicated(KEY_COLUMNS).any():
+        return frame
+    agg = {c: "sum" for c in METRIC_COLUMNS + ["total_workload_hours"]}
+    agg.update({"state": "first", "district": "first"})
+    return frame.groupby(KEY_COLUMNS, as_index=False, sort=False).agg(agg)[INSERT_COLUMNS]
+
+
+def _upsert_clause(columns, accumulate: bool = False) -> str:
+    """
+    ON CONFLICT (date, pincode): sirf is load ki categories ke columns update karo.
+    Workload baaki columns ki purani value + nayi values se dobara banta hai.
+    (Naye row mein baaki categories 0 jaati hain - raw INSERT mein ORM defaults nahi lagte.)
+    accumulate=True -> counts jodo (c = c + excluded.c): same key kai chunks / files mein aa sakti hai
+    (district ki spelling alag), isliye chunk size se total nahi badalna chahiye.
+    """
+    table = models.DailyAadhaarMetrics.__tablename__
+    updates = [f"{c} = excluded.{c}" for c in ["state", "district"]]
+    if accumulate:
+        updates += [f"{c} = {table}.{c} + excluded.{c}" for c in columns]
+        workload = workload_sql(lambda c: f"({table}.{c} + excluded.{c})" if c in columns else f"{table}.{c}")
+    else:
+        updates += [f"{c} = excluded.{c}" for c in columns]
+        workload = workload_sql(lambda c: f"{'excluded' if c in columns else table}.{c}")
+    updates.append(f"total_workload_hours = ({workload}) / 60.0")
+    return f"ON CONFLICT (date, pincode) DO UPDATE SET {', '.join(updates)}"
+
+
+def _copy_upsert_postgres(conn: Connection, frame: pd.DataFrame, columns, accumulate: bool = False) -> None:
+    """Postgres ka native bulk path: COPY staging table mein, phir INSERT ... SELECT ... ON CONFLICT."""
+    table = models.DailyAadhaarMetrics.__tablename__
+    cols = ", ".join(INSERT_COLUMNS)
+
+    conn.exec_driver_sql(
+        f"CREATE TEMP TABLE IF NOT EXISTS _stage_metrics (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+    )
+    buffer = io.StringIO()
+    frame[INSERT_COLUMNS].to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+
+    raw = conn.connection.driver_connection
+    with raw.cursor() as cursor:
+        cursor.copy_expert(f"COPY _stage_metrics ({cols}) FROM STDIN WITH (FORMAT csv)", buffer)
+    conn.exec_driver_sql(
+        f"INSERT INTO {table} ({cols}) SELECT {cols} FROM _stage_metrics {_upsert_clause(columns, accumulate)}"
+    )
+
+
+def _executemany_upsert(conn: Connection, frame: pd.DataFrame, columns, accumulate: bool = False) -> None:
+    """SQLite ke liye DBAPI executemany (plain tuples) + ON CONFLICT upsert."""
+    table = models.DailyAadhaarMetrics.__tablename__
+    mark = "?" if conn.dialect.paramstyle == "qmark" else "%s"
+    sql = (
+        f"INSERT INTO {table} ({', '.join(INSERT_COLUMNS)}) "
+        f"VALUES ({', '.join([mark] * len(INSERT_COLUMNS))}) {_upsert_clause(columns, accumulate)}"
+    )
+
+    # .tolist() numpy types ko native Python int/float bana deta hai (sqlite3 numpy nahi samajhta)
+    rows = list(zip(*(frame[c].tolist() for c in INSERT_COLUMNS)))
+    conn.exec_driver_sql(sql, rows)
+
+
+def upsert_metrics_frame(engine: Engine, frame: pd.DataFrame, columns=None,
+                         batch_size: int = 50000, on_batch=None, accumulate: bool = False) -> int:
+    """
+    Columnar frame ko batches mein upsert karta hai (dobara chalane par rows double nahi hoti).
+    accumulate=True -> existing counts mein jodta hai; rerun idempotent tabhi hai jab `on_batch`
+    checkpoint likhe (incremental loader) - committed batch dobara nahi aata.
+    Har batch ek transaction hai; `on_batch(conn, written)` usi transaction mein chalta hai
+    (manifest checkpoint ke liye). Batch ki date range dirty mark hoti hai (rollups + anomaly
+    detector loader ke end par `refresh_dirty_rollups` mein), uske pincodes (aur states ke
+    cache scopes) ka data version badhta hai.
+    """
+    columns = list(columns or METRIC_COLUMNS)
+    frame = dedupe_metrics_frame(frame)
+    written = 0
+    for start in range(0, len(frame), batch_size):
+        batch = frame.iloc[start:start + batch_size]
+        with engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                _copy_upsert_postgres(conn, batch, columns, accumulate)
+            else:
+                _executemany_upsert(conn, batch, columns, accumulate)
+            # Rollups ke liye affected dates + forecasts ke liye data versions (same transaction)
+            mark_dirty(conn, batch["date"].min(), batch["date"].max())
+            bump_pincode_versions(conn, batch["pincode"].tolist())
+            bump_scope_versions(conn, metrics_scopes(batch["state"].unique()))
+            written += len(batch)
+            if on_batch:
+                on_batch(conn, written)
+        print(f"   Saved {written} records...")
+    return written
+
+
+def reset_category(conn: Connection, columns) -> None:
+    """
+    Accumulating load ka undo: category ke columns 0 aur workload dobara (poori date range dirty,
+    saare pincodes / scopes ke versions bump). Manifest entries bhi usi transaction mein hatao.
+    """
+    m = models.DailyAadhaarMetrics
+    table = m.__tablename__
+    start, end = conn.execute(select(func.min(m.date), func.max(m.date))).one()
+    if start is not None:
+        workload = workload_sql(lambda c: "0" if c in columns else c)
+        zeroed = ", ".join(f"{c} = 0" for c in columns)
+        conn.exec_driver_sql(f"UPDATE {table} SET {zeroed}, total_workload_hours = ({workload}) / 60.0")
+        mark_dirty(conn, start, end)
+        bump_pincode_versions(conn, conn.execute(select(m.pincode).distinct()).scalars().all())
+        bump_scope_versions(conn, metrics_scopes(conn.execute(select(m.state).distinct()).scalars().all()))
+
+
+def category_has_data(conn: Connection, columns) -> bool:
+    """Table mein is category ka koi non-zero count hai? (manifest ke bina load hua purana data pakadne ke liye)"""
+    m = models.DailyAadhaarMetrics
+    return conn.execute(
+        select(literal(1)).where(or_(*(getattr(m, c) != 0 for c in columns))).limit(1)
+    ).first() is not None
+
+
+def insert_new_regions(engine: Engine, frame: pd.DataFrame, on_batch=None) -> int:
+    """
+    RegionStats mein sirf naye pincodes daalo (ON CONFLICT (pincode) DO NOTHING).
+    Pehle wala record jeet-ta hai, bilkul purane `existing_pincodes` set ki tarah -
+    bas ab poori table Python mein load nahi karni padti.
+    """
+    table = models.RegionStats.__table__
+    records = frame.to_dict("records")
+    added = 0
+    with engine.begin() as conn:
+        if records:
+            insert = pg_insert if conn.dialect.name == "postgresql" else sqlite_insert
+            stmt = insert(table).on_conflict_do_nothing(index_elements=["pincode"])
+            added = max(conn.execute(stmt, records).rowcount, 0)
+        if added:
+            bump_scope_versions(conn, ["region_stats"])
+        if on_batch:
+            on_batch(conn, len(records))
+    return added
+
+
+def ingest_columnar(engine: Engine, final_df: pd.DataFrame, batch_size: int = 50000) -> dict:
+    """
+    🚀 Columnar ingestion: frame build (NumPy) + bulk write, aur throughput report.
+    """
+    started = time.perf_counter()
+    frame = build_metrics_frame(final_df)
+    built = time.perf_counter()
+
+    written = upsert_metrics_frame(engine, frame, batch_size=batch_size)
+    finished = time.perf_counter()
+
+    elapsed = finished - started
+    stats = {
+        "rows": written,
+        "build_seconds": round(built - started, 3),
+        "write_seconds": round(finished - built, 3),
+        "total_seconds": round(elapsed, 3),
+        "rows_per_sec": round(written / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+    print(f"⚡ Columnar ingest: {written} rows in {stats['total_seconds']}s ({stats['rows_per_sec']} rows/sec)")
+    return stats
@@ -0,0 +1,118 @@
+import hashlib
+import os
+
+from sqlalchemy import delete, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.ingestion import IngestionManifest
+
+
+def file_hash(path: str, block_size: int = 1 << 20) -> str:
+    """Badi files ke liye bhi chunked sha256 (poori file RAM mein nahi aati)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def changed_sources(db: Session, loader: str, paths) -> list:
+    """
+    Pehle (poori ya aadhi) load hui files jo ab badal gayi ya hat gayi. Accumulating load mein
+    unki purani rows counts mein jud chuki hain - alag se ghatana mumkin nahi.
+    """
+    current = set(paths)
+    changed = []
+    for entry in db.query(IngestionManifest).filter(IngestionManifest.loader == loader).all():
+        if entry.status != "done" and not entry.rows_committed:
+            continue
+        if entry.source_path not in current:
+            changed.append(entry.source_path)
+            continue
+        stat = os.stat(entry.source_path)
+        if entry.size_bytes == stat.st_size and entry.mtime == stat.st_mtime:
+            continue
+        if file_hash(entry.source_path) != entry.content_hash:
+            changed.append(entry.source_path)
+    db.commit()   # Read transaction band (SQLite par doosra connection likhega)
+    return changed
+
+
+def plan_file(db: Session, loader: str, path: str):
+    """
+    File ko process karna hai ya nahi?
+    Returns (manifest_id, skip_rows) ya None (agar file unchanged aur done hai).
+
+    - size + mtime same aur status done -> hash bhi nahi nikalte (sasta skip)
+    - hash same aur done -> sirf mtime update, skip
+    - hash same aur in_progress -> last committed batch se resume
+    - naya / badla hua -> shuru se. Accumulating loaders pehle `changed_sources` se
+      pehle load hui badli files pakad kar poori category reset karte hain.
+    """
+    stat = os.stat(path)
+    entry = db.query(IngestionManifest).filter(
+        IngestionManifest.loader == loader,
+        IngestionManifest.source_path == path,
+    ).first()
+
+    if entry and entry.status == "done" and entry.size_bytes == stat.st_size and entry.mtime == stat.st_mtime:
+        return None
+
+    content_hash = file_hash(path)
+    if entry and entry.content_hash == content_hash:
+        entry.size_bytes = stat.st_size
+        entry.mtime = stat.st_mtime
+        db.commit()
+        if entry.status == "done":
+            return None
+        return entry.id, entry.rows_committed or 0
+
+    if entry is None:
+        entry = IngestionManifest(loader=loader, source_path=path)
+        db.add(entry)
+    entry.size_bytes = stat.st_size
+    entry.mtime = stat.st_mtime
+    entry.content_hash = content_hash
+    entry.status = "in_progress"
+    entry.rows_committed = 0
+    db.commit()
+    return entry.id, 0
+
+
+def checkpoint(conn: Connection, manifest_id: int, rows_committed: int) -> None:
+    """Batch ke saath hi (same transaction mein) progress likho - crash ke baad yahin se resume."""
+    conn.execute(
+        update(IngestionManifest)
+        .where(IngestionManifest.id == manifest_id)
+        .values(rows_committed=rows_committed)
+    )
+
+
+def forget_loader(conn: Connection, loader: str) -> None:
+    """Loader ki saari entries hatao - agli pass har file shuru se (category reset ke saath)."""
+    conn.execute(delete(IngestionManifest).where(IngestionManifest.loader == loader))
+
+
+def has_entries(db: Session, loader: str) -> bool:
+    return db.query(IngestionManifest.id).filter(IngestionManifest.loader == loader).first() is not None
+
+
+def record_full_load(db: Session, loader: str, paths) -> None:
+    """
+    --full / --streaming loads saari files ek saath likhte hain (checkpoint ke bina). Loader ki entries
+    in files se replace karo, sab done - warna agla incremental run har file counts par dobara jod deta.
+    """
+    db.query(IngestionManifest).filter(IngestionManifest.loader == loader).delete()
+    for path in paths:
+        stat = os.stat(path)
+        db.add(IngestionManifest(
+            loader=loader, source_path=path, size_bytes=stat.st_size, mtime=stat.st_mtime,
+            content_hash=file_hash(path), status="done", rows_committed=0,
+        ))
+    db.commit()
+
+
+def mark_done(db: Session, manifest_id: int) -> None:
+    db.query(IngestionManifest).filter(IngestionManifest.id == manifest_id).update({"status": "done"})
+    db.commit()
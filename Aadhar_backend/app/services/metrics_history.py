@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import Float, String, cast, select
+from sqlalchemy.orm import Session
+
+from app.models import models
+
+HISTORY_COLUMNS = ["ds", "y"]
+
+
+def _history_select(*conditions):
+    """
+    Sirf forecast ke columns: date + stored workload (minutes) - Python mein weights nahi lagte.
+    Date text (YYYY-MM-DD) mein aati hai - NumPy ek shot mein datetime64 bana leta hai,
+    har row par Python date object nahi banta.
+    """
+    m = models.DailyAadhaarMetrics
+    return (
+        select(
+            m.pincode,
+            cast(m.date, String).label("ds"),
+            cast(m.total_workload_hours * 60.0, Float).label("y"),
+        )
+        .where(*conditions)
+        .order_by(m.pincode, m.date)
+    )
+
+
+def _read_arrays(db, stmt):
+    """
+    Query -> column-wise NumPy arrays. pandas driver rows seedhe columns mein bharta hai -
+    hamari taraf se per-row tuples / zip nahi, koi ORM hydration nahi.
+    """
+    conn = db.connection() if isinstance(db, Session) else db
+    frame = pd.read_sql(stmt, conn, dtype={"y": "float64"})
+    if frame.empty:
+        return None
+    return {
+        "pincode": frame["pincode"].to_numpy(dtype=str),
+        "ds": frame["ds"].to_numpy(dtype="datetime64[D]"),
+        "y": frame["y"].to_numpy(),
+    }
+
+
+def load_history_arrays(db, pincode: str):
+    """
+    📈 Ek pincode ki poori history as {column: ndarray} (date order mein), ya None.
+    `db` Session ya Connection kuch bhi ho sakta hai.
+    """
+    m = models.DailyAadhaarMetrics
+    arrays = _read_arrays(db, _history_select(m.pincode == pincode))
+    if arrays is not None:
+        arrays.pop("pincode")
+    return arrays
+
+
+def load_histories(db, pincodes):
+    """
+    Ek hi query mein bahut saare pincodes ki history ((pincode, date) index par).
+    Returns list of (pincode, frame) - frames sorted arrays ke slices se bante hain.
+    """
+    m = models.DailyAadhaarMetrics
+    return split_histories(_read_arrays(db, _history_select(m.pincode.in_(pincodes))))
+
+
+def split_histories(arrays):
+    """(pincode, ds) order mein sorted arrays -> [(pincode, frame)] (Parquet scan bhi yahi use karta hai)."""
+    if arrays is None:
+        return []
+    codes = arrays["pincode"]
+    bounds = np.concatenate(([0], np.flatnonzero(codes[1:] != codes[:-1]) + 1, [len(codes)]))
+    return [
+        (str(codes[start]), pd.DataFrame({c: arrays[c][start:end] for c in HISTORY_COLUMNS}))
+        for start, end in zip(bounds[:-1], bounds[1:])
+    ]
+
+
+def latest_mix(db, pincode: str):
+    """
+    Pincode ke sabse naye din ka (new enrolments, updates) - workload breakdown ke liye.
+    Pincode ki koi row nahi to zero mix (0, 0).
+    """
+    m = models.DailyAadhaarMetrics
+    mix = db.execute(
+        select(
+            m.enrol_0_5 + m.enrol_18_plus,
+            m.bio_update_5_17 + m.bio_update_17_plus + m.demo_update_5_17,
+        )
+        .where(m.pincode == pincode)
+        .order_by(m.date.desc())
+        .limit(1)
+    ).first()
+    return tuple(mix) if mix is not None else (0, 0)
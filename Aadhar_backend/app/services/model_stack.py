@@ -0,0 +1,75 @@
+import threading
+import time
+
+import numpy as np
+
+
+def _import_prophet():
+    # 🔥 JUGAAD: Numpy ka naya version patch karne ke liye (Prophet purana np.float use karta hai)
+    if not hasattr(np, 'float'):
+        np.float = float
+    from prophet import Prophet
+    return Prophet
+
+
+def _import_isolation_forest():
+    from sklearn.ensemble import IsolationForest
+    return IsolationForest
+
+
+# 🧠 Heavy model stack: app import par nahi, pehli zaroorat par (ya startup ke baad warm-up thread mein).
+# Light endpoints (filters, dashboard) ko Prophet / sklearn ke ~2-3s import ka wait nahi karna padta.
+ENGINES = {
+    "prophet": _import_prophet,
+    "sklearn": _import_isolation_forest,
+}
+
+
+class ModelStack:
+    """Engine name -> lazily imported class; har engine ka apna lock, status /ready par dikhta hai."""
+
+    def __init__(self):
+        self._loaded = {}
+        self._locks = {name: threading.Lock() for name in ENGINES}
+        self._status = {name: {"state": "not_loaded", "load_seconds": None, "error": None} for name in ENGINES}
+
+    def get(self, name: str):
+        """Engine ki class (pehli call par import). Import fail ho to wahi exception - caller ka fallback chale."""
+        if name in self._loaded:
+            return self._loaded[name]
+        with self._locks[name]:
+            if name not in self._loaded:
+                status = self._status[name]
+                status["state"] = "loading"
+                started = time.perf_counter()
+                try:
+                    self._loaded[name] = ENGINES[name]()
+                except Exception as e:
+                    status.update(state="failed", error=str(e))
+                    raise
+                status.update(state="loaded", load_seconds=round(time.perf_counter() - started, 3), error=None)
+                print(f"🧠 {name} loaded in {status['load_seconds']}s")
+        return self._loaded[name]
+
+    def prophet(self):
+        return self.get("prophet")
+
+    def isolation_forest(self):
+        return self.get("sklearn")
+
+    def warm_up(self):
+        for name in ENGINES:
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"⚠️ {name} warm-up failed: {e}")
+
+    @property
+    def ready(self) -> bool:
+        return len(self._loaded) == len(ENGINES)
+
+    def status(self) -> dict:
+        return {name: dict(s) for name, s in self._status.items()}
+
+
+model_stack = ModelStack()
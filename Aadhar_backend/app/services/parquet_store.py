@@ -0,0 +1,195 @@
+import os
+import time
+from datetime import date, timedelta
+from urllib.parse import quote
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.models import models
+from app.services.metrics_history import split_histories
+from app.services.workload_weights import WEIGHT_COLUMNS
+
+# 🧱 Columnar copy of daily metrics: <root>/daily_metrics/state=<state>/month=<YYYY-MM>/part-0.parquet
+# SQLite hi source of truth hai - jo months badle (rollup dirty ranges) unke partitions dobara likhe jaate hain.
+FILE_COLUMNS = ["date", "district", "pincode"] + WEIGHT_COLUMNS + ["total_workload_hours"]
+ENROLMENT_TOTAL_COLUMNS = ["enrol_0_5", "enrol_18_plus", "bio_update_5_17", "bio_update_17_plus",
+                           "demo_update_5_17", "demo_update_17_plus"]  # Dashboard ka total (rollup jaisa)
+ROW_GROUP_ROWS = 16384   # Chhote row groups = pincode / date stats se zyada pruning
+
+
+def _arrow():
+    """pyarrow optional hai - na ho to store band, sab SQL se."""
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.dataset
+        import pyarrow.fs
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        return None
+
+
+def _month_starts(start: date, end: date):
+    month = start.replace(day=1)
+    while month <= end:
+        yield month
+        month = (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _month_end(month: date) -> date:
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+
+
+class ParquetStore:
+    """
+    Partitioned Parquet (state, month) + PyArrow dataset scan layer.
+    Partition filters (state / month) poori directories skip karte hain, pincode / date filters
+    row-group statistics se; sirf maange gaye columns padhe jaate hain, files mmap se.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.metrics_dir = os.path.join(root, "daily_metrics")
+        self.marker = os.path.join(root, "_COMPLETE")   # Poora export ho chuka hai; har refresh par touch
+        self._dataset = (None, None)                    # (marker mtime, pyarrow Dataset)
+
+    @property
+    def enabled(self) -> bool:
+        return settings.PARQUET_STORE_ENABLED and _arrow() is not None
+
+    @property
+    def ready(self) -> bool:
+        """
+        Reads (aur incremental refresh) sirf poore export ke baad - adhura store galat totals deta.
+        Tab tak sab SQL / rollups se.
+        """
+        return self.enabled and os.path.exists(self.marker)
+
+    def _touch(self):
+        with open(self.marker, "w") as f:
+            f.write(str(time.time()))
+
+    # --- Write side ---
+
+    def _write_partition(self, pa, state: str, month: date, columns: dict) -> None:
+        directory = os.path.join(self.metrics_dir, f"state={quote(state, safe='')}", f"month={month:%Y-%m}")
+        os.makedirs(directory, exist_ok=True)
+        table = pa.table({
+            "date": pa.array(columns["date"], type=pa.date32()),
+            **{c: pa.array(columns[c]) for c in FILE_COLUMNS if c != "date"},
+        })
+        tmp_path = os.path.join(directory, f".part-0.parquet.{os.getpid()}.tmp")
+        pa.parquet.write_table(table, tmp_path, row_group_size=ROW_GROUP_ROWS, compression="zstd")
+        os.replace(tmp_path, os.path.join(directory, "part-0.parquet"))  # Readers ko adhi file nahi dikhti
+
+    def write_month(self, conn: Connection, month: date) -> int:
+        """Ek mahine ke saare states ke partitions SQL se dobara likho (state, pincode, date order)."""
+        pa = _arrow()
+        m = models.DailyAadhaarMetrics
+        rows = conn.execute(
+            select(func.coalesce(m.state, "Unknown"), *(getattr(m, c) for c in FILE_COLUMNS))
+            .where(m.date.between(month, _month_end(month)))
+            .order_by(m.state, m.pincode, m.date)
+        ).all()
+        if not rows:
+            return 0
+        states, *values = zip(*rows)
+        states = np.array(states, dtype=object)
+        arrays = {c: np.array(v) for c, v in zip(FILE_COLUMNS, values)}
+        arrays["date"] = np.array(arrays["date"], dtype="datetime64[D]")
+        bounds = np.concatenate(([0], np.flatnonzero(states[1:] != states[:-1]) + 1, [len(states)]))
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            self._write_partition(pa, str(states[start]), month, {c: a[start:end] for c, a in arrays.items()})
+        return len(rows)
+
+    def refresh_ranges(self, conn: Connection, ranges) -> int:
+        """Dirty date ranges (rollup refresh wale) ke mahine dobara likho."""
+        months = sorted({month for start, end in ranges for month in _month_starts(start, end)})
+        written = sum(self.write_month(conn, month) for month in months)
+        if os.path.exists(self.marker):
+            self._touch()  # Naye partitions -> cached dataset dobara discover ho
+        return written
+
+    def rebuild(self, conn: Connection) -> int:
+        """Poori history export (pehli baar / weights badalne par)."""
+        m = models.DailyAadhaarMetrics
+        start, end = conn.execute(select(func.min(m.date), func.max(m.date))).one()
+        if start is None:
+            return 0
+        started = time.perf_counter()
+        written = self.refresh_ranges(conn, [(date.fromisoformat(str(start)), date.fromisoformat(str(end)))])
+        os.makedirs(self.root, exist_ok=True)
+        self._touch()
+        print(f"🧱 Parquet store: {written} rows written in {time.perf_counter() - started:.2f}s")
+        return written
+
+    # --- Scan layer ---
+
+    def dataset(self):
+        """File discovery sirf marker badalne par (refresh ke baad), warna cached Dataset."""
+        stamp = os.stat(self.marker).st_mtime_ns
+        cached_stamp, dataset = self._dataset
+        if dataset is None or cached_stamp != stamp:
+            pa = _arrow()
+            partitioning = pa.dataset.partitioning(
+                pa.schema([("state", pa.string()), ("month", pa.string())]), flavor="hive"
+            )
+            dataset = pa.dataset.dataset(
+                self.metrics_dir, format="parquet", partitioning=partitioning,
+                filesystem=pa.fs.LocalFileSystem(use_mmap=True),
+            )
+            self._dataset = (stamp, dataset)
+        return dataset
+
+    def scan(self, columns, filter=None):
+        """Column + predicate pushdown wala scan -> pyarrow.Table."""
+        return self.dataset().to_table(columns=list(columns), filter=filter)
+
+    def dashboard_filter(self, state: str, district: str, pincode: str, year: int):
+        field = _arrow().dataset.field
+        expr = (field("month") >= f"{year}-01") & (field("month") <= f"{year}-12")
+        if state != "All States":
+            expr &= field("state") == state
+        if district != "All Districts":
+            expr &= field("district") == district
+        if pincode != "All Pincodes":
+            expr &= field("pincode") == pincode
+        return expr
+
+    def dashboard_stats(self, state: str, district: str, pincode: str, year: int):
+        """Dashboard ke (total enrolments, distinct pincodes) - sirf saal ke month partitions + 7 columns."""
+        pc = _arrow().compute
+        table = self.scan(ENROLMENT_TOTAL_COLUMNS + ["pincode"], self.dashboard_filter(state, district, pincode, year))
+        if not table.num_rows:
+            return 0, 0
+        total = sum(pc.sum(table[c]).as_py() or 0 for c in ENROLMENT_TOTAL_COLUMNS)
+        return int(total), int(pc.count_distinct(table["pincode"]).as_py())
+
+    def load_histories(self, pincodes):
+        """
+        Batch forecaster ke liye: pincodes ki (ds, y) history. Sorted pincode range filter
+        row groups prune karta hai; result metrics_history.load_histories jaisa hi.
+        """
+        pincodes = sorted(set(pincodes))
+        if not pincodes:
+            return []
+        field = _arrow().dataset.field
+        expr = (field("pincode") >= pincodes[0]) & (field("pincode") <= pincodes[-1]) & field("pincode").isin(pincodes)
+        table = self.scan(["pincode", "date", "total_workload_hours"], expr)
+        if not table.num_rows:
+            return []
+        pincode = table["pincode"].to_numpy(zero_copy_only=False)
+        ds = table["date"].to_numpy(zero_copy_only=False).astype("datetime64[D]")
+        order = np.lexsort((ds, pincode))
+        return split_histories({
+            "pincode": pincode[order],
+            "ds": ds[order],
+            "y": table["total_workload_hours"].to_numpy(zero_copy_only=False).astype(np.float64)[order] * 60.0,
+        })
+
+
+parquet_store = ParquetStore(settings.PARQUET_STORE_DIR)
@@ -0,0 +1,186 @@
+import time
+
+import numpy as np
+from sqlalchemy import func, select
+
+from app.models import models
+from app.services.ai_engine import OPERATOR_CAPACITY_MINS
+from app.services.analytics_engine import allocation_statement, compute_allocations
+
+# Pincodes ke coordinates nahi hain - paas ke post offices ke pincode number bhi paas hote hain
+# (pehle 3 digits = sorting district). Center itne pincode-units tak serve karta hai.
+DEFAULT_SERVICE_RADIUS = 10
+PLACEMENT_TIME_LIMIT_SECONDS = 5.0
+UNREACHABLE = np.iinfo(np.int64).max
+
+
+def coverage_matrix(pincodes, radius: int = DEFAULT_SERVICE_RADIUS):
+    """
+    (n, n) matrix: center j se pincode i ki doori, ya UNREACHABLE agar j i ko serve nahi kar sakta
+    (radius se door ya alag sorting district).
+    """
+    codes = np.array([int(p) for p in pincodes], dtype=np.int64)
+    distance = np.abs(codes[:, None] - codes[None, :])
+    same_sorting_district = (codes[:, None] // 1000) == (codes[None, :] // 1000)
+    return np.where((distance <= radius) & same_sorting_district, distance, UNREACHABLE)
+
+
+def served_minutes(loads: np.ndarray, counters: int) -> np.ndarray:
+    """
+    Center loads (m,) ya (m, k candidates) + counters budget -> max serve hone wale minutes.
+    Optimal counter split: pehle poore 480-min counters, phir sabse bade remainders.
+    """
+    loads = loads.reshape(len(loads), -1)
+    full = np.floor(loads / OPERATOR_CAPACITY_MINS)
+    total_full = full.sum(axis=0)
+    remainders = -np.sort(-(loads - full * OPERATOR_CAPACITY_MINS), axis=0)
+    cumulative = np.vstack([np.zeros(loads.shape[1]), np.cumsum(remainders, axis=0)])
+    extra = np.clip(counters - total_full, 0, len(loads)).astype(np.int64)
+    partial = cumulative[extra, np.arange(loads.shape[1])]
+    return np.where(counters <= total_full,
+                    OPERATOR_CAPACITY_MINS * counters,
+                    OPERATOR_CAPACITY_MINS * total_full + partial)
+
+
+def allocate_counters(loads: np.ndarray, counters: int) -> np.ndarray:
+    """served_minutes wala split as per-center counter counts."""
+    full = np.floor(loads / OPERATOR_CAPACITY_MINS).astype(np.int64)
+    if counters <= full.sum():
+        order = np.argsort(-loads, kind="stable")
+        given = np.minimum(full[order], np.maximum(counters - np.concatenate([[0], np.cumsum(full[order])[:-1]]), 0))
+        allocation = np.zeros_like(full)
+        allocation[order] = given
+        return allocation
+    remainders = loads - full * OPERATOR_CAPACITY_MINS
+    extra = np.argsort(-remainders, kind="stable")[:counters - full.sum()]
+    extra = extra[remainders[extra] > 0]
+    full[extra] += 1
+    return full
+
+
+class _State:
+    """Open centers + har pincode ka nearest open center."""
+
+    def __init__(self, reach, demand, open_centers):
+        self.open = list(open_centers)
+        n = len(demand)
+        if self.open:
+            d = reach[:, self.open]
+            nearest = np.argmin(d, axis=1)
+            self.best = d[np.arange(n), nearest]
+            self.assign = np.where(self.best < UNREACHABLE, nearest, -1)
+        else:
+            self.best = np.full(n, UNREACHABLE)
+            self.assign = np.full(n, -1)
+        self.loads = np.bincount(self.assign[self.assign >= 0], weights=demand[self.assign >= 0],
+                                 minlength=len(self.open)).astype(float)
+
+
+def _best_addition(reach, demand, state, counters, excluded):
+    """
+    Har candidate ko ek saath evaluate karo (matrix ops): kaunse pincodes switch karenge,
+    purane centers ka load kitna ghatega, aur naya served total.
+    excluded (open centers) skip. Returns (best candidate, uska served).
+    """
+    moved = np.where(reach < state.best[:, None], demand[:, None], 0.0)          # (n, n)
+    new_load = moved.sum(axis=0)
+    if state.open:
+        # Har purane center se kitna load nikla: rows ko center ke hisaab se group karke reduceat
+        rows = np.flatnonzero(state.assign >= 0)
+        rows = rows[np.argsort(state.assign[rows], kind="stable")]
+        groups, starts = np.unique(state.assign[rows], return_index=True)
+        lost = np.zeros((len(state.open), len(demand)))
+        if len(rows):
+            lost[groups] = np.add.reduceat(moved[rows], starts, axis=0)
+        loads = np.vstack([state.loads[:, None] - lost, new_load])                 # (m + 1, n)
+    else:
+        loads = new_load[None, :]
+    served = served_minutes(loads, counters)
+    served[excluded] = -np.inf
+    best = int(np.argmax(served))
+    return best, float(served[best])
+
+
+def optimize_placement(pincodes, demand, centers: int, counters: int,
+                       radius: int = DEFAULT_SERVICE_RADIUS, time_limit: float = PLACEMENT_TIME_LIMIT_SECONDS):
+    """
+    📍 District ke liye center placement + counter allocation, unmet operator-minutes minimize.
+    1. Greedy: har step par woh pincode kholo jo served minutes sabse zyada badhaye.
+    2. Local search (swap): ek open center hatao, best closed candidate daalo - sudhar ho to rakho.
+    """
+    started = time.perf_counter()
+    demand = np.asarray(demand, dtype=float)
+    n = len(demand)
+    total = float(demand.sum())
+    reach = coverage_matrix(pincodes, radius)
+
+    state = _State(reach, demand, [])
+    served = 0.0
+    for _ in range(min(centers, n)):
+        candidate, candidate_served = _best_addition(reach, demand, state, counters, state.open)
+        if candidate_served <= served + 1e-9:
+            break  # Aur center kholne se kuch nahi milta
+        state = _State(reach, demand, state.open + [candidate])
+        served = candidate_served
+    greedy_served = served
+
+    swaps = 0
+    improved = True
+    while improved and state.open and time.perf_counter() - started < time_limit:
+        improved = False
+        for position in range(len(state.open)):
+            if time.perf_counter() - started >= time_limit:
+                break
+            rest = state.open[:position] + state.open[position + 1:]
+            if len(state.open) == n:
+                break
+            reduced = _State(reach, demand, rest)
+            candidate, candidate_served = _best_addition(reach, demand, reduced, counters, state.open)
+            if candidate_served > served + 1e-6:
+                state = _State(reach, demand, rest + [candidate])
+                served = candidate_served
+                swaps += 1
+                improved = True
+                break
+
+    allocation = allocate_counters(state.loads, counters) if state.open else np.zeros(0, dtype=np.int64)
+    pincodes = np.asarray(pincodes)
+    placements = []
+    for j, center in enumerate(state.open):
+        members = np.flatnonzero(state.assign == j)
+        load = float(state.loads[j])
+        placements.append({
+            "pincode": str(pincodes[center]),
+            "counters": int(allocation[j]),
+            "load_mins": round(load, 1),
+            "served_mins": round(min(load, OPERATOR_CAPACITY_MINS * int(allocation[j])), 1),
+            "serves_pincodes": pincodes[members].tolist(),
+        })
+
+    return {
+        "pincodes": n,
+        "centers_used": len(state.open),
+        "counters_used": int(allocation.sum()),
+        "total_demand_mins": round(total, 1),
+        "served_mins": round(served, 1),
+        "unmet_mins": round(total - served, 1),
+        "served_pct": round(served / total * 100, 2) if total else 100.0,
+        "greedy_served_mins": round(greedy_served, 1),
+        "local_search_swaps": swaps,
+        "solve_seconds": round(time.perf_counter() - started, 3),
+        "centers": sorted(placements, key=lambda c: -c["load_mins"]),
+    }
+
+
+async def district_demand(db, state: str, district: str):
+    """
+    District ke pincodes + daily workload (operator-minutes): cached forecast,
+    warna recent rollup average - wahi allocation_statement jo batch allocation use karta hai.
+    """
+    rollup = models.DailyMetricsRollup
+    latest = await db.scalar(select(func.max(rollup.period)).where(rollup.level == "pincode"))
+    rows = (await db.execute(allocation_statement(latest, state=state, district=district))).all()
+    allocations = compute_allocations(rows)
+    if not allocations:
+        return [], np.zeros(0)
+    return allocations["pincode"].tolist(), allocations["predicted_workload_mins"].astype(float)
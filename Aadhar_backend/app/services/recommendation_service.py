@@ -1,6 +1,8 @@
+import numpy as np
 from sqlalchemy.orm import Session
 from app.models.models import RegionStats # Ensure correct import
 from app.schemas.response import RecommendationResponse
+from app.services.analytics_engine import ACTIONS, PRIORITIES, classify_gaps, gap_reason
 
 class RecommendationService:
     def analyze_gap(self, db: Session, pincode: str) -> RecommendationResponse:
@@ -9,19 +11,12 @@ class RecommendationService:
         if not region:
             return None
             
-        priority = "Low"
-        action = "No Action Needed"
-        reason = "Sufficient coverage"
-
-        # Logic: Low Saturation + High Population = High Priority
-        if region.saturation_percentage < 70 and region.total_population > 10000:
-            priority = "High"
-            action = "Open New Center Immediately"
-            reason = f"Saturation is only {region.saturation_percentage}% with high population."
-        elif region.saturation_percentage < 85:
-            priority = "Medium"
-            action = "Organize Enrolment Camp"
-            reason = "Moderate gap detected."
+        # Same rules as national gap ranking (analytics_engine.classify_gaps)
+        saturation = region.saturation_percentage or 0
+        code = int(classify_gaps(np.array([saturation]), np.array([region.total_population or 0]))[0])
+        priority = str(PRIORITIES[code])
+        action = str(ACTIONS[code])
+        reason = gap_reason(code, saturation)
 
         return RecommendationResponse(
             pincode=pincode,
@@ -0,0 +1,149 @@
+import hashlib
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models import models
+
+# Route -> TTL (seconds). Data sirf loader chalne par badalta hai, TTL bas safety net hai.
+ROUTE_TTLS = {
+    "filters/states": 3600,
+    "filters/districts": 3600,
+    "filters/pincodes": 3600,
+    "filters/search": 3600,
+    "gaps/ranking": 3600,
+    "gaps/top": 3600,
+    "dashboard-stats": 300,
+    "trend": 300,
+    "anomalies/surges": 300,
+}
+DEFAULT_TTL = 60
+
+
+class ResponseCache:
+    """
+    🗃️ Size-bounded LRU of encoded JSON responses.
+    Har entry apne scopes ke versions yaad rakhti hai - version badla to entry stale.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # key -> (expires_at, scope_versions, body, etag)
+        self._lock = threading.Lock()
+        self._stats = {}                # route -> {"hits", "misses", "not_modified"}
+        self._versions = {}
+        self._versions_checked_at = 0.0
+
+    def _count(self, route: str, field: str):
+        stats = self._stats.setdefault(route, {"hits": 0, "misses": 0, "not_modified": 0})
+        stats[field] += 1
+
+    async def scope_versions(self, db) -> dict:
+        """
+        Loaders alag process hain - versions DB se aate hain, lekin har request par nahi:
+        DATA_VERSION_POLL_SECONDS mein ek baar (chhoti PK table).
+        """
+        now = time.monotonic()
+        if now - self._versions_checked_at >= settings.DATA_VERSION_POLL_SECONDS:
+            v = models.DataScopeVersion
+            rows = (await db.execute(select(v.scope, v.version))).all()
+            self._versions = dict(rows)
+            self._versions_checked_at = now
+        return self._versions
+
+    def get(self, key, route, versions):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, stored_versions, body, etag = entry
+                if expires_at > time.monotonic() and stored_versions == versions:
+                    self._entries.move_to_end(key)
+                    self._count(route, "hits")
+                    return body, etag
+                del self._entries[key]
+            self._count(route, "misses")
+            return None
+
+    def put(self, key, ttl, versions, body, etag):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, versions, body, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def not_modified(self, route):
+        with self._lock:
+            self._count(route, "not_modified")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions_checked_at = 0.0
+
+    def stats(self):
+        with self._lock:
+            routes = {}
+            for route, s in self._stats.items():
+                lookups = s["hits"] + s["misses"]
+                routes[route] = {**s, "hit_rate": round(s["hits"] / lookups, 3) if lookups else 0.0}
+            return {"entries": len(self._entries), "max_entries": self.max_entries, "routes": routes}
+
+
+response_cache = ResponseCache(settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+def cache_key(route: str, params: dict) -> str:
+    """
+    Normalized key: route + sorted query params (order se farak nahi). Values jaisi hain waisi -
+    compute ko bhi raw params milte hain, trim kiya to "Karnataka " aur "Karnataka" ek key par aa jaate.
+    """
+    items = sorted((k, str(v)) for k, v in params.items() if v is not None)
+    return route + "?" + "&".join(f"{k}={v}" for k, v in items)
+
+
+def _encode(payload):
+    body = json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")).encode()
+    return body, '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+
+def _respond(request: Request, route: str, body: bytes, etag: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}  # Browser har baar revalidate kare (304)
+    if request.headers.get("if-none-match") == etag:
+        response_cache.not_modified(route)
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def _call(compute):
+    payload = compute()
+    return await payload if inspect.isawaitable(payload) else payload
+
+
+async def cached_json(request: Request, db, route: str, params: dict, scopes, compute):
+    """
+    ⚡ Cache-aside for read endpoints.
+    scopes: jin data scopes par response depend karta hai;
+    compute: fn -> payload (async DB query ho ya in-memory lookup, dono chalte hain).
+    """
+    if not settings.RESPONSE_CACHE_ENABLED:
+        body, etag = _encode(await _call(compute))
+        return _respond(request, route, body, etag)
+
+    all_versions = await response_cache.scope_versions(db)
+    versions = tuple(all_versions.get(s, 0) for s in scopes)
+    key = cache_key(route, params)
+
+    cached = response_cache.get(key, route, versions)
+    if cached is None:
+        body, etag = _encode(await _call(compute))
+        response_cache.put(key, ROUTE_TTLS.get(route, DEFAULT_TTL), versions, body, etag)
+    else:
+        body, etag = cached
+    return _respond(request, route, body, etag)
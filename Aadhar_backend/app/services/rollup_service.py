@@ -0,0 +1,225 @@
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import Date, cast, delete, distinct, func, insert, literal, or_, select
+from sqlalchemy.engine import Connection, Engine
+
+from app.models import models
+from app.services.anomaly_detector import replay_anomaly_states
+from app.services.data_versions import bump_scope_versions, metrics_scopes
+from app.services.parquet_store import parquet_store
+
+SUM_COLUMNS = [
+    "enrol_0_5", "enrol_5_17", "enrol_18_plus",
+    "bio_update_5_17", "bio_update_17_plus",
+    "demo_update_5_17", "demo_update_17_plus",
+    "total_workload_hours",
+]
+ROLLUP_COLUMNS = ["level", "state", "district", "pincode", "period"] + SUM_COLUMNS + ["record_count", "pincode_count"]
+LEVELS = ("state", "district", "pincode")
+
+
+def _month_start(conn: Connection, col):
+    if conn.dialect.name == "postgresql":
+        return cast(func.date_trunc("month", col), Date)
+    return func.date(col, "start of month")
+
+
+def _month_end(day: date) -> date:
+    next_month = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return next_month - timedelta(days=1)
+
+
+def _level_select(level: str, period_expr, start: date, end: date):
+    """Raw daily rows -> ek level ka GROUP BY (period ke hisaab se)."""
+    m = models.DailyAadhaarMetrics
+    state = func.coalesce(m.state, "")
+    district = func.coalesce(m.district, "")
+
+    if level == "pincode":
+        # Ek pincode do district spellings mein aa sakta hai - dono rows alag rakho
+        keys = [state, district, m.pincode]
+        group_by = [state, district, m.pincode, period_expr]
+    elif level == "district":
+        keys = [state, district, literal("")]
+        group_by = [state, district, period_expr]
+    else:
+        keys = [state, literal(""), literal("")]
+        group_by = [state, period_expr]
+
+    sums = [func.sum(getattr(m, c)) for c in SUM_COLUMNS]
+    return (
+        select(literal(level), *keys, period_expr, *sums, func.count(), func.count(distinct(m.pincode)))
+        .where(m.date.between(start, end))
+        .group_by(*group_by)
+    )
+
+
+def refresh_range(conn: Connection, start: date, end: date) -> None:
+    """
+    [start, end] ke din aur un dino ke poore mahine dobara aggregate karo.
+    Sirf affected periods chhue jaate hain - history badhne se cost nahi badhti.
+    """
+    daily = models.DailyMetricsRollup
+    conn.execute(delete(daily).where(daily.period.between(start, end)))
+    for level in LEVELS:
+        conn.execute(insert(daily).from_select(
+            ROLLUP_COLUMNS, _level_select(level, models.DailyAadhaarMetrics.date, start, end)
+        ))
+
+    month_start, month_end = start.replace(day=1), _month_end(end)
+    monthly = models.MonthlyMetricsRollup
+    conn.execute(delete(monthly).where(monthly.period.between(month_start, month_end)))
+    period_expr = _month_start(conn, models.DailyAadhaarMetrics.date)
+    for level in LEVELS:
+        conn.execute(insert(monthly).from_select(
+            ROLLUP_COLUMNS, _level_select(level, period_expr, month_start, month_end)
+        ))
+
+
+def mark_dirty(conn: Connection, start, end) -> None:
+    """Batch ke transaction mein hi affected date range note karo (crash-safe)."""
+    conn.execute(insert(models.RollupDirtyRange).values(
+        start_date=date.fromisoformat(str(start)), end_date=date.fromisoformat(str(end))
+    ))
+
+
+def _merge_ranges(ranges):
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _rollup_states(conn: Connection, ranges) -> set:
+    """Ranges ke dino mein jin states ki rollup rows hain (state level - chhota lookup)."""
+    daily = models.DailyMetricsRollup
+    return set(conn.execute(
+        select(daily.state).distinct()
+        .where(daily.level == "state", or_(*(daily.period.between(start, end) for start, end in ranges)))
+    ).scalars())
+
+
+def refresh_dirty_rollups(engine: Engine) -> int:
+    """
+    📊 Saari pending dirty ranges ke rollups refresh karo (ek transaction).
+    Anomaly detector bhi yahin - sabse purane dirty din se, saari categories load hone ke baad.
+    Cache scopes sabse aakhir mein (usi transaction mein) bump: batch wale bump ke baad aur
+    refresh se pehle aayi request purane rollups naye version ke saath cache kar sakti thi.
+    Returns kitni merged ranges refresh hui.
+    """
+    dirty = models.RollupDirtyRange
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        rows = conn.execute(select(dirty.id, dirty.start_date, dirty.end_date)).all()
+        if not rows:
+            return 0
+
+        ranges = _merge_ranges((r.start_date, r.end_date) for r in rows)
+        states = _rollup_states(conn, ranges)   # Refresh se pehle wali states bhi (rows ki state badal sakti hai)
+        for start, end in ranges:
+            refresh_range(conn, start, end)
+        # Parquet store ke wahi mahine (same dirty ranges, same transaction ka snapshot)
+        if parquet_store.ready:
+            parquet_store.refresh_ranges(conn, ranges)
+        replay_anomaly_states(conn, ranges[0][0])
+        bump_scope_versions(conn, metrics_scopes(states | _rollup_states(conn, ranges)))
+        conn.execute(delete(dirty).where(dirty.id.in_([r.id for r in rows])))
+
+    print(f"📊 Rollups refreshed for {len(ranges)} date range(s) in {time.perf_counter() - started:.2f}s")
+    return len(ranges)
+
+
+def rebuild_all(conn: Connection) -> None:
+    """Poori history se rollups (pehli baar / migration ke liye)."""
+    m = models.DailyAadhaarMetrics
+    start, end = conn.execute(select(func.min(m.date), func.max(m.date))).one()
+    if start is None:
+        return
+    refresh_range(conn, start, end)
+
+
+def _filter_level(r, state: str, district: str, pincode: str):
+    """Dashboard-style filter -> (rollup level, conditions). Sabse coarse level jo filter ko cover kare."""
+    if pincode != "All Pincodes":
+        level = "pincode"
+    elif district != "All Districts":
+        level = "district"
+    else:
+        level = "state"
+
+    conditions = []
+    if state != "All States":
+        conditions.append(r.state == state)
+    if district != "All Districts":
+        conditions.append(r.district == district)
+    if pincode != "All Pincodes":
+        conditions.append(r.pincode == pincode)
+    return level, conditions
+
+
+def dashboard_rollup_statements(state: str, district: str, pincode: str, year: int):
+    """
+    Dashboard filter ke liye sabse coarse rollup (monthly) par queries.
+    Returns (total_enrolments_stmt, distinct_pincodes_stmt).
+    """
+    r = models.MonthlyMetricsRollup
+    level, conditions = _filter_level(r, state, district, pincode)
+    conditions.append(r.period.between(date(year, 1, 1), date(year, 12, 1)))
+
+    total_stmt = select(func.sum(
+        r.enrol_0_5 + r.enrol_18_plus +
+        r.bio_update_5_17 + r.bio_update_17_plus +
+        r.demo_update_5_17 + r.demo_update_17_plus
+    )).where(r.level == level, *conditions)
+
+    # Distinct pincodes saal bhar mein: pincode-level monthly rows (pincodes x 12), raw table nahi
+    regions_stmt = select(func.count(distinct(r.pincode))).where(r.level == "pincode", *conditions)
+    return total_stmt, regions_stmt
+
+
+def _week_start(conn, col):
+    """Hafte ka Monday (Postgres date_trunc jaisa)."""
+    if conn.dialect.name == "postgresql":
+        return cast(func.date_trunc("week", col), Date)
+    return func.date(col, "-6 days", "weekday 1")
+
+
+def trend_statement(conn, state: str, district: str, pincode: str, granularity: str,
+                    start: date = None, end: date = None):
+    """
+    📈 Trend chart: filter ke level par period-wise (period, enrolments, updates, workload_hours).
+    day / week -> daily rollup (week SQL mein hi Monday par bucket), month -> monthly rollup.
+    Rows utni hi jitne periods - raw daily rows kabhi nahi aate. conn: dialect ke liye (engine bhi chalega).
+    """
+    r = models.MonthlyMetricsRollup if granularity == "month" else models.DailyMetricsRollup
+    period = _week_start(conn, r.period) if granularity == "week" else r.period
+    level, conditions = _filter_level(r, state, district, pincode)
+    # Buckets hamesha poore: start apne mahine ki 1 tareekh / hafte ke Monday par, end hafte ke Sunday par
+    # (monthly period = 1 tareekh, to `period <= end` end wala poora mahina pehle se le leta hai)
+    if start is not None:
+        if granularity == "month":
+            start = start.replace(day=1)
+        elif granularity == "week":
+            start = start - timedelta(days=start.weekday())
+        conditions.append(r.period >= start)
+    if end is not None:
+        if granularity == "week":
+            end = end + timedelta(days=6 - end.weekday())
+        conditions.append(r.period <= end)
+
+    return (
+        select(
+            period.label("period"),
+            func.sum(r.enrol_0_5 + r.enrol_5_17 + r.enrol_18_plus).label("enrolments"),
+            func.sum(r.bio_update_5_17 + r.bio_update_17_plus +
+                     r.demo_update_5_17 + r.demo_update_17_plus).label("updates"),
+            func.sum(r.total_workload_hours).label("workload_hours"),
+        )
+        .where(r.level == level, *conditions)
+        .group_by(period)
+        .order_by(period)
+    )
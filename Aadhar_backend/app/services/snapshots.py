@@ -0,0 +1,57 @@
+import asyncio
+import threading
+import time
+
+from sqlalchemy import select
+
+from app.core.executor import run_cpu_bound
+from app.db.session import engine
+from app.models import models
+from app.services.response_cache import response_cache
+
+
+class VersionedSnapshot:
+    """
+    📸 In-memory snapshot jo ek data scope ke version se bandha hai (geo index, gap ranking, ...).
+    build(conn, version) -> object jiska `.version` ho. Scope version badla to request path
+    par (CPU executor mein) rebuild, warna seedha cached object.
+    """
+
+    def __init__(self, scope: str, build, label: str):
+        self.scope = scope
+        self.build = build
+        self.label = label
+        self.value = None
+        self._lock = threading.RLock()
+        self._async_lock = None
+
+    def rebuild(self):
+        with self._lock:
+            started = time.perf_counter()
+            with engine.connect() as conn:
+                # Version pehle padho - build ke dauraan naya data aaye to agla check phir rebuild karega
+                version = conn.execute(
+                    select(models.DataScopeVersion.version).where(models.DataScopeVersion.scope == self.scope)
+                ).scalar() or 0
+                self.value = self.build(conn, version)
+            print(f"📸 {self.label} v{version} built in {time.perf_counter() - started:.2f}s")
+            return self.value
+
+    def ensure(self, version: int = 0):
+        """Stale / missing ho tabhi build - warm-up thread ne abhi bana diya ho to request dobara nahi banati."""
+        with self._lock:
+            if self.value is not None and self.value.version >= version:
+                return self.value
+            return self.rebuild()
+
+    async def current(self, db):
+        version = (await response_cache.scope_versions(db)).get(self.scope, 0)
+        # Snapshot ka version poll se aage ho sakta hai (rebuild khud DB se padhta hai)
+        if self.value is not None and self.value.version >= version:
+            return self.value
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            if self.value is None or self.value.version < version:
+                await run_cpu_bound(self.ensure, version)
+        return self.value
@@ -0,0 +1,128 @@
+import glob
+import math
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+
+from app.core.config import settings
+from app.services.ingestion_engine import MERGE_KEYS, clean_source_frame, merge_categories
+
+CATEGORIES = ("enrolment", "biometric", "demographic")
+
+# CSV bytes -> pandas memory ka rough multiplier (string columns + merge ki copies)
+MEMORY_EXPANSION = 8
+# Ek chunk row ka andaazan in-memory size (bytes)
+BYTES_PER_ROW = 256
+
+
+def find_category_files(keyword, root_folder="dataset"):
+    """Folder ke andar (recursive) saari CSV/Excel files jinke naam mein keyword hai."""
+    files = glob.glob(f"{root_folder}/**/*{keyword}*.*", recursive=True)
+    return sorted(f for f in files if f.endswith(".csv") or f.endswith(".xlsx"))
+
+
+def plan_partitions(total_bytes, budget_mb=None):
+    """
+    Memory budget se partitions ki ginti aur chunk size nikalta hai.
+    Har partition (teeno categories + merge) budget ke andar fit hona chahiye.
+    """
+    budget = (budget_mb or settings.INGEST_MEMORY_BUDGET_MB) * 1024 * 1024
+    n_partitions = max(1, math.ceil(total_bytes * MEMORY_EXPANSION / budget))
+    chunk_rows = max(1000, budget // (MEMORY_EXPANSION * BYTES_PER_ROW))
+    return n_partitions, chunk_rows
+
+
+def iter_file_chunks(file_path, chunk_rows, skip_rows=0):
+    """
+    File ko chunk-by-chunk padhta hai (poori file kabhi RAM mein nahi aati).
+    skip_rows: itni data rows pehle hi commit ho chuki hain (resume ke liye).
+    """
+    if file_path.endswith(".csv"):
+        skip = range(1, skip_rows + 1) if skip_rows else None  # header mat chhodo
+        for chunk in pd.read_csv(file_path, chunksize=chunk_rows, dtype=str, skiprows=skip):
+            yield clean_source_frame(chunk)
+    else:
+        # Excel streaming support nahi karta, sheet padh ke slices mein do
+        df = clean_source_frame(pd.read_excel(file_path, dtype=str))
+        for start in range(skip_rows, len(df), chunk_rows):
+            yield df.iloc[start:start + chunk_rows]
+
+
+def partition_ids(chunk, n_partitions):
+    """(date, pincode) ka hash -> partition number. Same key hamesha same partition mein."""
+    keys = chunk["date"].astype(str) + "|" + chunk["pincode"].astype(str)
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy() % n_partitions
+
+
+def _partition_path(spill_dir, keyword, pid):
+    return os.path.join(spill_dir, keyword, f"part-{pid:05d}.csv")
+
+
+def spill_category(keyword, files, spill_dir, n_partitions, chunk_rows):
+    """
+    Ek category ki saari files ko hash-partitioned spill files mein likhta hai.
+    """
+    os.makedirs(os.path.join(spill_dir, keyword), exist_ok=True)
+    columns = None
+    rows = 0
+
+    for file_path in files:
+        print(f"   Streaming {os.path.basename(file_path)} (chunk={chunk_rows} rows)...")
+        try:
+            for chunk in iter_file_chunks(file_path, chunk_rows):
+                # Har file ke columns same order mein hone chahiye (append ho raha hai)
+                if columns is None:
+                    columns = list(chunk.columns)
+                chunk = chunk.reindex(columns=columns)
+
+                ids = partition_ids(chunk, n_partitions)
+                for pid, part in chunk.groupby(ids, sort=False):
+                    path = _partition_path(spill_dir, keyword, int(pid))
+                    part.to_csv(path, mode="a", header=not os.path.exists(path), index=False)
+                rows += len(chunk)
+        except Exception as e:
+            print(f"   ⚠️ Error reading {file_path}: {e}")
+
+    return rows
+
+
+def _read_partition(spill_dir, keyword, pid):
+    path = _partition_path(spill_dir, keyword, pid)
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=MERGE_KEYS)
+    return pd.read_csv(path, dtype=str)
+
+
+def stream_merged_partitions(root_folder="dataset", budget_mb=None, spill_dir=None):
+    """
+    🌊 Streaming merge: files -> chunks -> hash partitions (disk) -> ek partition ka merge at a time.
+    Peak memory = ek partition, poora national dataset nahi.
+    """
+    files = {keyword: find_category_files(keyword, root_folder) for keyword in CATEGORIES}
+    for keyword, found in files.items():
+        if not found:
+            print(f"❌ No files found for {keyword}!")
+            return
+
+    total_bytes = sum(os.path.getsize(f) for found in files.values() for f in found)
+    n_partitions, chunk_rows = plan_partitions(total_bytes, budget_mb)
+    print(f"🧮 {total_bytes / 1e6:.1f} MB input -> {n_partitions} partitions, {chunk_rows} rows/chunk")
+
+    base_dir = spill_dir or settings.INGEST_SPILL_DIR
+    if base_dir:
+        os.makedirs(base_dir, exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix="aadhaar_spill_", dir=base_dir)
+    try:
+        for keyword, found in files.items():
+            rows = spill_category(keyword, found, work_dir, n_partitions, chunk_rows)
+            print(f"✅ {keyword.capitalize()} spilled: {rows} rows.")
+
+        for pid in range(n_partitions):
+            parts = [_read_partition(work_dir, keyword, pid) for keyword in CATEGORIES]
+            if all(p.empty for p in parts):
+                continue
+            yield merge_categories(*parts)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
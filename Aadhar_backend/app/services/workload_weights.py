@@ -0,0 +1,79 @@
+import json
+
+import numpy as np
+from sqlalchemy import func, select, text, update
+from sqlalchemy.engine import Connection
+
+from app.models import models
+from app.services.anomaly_detector import rebuild_anomaly_states
+from app.services.data_versions import bump_scope_versions, metrics_scopes
+
+# ⚖️ Ek transaction mein operator ke kitne minute lagte hain - poore app ki EK hi definition.
+# Weights badlo to version bhi badhao: startup migration stored workload + rollups bulk mein
+# dobara likhti hai, forecasts / anomaly state invalidate karti hai.
+WORKLOAD_WEIGHTS_VERSION = 2    # v1 = purana loader (enrolment 20 / bio 15 / demo 8)
+WORKLOAD_WEIGHTS = {
+    "enrol_0_5": 10,            # Child Enrollment (Tablet)
+    "enrol_5_17": 25,           # Child Enrollment with biometrics
+    "enrol_18_plus": 25,        # Adult Enrollment (Iris/Fingerprint)
+    "bio_update_5_17": 15,      # Mandatory Biometric Update
+    "bio_update_17_plus": 15,
+    "demo_update_5_17": 8,      # Demographic Update (Address/Name)
+    "demo_update_17_plus": 8,
+}
+WEIGHT_COLUMNS = list(WORKLOAD_WEIGHTS)
+_WEIGHT_VECTOR = np.array([WORKLOAD_WEIGHTS[c] for c in WEIGHT_COLUMNS], dtype=np.float64)
+
+
+def workload_minutes(columns) -> np.ndarray:
+    """NumPy kernel: {column: array} / DataFrame -> har row ka workload (minutes), ek matmul."""
+    counts = np.column_stack([np.asarray(columns[c], dtype=np.float64) for c in WEIGHT_COLUMNS])
+    return counts @ _WEIGHT_VECTOR
+
+
+def workload_expression(table):
+    """SQLAlchemy expression (minutes) - daily metrics ya rollup table, dono ke count columns same hain."""
+    return sum(getattr(table, c) * w for c, w in WORKLOAD_WEIGHTS.items())
+
+
+def workload_sql(column_ref) -> str:
+    """Raw SQL text ke liye: column_ref(name) -> SQL operand (jaise "excluded.enrol_0_5")."""
+    return " + ".join(f"{column_ref(c)} * {w}" for c, w in WORKLOAD_WEIGHTS.items())
+
+
+def applied_weights_version(conn: Connection) -> int:
+    v = models.WorkloadWeightsVersion
+    return conn.execute(select(func.max(v.version))).scalar() or 0
+
+
+def apply_workload_weights(conn: Connection) -> bool:
+    """
+    Stored weights version purana hai to (ek transaction mein):
+    1. daily metrics + dono rollups ka total_workload_hours ek-ek bulk UPDATE se
+       (workload linear hai, rollup ke summed counts par wahi formula - re-aggregation nahi),
+    2. saare pincodes ke data versions +1 (forecasts refit) aur cache scopes bump,
+    3. anomaly detector replay aur Parquet store (agar bana hua hai) dobara export.
+    """
+    if applied_weights_version(conn) == WORKLOAD_WEIGHTS_VERSION:
+        return False
+
+    has_metrics = conn.execute(select(models.DailyAadhaarMetrics.id).limit(1)).first()
+    if has_metrics:
+        print(f"🛠️ Migration: applying workload weights v{WORKLOAD_WEIGHTS_VERSION} to stored workload + rollups...")
+        for table in (models.DailyAadhaarMetrics, models.DailyMetricsRollup, models.MonthlyMetricsRollup):
+            conn.execute(update(table).values(total_workload_hours=workload_expression(table) / 60.0))
+
+        versions = models.PincodeDataVersion.__tablename__
+        conn.execute(text(f"UPDATE {versions} SET version = version + 1"))
+        m = models.DailyAadhaarMetrics
+        states = conn.execute(select(m.state).distinct()).scalars().all()
+        bump_scope_versions(conn, metrics_scopes(states))
+        rebuild_anomaly_states(conn)
+        from app.services.parquet_store import parquet_store  # parquet_store WEIGHT_COLUMNS yahin se leta hai
+        if parquet_store.ready:
+            parquet_store.rebuild(conn)
+
+    conn.execute(models.WorkloadWeightsVersion.__table__.insert().values(
+        version=WORKLOAD_WEIGHTS_VERSION, weights_json=json.dumps(WORKLOAD_WEIGHTS),
+    ))
+    return True